@@ -1,9 +1,11 @@
 # app.py
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Request, request, jsonify, send_file, current_app
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 import os
 import json
+import click
+import zipfile
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # Import configuration
@@ -16,15 +18,30 @@ from models.exam import Exam
 from models.question import Question
 from models.answer_sheet import AnswerSheet
 from models.answer import Answer
+from models.ocr_job import OCRJob
+from models.region_template import RegionTemplate
+from models.evaluation_run import EvaluationRun
+from models.queries import get_answer_sheet_with_answers, get_answer_sheets_by_ids
 
 # Import modules
-from modules.ocr_engine import OCREngine
-from modules.evaluation import EvaluationEngine
-from modules.analytics import AnalyticsEngine
-from modules.report import ReportGenerator
+# Subsystems are built on first use so importing the app stays cheap;
+# their heavy dependencies are imported inside the factories
+from modules.services import ServiceRegistry
+from modules.bulk_ingest import file_extension, stored_filename
+
+class UploadRequest(Request):
+    """Request whose body size limit depends on the route"""
+    
+    @property
+    def max_content_length(self):
+        # A bulk upload carries a whole class of answer sheets
+        if self.url_rule is not None and self.url_rule.endpoint == 'bulk_upload_answer_sheets':
+            return current_app.config['BULK_MAX_CONTENT_LENGTH']
+        return current_app.config['MAX_CONTENT_LENGTH']
 
 # Create Flask application
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.config.from_object(Config)
 
 # Initialize extensions
@@ -32,15 +49,94 @@ CORS(app)
 jwt = JWTManager(app)
 db.init_app(app)
 
+os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
+
+# Keep the score aggregate tables current on every write
+from modules.score_aggregates import register_listeners
+register_listeners()
+
 # Initialize modules
-ocr_engine = OCREngine(app.config)
-evaluation_engine = EvaluationEngine()
-analytics_engine = AnalyticsEngine()
-report_generator = ReportGenerator(app.config)
+services = ServiceRegistry()
+
+def _create_ocr_engine():
+    from modules.ocr_engine import OCREngine
+    return OCREngine(Config)
+
+def _create_job_queue():
+    from modules.job_queue import JobQueue
+    return JobQueue(Config)
+
+def _create_bulk_ingestor():
+    from modules.bulk_ingest import BulkIngestor
+    return BulkIngestor(Config, job_queue)
+
+def _create_evaluation_engine():
+    from modules.evaluation import EvaluationEngine
+    return EvaluationEngine(config=Config)
+
+def _create_exam_evaluator():
+    from modules.exam_evaluator import ExamEvaluator
+    return ExamEvaluator(Config, evaluation_engine)
+
+def _create_analytics_engine():
+    from modules.analytics import AnalyticsEngine
+    return AnalyticsEngine()
+
+def _create_analytics_cache():
+    from modules.analytics_cache import AnalyticsCache
+    return AnalyticsCache(
+        Config.ANALYTICS_CACHE_PATH,
+        max_entries=Config.ANALYTICS_CACHE_SIZE,
+        shared_responses=Config.ANALYTICS_CACHE_SHARED_RESPONSES
+    )
 
-# Create database tables
-with app.app_context():
-    db.create_all()
+def _create_report_generator():
+    from modules.report import ReportGenerator
+    return ReportGenerator(app.config)
+
+ocr_engine = services.register('ocr_engine', _create_ocr_engine)
+job_queue = services.register('job_queue', _create_job_queue)
+bulk_ingestor = services.register('bulk_ingestor', _create_bulk_ingestor)
+evaluation_engine = services.register('evaluation_engine', _create_evaluation_engine)
+exam_evaluator = services.register('exam_evaluator', _create_exam_evaluator)
+analytics_engine = services.register('analytics_engine', _create_analytics_engine)
+analytics_cache = services.register('analytics_cache', _create_analytics_cache)
+report_generator = services.register('report_generator', _create_report_generator)
+
+# Every commit that touches an exam's or student's data invalidates their cached analytics
+if Config.ANALYTICS_CACHE_ENABLED:
+    from modules.analytics_cache import register_invalidation
+    register_invalidation(analytics_cache)
+
+# Read-only NLP state that is safe to build before gunicorn forks workers
+PRELOAD_SERVICES = ['evaluation_engine']
+
+def warmup(names=None):
+    """Build subsystems ahead of the first request"""
+    return services.warmup(names)
+
+@app.cli.command('init-db')
+def init_db():
+    """Create or migrate the database schema to the latest revision"""
+    from models.schema import upgrade_database
+    upgrade_database()
+    print('Database schema is up to date')
+
+@app.cli.command('rebuild-aggregates')
+@click.option('--exam-id', type=int, default=None, help='Only rebuild this exam')
+def rebuild_aggregates_command(exam_id):
+    """Recompute the score aggregate tables and report rows that had drifted"""
+    from modules.score_aggregates import rebuild_aggregates
+    report = rebuild_aggregates(exam_id)
+    print(f"Rebuilt {report['exams']} exams and {report['questions']} questions")
+    if report['mismatched_exams'] or report['mismatched_questions']:
+        print(f"Missing or drifted: exams {report['mismatched_exams']}, questions {report['mismatched_questions']}")
+
+@app.cli.command('warmup')
+def warmup_command():
+    """Build every subsystem and report how long each took"""
+    for name, seconds in warmup().items():
+        print(f'{name}: {seconds}s')
 
 # Authentication routes
 @app.route('/api/login', methods=['POST'])
@@ -136,8 +232,16 @@ def create_exam():
             question_text=q_data.get('question_text', ''),
             model_answer=q_data.get('model_answer', ''),
             keywords=json.dumps(q_data.get('keywords', [])),
-            max_marks=q_data.get('max_marks', 0)
+            max_marks=q_data.get('max_marks', 0),
+            version=1
         )
+        
+        # Precompile the student-independent parts of evaluation
+        new_question.compiled = json.dumps(evaluation_engine.compile_question(
+            new_question.model_answer,
+            q_data.get('keywords', []),
+            new_question.version
+        ))
         db.session.add(new_question)
     
     db.session.commit()
@@ -148,6 +252,107 @@ def create_exam():
         'exam_id': new_exam.id
     })
 
+@app.route('/api/exams/<int:exam_id>/template', methods=['POST'])
+@jwt_required()
+def register_exam_template(exam_id):
+    if 'file' not in request.files:
+        return jsonify({'success': False, 'message': 'No file part'}), 400
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return jsonify({'success': False, 'message': 'No selected file'}), 400
+    
+    extension = file_extension(file.filename)
+    if extension not in app.config['ALLOWED_EXTENSIONS']:
+        return jsonify({'success': False, 'message': 'Unsupported file format'}), 400
+    
+    # Check if exam exists
+    exam = Exam.query.get(exam_id)
+    if not exam:
+        return jsonify({'success': False, 'message': 'Exam not found'}), 404
+    
+    # Regions are [{"id": "q1", "page": 1, "box": [x, y, w, h]}] in reference sheet pixels
+    try:
+        regions = json.loads(request.form.get('regions', '[]'))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Regions must be valid JSON'}), 400
+    if not regions:
+        return jsonify({'success': False, 'message': 'No regions provided'}), 400
+    
+    try:
+        # Save the blank reference sheet
+        os.makedirs(app.config['TEMPLATE_FOLDER'], exist_ok=True)
+        filename = stored_filename(file.filename, extension, prefix=f'exam_{exam_id}_')
+        reference_path = os.path.join(app.config['TEMPLATE_FOLDER'], filename)
+        file.save(reference_path)
+        
+        # Boxes are checked against the reference pages they will be cropped from
+        reference_pages = ocr_engine.reference_pages(reference_path)
+        question_numbers = {question.question_number for question in exam.questions}
+        error = RegionTemplate.validate_regions(regions, question_numbers, [page.shape[:2] for page in reference_pages])
+        if error is not None:
+            os.remove(reference_path)
+            return jsonify({'success': False, 'message': error}), 400
+        
+        # Create or replace the exam's template; a new version invalidates cached artifacts
+        region_template = RegionTemplate.query.filter_by(exam_id=exam_id).first()
+        if region_template:
+            region_template.reference_path = reference_path
+            region_template.regions = json.dumps(regions)
+            region_template.version += 1
+        else:
+            region_template = RegionTemplate(
+                exam_id=exam_id,
+                reference_path=reference_path,
+                regions=json.dumps(regions),
+                version=1
+            )
+            db.session.add(region_template)
+        
+        # Register against the reference sheet once, before any sheet uses it
+        template = ocr_engine.register_template(region_template, reference_pages)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Template registered successfully',
+            'template_version': region_template.version,
+            'pages': len(template['pages']),
+            'regions': len(regions)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/questions/<int:question_id>', methods=['PUT'])
+@jwt_required()
+def update_question(question_id):
+    data = request.json
+    
+    # Check if question exists
+    question = Question.query.get(question_id)
+    if not question:
+        return jsonify({'success': False, 'message': 'Question not found'}), 404
+    
+    # Editing the model answer or keywords bumps the question version,
+    # so only answers to this question are re-scored on re-evaluation
+    question.question_text = data.get('question_text', question.question_text)
+    question.model_answer = data.get('model_answer', question.model_answer)
+    question.max_marks = data.get('max_marks', question.max_marks)
+    if 'keywords' in data:
+        question.keywords = json.dumps(data['keywords'])
+    
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Question updated successfully',
+        'version': question.version
+    })
+
 # Answer sheet processing routes
 @app.route('/api/upload-answer-sheet', methods=['POST'])
 @jwt_required()
@@ -165,93 +370,210 @@ def upload_answer_sheet():
     if file.filename == '':
         return jsonify({'success': False, 'message': 'No selected file'}), 400
     
+    extension = file_extension(file.filename)
+    if extension not in app.config['ALLOWED_EXTENSIONS']:
+        return jsonify({'success': False, 'message': 'Unsupported file format'}), 400
+    
+    # Without a student ID the OCR worker identifies the student from the sheet
+    if not student_id and not app.config['AUTO_IDENTIFY']:
+        return jsonify({'success': False, 'message': 'Student ID is required'}), 400
+    identification_status = 'manual' if student_id else 'pending'
+    
     # Check if exam exists
     exam = Exam.query.get(exam_id)
     if not exam:
         return jsonify({'success': False, 'message': 'Exam not found'}), 404
     
     try:
-        # Process the answer sheet
-        extracted_text = ocr_engine.process_answer_sheet(file)
+        # Persist the file; OCR runs later in a worker process
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], stored_filename(file.filename, extension))
+        file.save(file_path)
         
         # Create answer sheet record
         new_answer_sheet = AnswerSheet(
             exam_id=exam_id,
             student_id=student_id,
             student_name=student_name,
-            file_path=os.path.join(app.config['UPLOAD_FOLDER'], file.filename),
-            processed=False
+            file_path=file_path,
+            processed=False,
+            identification_status=identification_status
         )
         
         db.session.add(new_answer_sheet)
         db.session.commit()
         
-        # Create answer records for each question
-        questions = Question.query.filter_by(exam_id=exam_id).all()
+        # Queue OCR; the worker creates the answer records
+        job = job_queue.enqueue(new_answer_sheet.id, file_path)
         
-        for question in questions:
-            question_id = f'q{question.question_number}'
-            text = extracted_text.get(question_id, '')
-            
-            new_answer = Answer(
-                answer_sheet_id=new_answer_sheet.id,
-                question_id=question.id,
-                extracted_text=text
-            )
-            
-            db.session.add(new_answer)
+        return jsonify({
+            'success': True,
+            'message': 'Answer sheet uploaded and queued for processing',
+            'answer_sheet_id': new_answer_sheet.id,
+            'job_id': job.id,
+            'status': job.status
+        }), 202
         
-        db.session.commit()
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/upload-answer-sheets/bulk', methods=['POST'])
+@jwt_required()
+def bulk_upload_answer_sheets():
+    exam_id = request.form.get('exam_id', '')
+    archive_file = request.files.get('archive')
+    files = request.files.getlist('files')
+    
+    if 'roster' not in request.files and not app.config['AUTO_IDENTIFY']:
+        return jsonify({'success': False, 'message': 'No roster file'}), 400
+    
+    if archive_file is None and not files:
+        return jsonify({'success': False, 'message': 'No archive or files provided'}), 400
+    
+    # Check if exam exists
+    exam = Exam.query.get(exam_id)
+    if not exam:
+        return jsonify({'success': False, 'message': 'Exam not found'}), 404
+    
+    try:
+        roster = bulk_ingestor.read_roster(request.files['roster']) if 'roster' in request.files else {}
+        if not roster and not app.config['AUTO_IDENTIFY']:
+            return jsonify({'success': False, 'message': 'Roster is empty'}), 400
+        
+        batch_id, report = bulk_ingestor.ingest(exam.id, roster, archive_file=archive_file, files=files)
         
         return jsonify({
             'success': True,
-            'message': 'Answer sheet uploaded and processed successfully',
-            'answer_sheet_id': new_answer_sheet.id,
-            'extracted_text': extracted_text
-        })
+            'message': 'Answer sheets uploaded and queued for processing',
+            'batch_id': batch_id,
+            'queued': sum(1 for entry in report if entry['status'] == 'queued'),
+            'files': report
+        }), 202
         
+    except zipfile.BadZipFile as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': f'Invalid ZIP archive: {e}'}), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/jobs/batch/<batch_id>', methods=['GET'])
+@jwt_required()
+def get_batch_status(batch_id):
+    status = job_queue.get_batch_status(batch_id)
+    if not status:
+        return jsonify({'success': False, 'message': 'Batch not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'batch': status
+    })
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job_status(job_id):
+    status = job_queue.get_status(job_id)
+    if not status:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'job': status
+    })
+
+@app.route('/api/exams/<int:exam_id>/review-sheets', methods=['GET'])
+@jwt_required()
+def get_review_sheets(exam_id):
+    # Answer sheets whose student could not be identified automatically
+    sheets = AnswerSheet.query.filter_by(exam_id=exam_id, identification_status='needs_review').all()
+    
+    result = []
+    for sheet in sheets:
+        result.append({
+            'id': sheet.id,
+            'student_id': sheet.student_id,
+            'student_name': sheet.student_name,
+            'note': sheet.identification_note,
+            'created_at': sheet.created_at.isoformat()
+        })
+    
+    return jsonify(result)
+
+@app.route('/api/answer-sheets/<int:answer_sheet_id>/identify', methods=['POST'])
+@jwt_required()
+def identify_answer_sheet(answer_sheet_id):
+    data = request.json
+    
+    # Check if answer sheet exists
+    answer_sheet = AnswerSheet.query.get(answer_sheet_id)
+    if not answer_sheet:
+        return jsonify({'success': False, 'message': 'Answer sheet not found'}), 404
+    
+    student_id = data.get('student_id', '')
+    if not student_id:
+        return jsonify({'success': False, 'message': 'Student ID is required'}), 400
+    
+    answer_sheet.student_id = student_id
+    answer_sheet.student_name = data.get('student_name', answer_sheet.student_name)
+    answer_sheet.identification_status = 'manual'
+    answer_sheet.identification_note = None
+    
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Student assigned successfully'
+    })
+
 @app.route('/api/evaluate-answer-sheet/<int:answer_sheet_id>', methods=['POST'])
 @jwt_required()
 def evaluate_answer_sheet(answer_sheet_id):
     user_id = get_jwt_identity()
     
-    # Check if answer sheet exists
-    answer_sheet = AnswerSheet.query.get(answer_sheet_id)
+    # Check if answer sheet exists; its answers and questions are loaded with it
+    answer_sheet = get_answer_sheet_with_answers(answer_sheet_id)
     if not answer_sheet:
         return jsonify({'success': False, 'message': 'Answer sheet not found'}), 404
     
     try:
-        # Get all answers for this answer sheet
-        answers = Answer.query.filter_by(answer_sheet_id=answer_sheet_id).all()
+        answers = answer_sheet.answers
         
         total_score = 0
         max_score = 0
+        evaluated = 0
+        backend = evaluation_engine.backend_for_exam(answer_sheet.exam_id)
         
         for answer in answers:
-            # Get the question
-            question = Question.query.get(answer.question_id)
+            question = answer.question
+            max_score += question.max_marks
             
-            # Get keywords from JSON string
-            keywords = json.loads(question.keywords)
+            # Never overwrite a teacher's score, and skip answers whose inputs are unchanged
+            fingerprint = evaluation_engine.rescore_fingerprint(answer, question, backend)
+            if fingerprint is None:
+                total_score += answer.score or 0
+                continue
             
-            # Evaluate the answer
-            score, feedback = evaluation_engine.evaluate_answer(
-                answer.extracted_text,
-                question.model_answer,
-                keywords,
-                question.max_marks
-            )
+            if answer.blank:
+                # OCR found no writing in this region; nothing to score
+                score, feedback = 0, "No answer provided."
+            else:
+                # Reuse the question's compiled artifact instead of re-parsing it
+                compiled = evaluation_engine.get_compiled(question)
+                
+                # Evaluate the answer
+                score, feedback = evaluation_engine.evaluate_answer(
+                    answer.extracted_text,
+                    question.model_answer,
+                    compiled['keywords'],
+                    question.max_marks,
+                    compiled=compiled,
+                    backend=backend
+                )
             
             # Update the answer
-            answer.score = score
-            answer.feedback = feedback
-            answer.ai_confidence = 0.8  # Placeholder confidence value
+            evaluation_engine.record_result(answer, score, feedback, fingerprint)
             
             total_score += score
-            max_score += question.max_marks
+            evaluated += 1
         
         # Update the answer sheet
         answer_sheet.total_score = total_score
@@ -263,6 +585,8 @@ def evaluate_answer_sheet(answer_sheet_id):
         return jsonify({
             'success': True,
             'message': 'Answer sheet evaluated successfully',
+            'evaluated_answers': evaluated,
+            'unchanged_answers': len(answers) - evaluated,
             'total_score': total_score,
             'max_score': max_score,
             'percentage': (total_score / max_score * 100) if max_score > 0 else 0
@@ -271,6 +595,48 @@ def evaluate_answer_sheet(answer_sheet_id):
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/exams/<int:exam_id>/evaluate', methods=['POST'])
+@jwt_required()
+def evaluate_exam(exam_id):
+    user_id = get_jwt_identity()
+    
+    # Check if exam exists
+    exam = Exam.query.get(exam_id)
+    if not exam:
+        return jsonify({'success': False, 'message': 'Exam not found'}), 404
+    
+    try:
+        run, created = exam_evaluator.start(current_app._get_current_object(), exam_id, user_id)
+        
+        if not created:
+            return jsonify({
+                'success': False,
+                'message': 'An evaluation is already in progress for this exam',
+                'run_id': run.id
+            }), 409
+        
+        return jsonify({
+            'success': True,
+            'message': 'Exam evaluation started',
+            'run_id': run.id,
+            'status': run.status
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/evaluation-runs/<int:run_id>', methods=['GET'])
+@jwt_required()
+def get_evaluation_run(run_id):
+    status = exam_evaluator.get_status(run_id)
+    if not status:
+        return jsonify({'success': False, 'message': 'Evaluation run not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'run': status
+    })
+
 @app.route('/api/manual-update/<int:answer_id>', methods=['POST'])
 @jwt_required()
 def manual_update(answer_id):
@@ -289,10 +655,10 @@ def manual_update(answer_id):
         answer.teacher_reviewed = True
         
         # Update the answer sheet total score
-        answer_sheet = AnswerSheet.query.get(answer.answer_sheet_id)
+        answer_sheet = answer.answer_sheet
         
         # Recalculate total score
-        answers = Answer.query.filter_by(answer_sheet_id=answer_sheet.id).all()
+        answers = answer_sheet.answers
         total_score = sum(a.score for a in answers if a.score is not None)
         
         answer_sheet.total_score = total_score
@@ -309,19 +675,114 @@ def manual_update(answer_id):
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/questions/<int:question_id>/clusters', methods=['GET'])
+@jwt_required()
+def get_answer_clusters(question_id):
+    # Groups of near-identical answers that were scored together
+    rows = db.session.query(Answer, AnswerSheet).join(
+        AnswerSheet, Answer.answer_sheet_id == AnswerSheet.id
+    ).filter(
+        Answer.question_id == question_id,
+        Answer.cluster_id.isnot(None)
+    ).order_by(Answer.cluster_id, Answer.id).all()
+    
+    clusters = {}
+    for answer, sheet in rows:
+        cluster = clusters.setdefault(answer.cluster_id, {
+            'cluster_id': answer.cluster_id,
+            'representative_text': None,
+            'members': []
+        })
+        if answer.id == answer.cluster_id:
+            cluster['representative_text'] = answer.extracted_text
+        cluster['members'].append({
+            'answer_id': answer.id,
+            'answer_sheet_id': sheet.id,
+            'student_id': sheet.student_id,
+            'student_name': sheet.student_name,
+            'score': answer.score,
+            'teacher_reviewed': answer.teacher_reviewed
+        })
+    
+    result = [c for c in clusters.values() if len(c['members']) > 1]
+    result.sort(key=lambda c: len(c['members']), reverse=True)
+    
+    return jsonify(result)
+
+@app.route('/api/clusters/<int:cluster_id>/manual-update', methods=['POST'])
+@jwt_required()
+def manual_update_cluster(cluster_id):
+    data = request.json
+    
+    answers = Answer.query.filter_by(cluster_id=cluster_id).all()
+    if not answers:
+        return jsonify({'success': False, 'message': 'Cluster not found'}), 404
+    
+    try:
+        # Apply the teacher's score to every answer in the group
+        for answer in answers:
+            answer.score = data.get('score', answer.score)
+            answer.feedback = data.get('feedback', answer.feedback)
+            answer.teacher_reviewed = True
+        
+        db.session.flush()
+        
+        # Recalculate the total score of every affected answer sheet
+        sheet_ids = {answer.answer_sheet_id for answer in answers}
+        for answer_sheet in get_answer_sheets_by_ids(sheet_ids):
+            answer_sheet.total_score = sum(a.score for a in answer_sheet.answers if a.score is not None)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Cluster updated successfully',
+            'updated_answers': len(answers)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 # Analytics and reporting routes
+def _cached_analytics(scope, key, compute):
+    """
+    Serve an analytics response from the versioned cache
+    Clients that send the current ETag get a 304 without the database
+    being queried. Returns None when compute finds no data.
+    """
+    if not Config.ANALYTICS_CACHE_ENABLED:
+        stats = compute(key)
+        return jsonify({'success': True, 'statistics': stats}) if stats else None
+    
+    version = analytics_cache.version(scope, key)
+    etag = analytics_cache.etag(scope, key, version)
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        stats = analytics_cache.get(scope, key, version)
+        if stats is None:
+            stats = compute(key)
+            if not stats:
+                return None
+            analytics_cache.put(scope, key, version, stats)
+        
+        response = jsonify({'success': True, 'statistics': stats})
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/api/analytics/exam/<int:exam_id>', methods=['GET'])
 @jwt_required()
 def get_exam_analytics(exam_id):
     try:
-        stats = analytics_engine.get_exam_statistics(exam_id)
-        if not stats:
+        response = _cached_analytics('exam', exam_id, analytics_engine.get_exam_statistics)
+        if response is None:
             return jsonify({'success': False, 'message': 'Exam not found or no data available'}), 404
         
-        return jsonify({
-            'success': True,
-            'statistics': stats
-        })
+        return response
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -330,14 +791,11 @@ def get_exam_analytics(exam_id):
 @jwt_required()
 def get_student_analytics(student_id):
     try:
-        stats = analytics_engine.get_student_performance(student_id)
-        if not stats:
+        response = _cached_analytics('student', student_id, analytics_engine.get_student_performance)
+        if response is None:
             return jsonify({'success': False, 'message': 'Student not found or no data available'}), 404
         
-        return jsonify({
-            'success': True,
-            'statistics': stats
-        })
+        return response
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -356,4 +814,12 @@ def generate_exam_report_api(exam_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 if __name__ == '__main__':
+    # The development server migrates the schema; deployments run `flask init-db`
+    from models.schema import upgrade_database
+    with app.app_context():
+        upgrade_database()
+    
+    if Config.WARMUP_ON_START:
+        warmup()
+    
     app.run(debug=True)
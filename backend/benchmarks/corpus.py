@@ -0,0 +1,40 @@
+# benchmarks/corpus.py
+"""Synthetic student answers for the benchmarks"""
+import random
+
+MODEL_ANSWER = ("Water evaporates from the sea when the sun heats it. The vapour rises, cools "
+                "and condenses into clouds. It falls back to the ground as rain, snow or hail, "
+                "and rivers carry it back to the sea.")
+
+KEYWORDS = ['evaporation', 'condensation', 'precipitation', 'water cycle']
+
+# Sentences a class might write, from on-topic to off-topic, with the
+# contractions, hyphens, decimals and punctuation word_tokenize handles
+SENTENCES = [
+    "Water evaporates from the sea because the sun heats it.",
+    "The sun's heat turns water into vapour, which rises up.",
+    "Vapour cools high up and condenses into tiny droplets that form clouds.",
+    "When the clouds get heavy the water falls as rain, snow or hail.",
+    "This is called precipitation; it's part of the water cycle.",
+    "Rivers and ground-water carry the water back to the sea.",
+    "Plants also release water by transpiration (through their leaves).",
+    "About 97.5 percent of Earth's water is salty sea-water.",
+    "I think the clouds are made of smoke, aren't they?",
+    "We didn't finish this topic in class so I'm not sure...",
+    "Evaporation yaani vashpikaran hota hai.",
+    "The moon's gravity causes tides, which isn't really the water cycle.",
+]
+
+def student_answers(count, seed=7, duplicate_share=0.1):
+    """
+    count answers of two to six sentences; about duplicate_share of them
+    repeat an earlier answer, as copied or blank-ish answers do in a class
+    """
+    rng = random.Random(seed)
+    answers = []
+    for _ in range(count):
+        if answers and rng.random() < duplicate_share:
+            answers.append(rng.choice(answers))
+        else:
+            answers.append(' '.join(rng.sample(SENTENCES, rng.randint(2, 6))))
+    return answers
@@ -0,0 +1,85 @@
+# benchmarks/ocr_concurrency.py
+"""
+Time OCR of a multi-page answer sheet with OCR_CONCURRENCY=1 against N
+
+    cd backend && python -m benchmarks.ocr_concurrency [--sheet PATH] [--pages 6] [--concurrency N] [--repeat 3]
+
+Without --sheet a synthetic PDF with five written answers per page is used.
+Needs Tesseract and Poppler on the PATH, like the OCR worker itself.
+"""
+import os
+import time
+import argparse
+import tempfile
+import cv2
+import numpy as np
+from PIL import Image
+
+from config import Config
+from modules.ocr_engine import OCREngine
+
+ANSWER_LINES = [
+    'Water evaporates from the sea and rises',
+    'The vapour cools and condenses into clouds',
+    'Rain falls back to the ground as precipitation',
+    'Rivers carry the water back to the sea',
+    'Plants release water vapour by transpiration'
+]
+
+def write_sheet(path, pages):
+    """Write a PDF of A4 pages at 200 dpi, each with one answer per fifth of the page"""
+    images = []
+    for page in range(pages):
+        image = np.full((2339, 1654), 255, dtype=np.uint8)
+        for i, line in enumerate(ANSWER_LINES):
+            y = i * (image.shape[0] // len(ANSWER_LINES)) + 200
+            for offset in (0, 90):
+                cv2.putText(image, f'{page + 1}.{i + 1} {line}', (80, y + offset),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1.6, 0, 3, cv2.LINE_AA)
+        images.append(Image.fromarray(image))
+    
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=200)
+
+def time_sheet(sheet, concurrency, repeat, workdir):
+    """Best wall time of repeat runs of process_answer_sheet, with its stage timings"""
+    class BenchmarkConfig(Config):
+        OCR_CONCURRENCY = concurrency
+        OCR_CACHE_ENABLED = False
+        UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+        TEMPLATE_CACHE_FOLDER = os.path.join(workdir, 'templates')
+    
+    engine = OCREngine(BenchmarkConfig)
+    best, timings = None, {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.process_answer_sheet(sheet)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best, timings = elapsed, dict(engine.last_timings)
+    
+    return best, timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sheet', help='answer sheet (PDF or image) to OCR')
+    parser.add_argument('--pages', type=int, default=6, help='pages of the synthetic sheet')
+    parser.add_argument('--concurrency', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        sheet = args.sheet
+        if sheet is None:
+            sheet = os.path.join(workdir, 'sheet.pdf')
+            write_sheet(sheet, args.pages)
+        
+        baseline = None
+        for concurrency in sorted({1, args.concurrency}):
+            elapsed, timings = time_sheet(sheet, concurrency, args.repeat, workdir)
+            baseline = baseline or elapsed
+            # Stage totals are summed over threads, so ocr stays roughly flat as concurrency grows
+            stages = ', '.join(f"{stage} {timing['total_ms'] / 1000:.2f}s" for stage, timing in sorted(timings.items()))
+            print(f'OCR_CONCURRENCY={concurrency:<3} {elapsed:7.2f}s  x{baseline / elapsed:.2f}  ({stages})')
+
+if __name__ == '__main__':
+    main()
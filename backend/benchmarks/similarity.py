@@ -0,0 +1,61 @@
+# benchmarks/similarity.py
+"""
+Compare the hashing similarity backend with tfidf: latency and score agreement
+
+    cd backend && python -m benchmarks.similarity [--answers 2000] [--repeat 5]
+
+Both backends score the same synthetic class (benchmarks/corpus.py, fixed
+seed). Latency is the backend's similarities() call on already normalized
+answers; agreement compares the scores evaluate_batch gives with each
+backend. Needs the NLTK stopwords and wordnet corpora.
+"""
+import time
+import argparse
+import numpy as np
+from scipy.stats import spearmanr
+from modules.evaluation import EvaluationEngine
+from modules.similarity import create_similarity_backend
+from benchmarks.corpus import MODEL_ANSWER, KEYWORDS, student_answers
+
+MAX_MARKS = 10
+
+def best_time(function, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--answers', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    answers = student_answers(args.answers)
+    engine = EvaluationEngine()
+    model_text = engine.preprocess_text(MODEL_ANSWER)
+    processed = engine.preprocess_texts(answers)
+    
+    print(f'{len(answers)} answers')
+    
+    similarities = {}
+    for name in ('tfidf', 'hashing'):
+        backend = create_similarity_backend(name)
+        elapsed, similarities[name] = best_time(lambda: backend.similarities(model_text, processed), args.repeat)
+        print(f'{name:<8} {elapsed * 1000:8.1f} ms  {elapsed / len(answers) * 1e6:6.1f} us/answer')
+    
+    tfidf_scores = np.array([score for score, _ in engine.evaluate_batch(answers, MODEL_ANSWER, KEYWORDS, MAX_MARKS)])
+    hashing_scores = np.array([score for score, _ in engine.evaluate_batch(answers, MODEL_ANSWER, KEYWORDS, MAX_MARKS, backend='hashing')])
+    
+    difference = np.abs(hashing_scores - tfidf_scores)
+    rank_correlation = spearmanr(similarities['tfidf'], similarities['hashing']).correlation
+    print(f'similarity rank correlation (Spearman): {rank_correlation:.3f}')
+    print(f'mean similarity difference: {np.mean(np.abs(similarities["hashing"] - similarities["tfidf"])):.3f}')
+    print(f'score difference out of {MAX_MARKS}: mean {difference.mean():.2f}, max {difference.max():.1f}')
+    print(f'scores within 0.5 marks of tfidf: {np.mean(difference <= 0.5) * 100:.1f}%')
+
+if __name__ == '__main__':
+    main()
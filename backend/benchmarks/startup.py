@@ -0,0 +1,47 @@
+# benchmarks/startup.py
+"""
+Time `import app` and warmup() of its services, each in a fresh interpreter
+
+    cd backend && python -m benchmarks.startup [--repeat 5] [--service NAME ...]
+
+Import time is what a gunicorn worker or the CLI pays before serving
+anything; warmup() is the per-service cost that is deferred to first use
+(or to the preload before workers fork). warmup needs whatever the warmed
+services need, e.g. the NLTK corpora for evaluation_engine.
+"""
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+MEASURE = '''
+import sys, json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter() - start
+warmup = app.warmup({services}) if {warm} else {{}}
+print(json.dumps({{'import': imported, 'warmup': warmup, 'total': time.perf_counter() - start}}))
+'''
+
+def measure(services, warm):
+    script = MEASURE.format(services=services or None, warm=warm)
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--service', action='append', dest='services', help='warm only this service (repeatable)')
+    args = parser.parse_args()
+    
+    imports = [measure(None, False)['import'] for _ in range(args.repeat)]
+    print(f'import app       median {statistics.median(imports) * 1000:8.1f} ms  (min {min(imports) * 1000:.1f} ms)')
+    
+    run = measure(args.services, True)
+    for name, seconds in run['warmup'].items():
+        print(f'warmup {name:<20} {seconds * 1000:8.1f} ms')
+    print(f'import + warmup  {run["total"] * 1000:8.1f} ms')
+
+if __name__ == '__main__':
+    main()
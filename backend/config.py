@@ -1,5 +1,6 @@
 # config.py
 import os
+import json
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,11 +18,96 @@ class Config:
     # Upload settings
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
+    BULK_MAX_CONTENT_LENGTH = int(os.getenv('BULK_MAX_CONTENT_LENGTH', str(512 * 1024 * 1024)))  # 512MB max bulk upload
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'tif', 'tiff'}
     
     # OCR settings
     TESSERACT_CMD = os.getenv('TESSERACT_CMD', 'tesseract')
     OCR_LANGUAGES = os.getenv('OCR_LANGUAGES', 'eng+hin+guj')
+    OCR_CONCURRENCY = int(os.getenv('OCR_CONCURRENCY', str(os.cpu_count() or 1)))  # parallel Tesseract runs per sheet
+    OCR_FAST_SCALE = float(os.getenv('OCR_FAST_SCALE', '0.6'))  # first-pass region scale
+    OCR_HIGH_SCALE = float(os.getenv('OCR_HIGH_SCALE', '1.5'))  # retry scale for low-confidence regions
+    OCR_CONFIDENCE_THRESHOLD = float(os.getenv('OCR_CONFIDENCE_THRESHOLD', '0.6'))  # 0-1 mean word confidence
+    OCR_SCRIPT_DETECTION = os.getenv('OCR_SCRIPT_DETECTION', 'True') == 'True'  # OCR with detected languages only
+    SCRIPT_MIN_CHARS = int(os.getenv('SCRIPT_MIN_CHARS', '10'))  # letters needed before trusting detection
+    SCRIPT_MIN_SHARE = float(os.getenv('SCRIPT_MIN_SHARE', '0.15'))  # min share of letters to keep a language
+    SCRIPT_CACHE_SIZE = int(os.getenv('SCRIPT_CACHE_SIZE', '1000'))
+    SCRIPT_DETECTION_ATTEMPTS = int(os.getenv('SCRIPT_DETECTION_ATTEMPTS', '3'))  # detection passes the sheet's other regions wait for
+    OCR_PAGE_WINDOW = int(os.getenv('OCR_PAGE_WINDOW', '2'))  # pages held in memory while OCR runs
+    PDF_DPI = int(os.getenv('PDF_DPI', '200'))
+    PDF_GRAYSCALE = os.getenv('PDF_GRAYSCALE', 'True') == 'True'
+    PDF_RASTER_WINDOW = int(os.getenv('PDF_RASTER_WINDOW', '1'))  # pages rasterized per pdftoppm call
+    
+    # Page preprocessing settings
+    PREPROCESS_DESKEW = os.getenv('PREPROCESS_DESKEW', 'False') == 'True'
+    PREPROCESS_DENOISE = os.getenv('PREPROCESS_DENOISE', 'False') == 'True'
+    PREPROCESS_MAX_SKEW = float(os.getenv('PREPROCESS_MAX_SKEW', '10'))  # degrees; larger angles are left alone
+    
+    # Blank region detection settings
+    BLANK_INK_RATIO = float(os.getenv('BLANK_INK_RATIO', '0.005'))  # min fraction of ink pixels
+    BLANK_MIN_COMPONENT_AREA = int(os.getenv('BLANK_MIN_COMPONENT_AREA', '20'))  # px; smaller blobs are noise
+    
+    # Automatic student identification settings
+    AUTO_IDENTIFY = os.getenv('AUTO_IDENTIFY', 'True') == 'True'  # identify sheets uploaded without a student
+    STUDENT_ID_PATTERN = os.getenv('STUDENT_ID_PATTERN', r'[A-Za-z0-9\-]{3,20}')
+    ROLL_NUMBER_BOX = tuple(float(v) for v in os.getenv('ROLL_NUMBER_BOX', '0.6,0.02,0.35,0.08').split(','))  # x, y, w, h as page fractions
+    
+    # OCR result cache settings
+    OCR_CACHE_ENABLED = os.getenv('OCR_CACHE_ENABLED', 'True') == 'True'
+    OCR_CACHE_PATH = os.getenv('OCR_CACHE_PATH', os.path.join('cache', 'ocr_cache.sqlite3'))
+    OCR_CACHE_MAX_ENTRIES = int(os.getenv('OCR_CACHE_MAX_ENTRIES', '50000'))
+    OCR_CACHE_TOUCH_INTERVAL = float(os.getenv('OCR_CACHE_TOUCH_INTERVAL', '3600'))  # seconds before a hit refreshes last_used
+    
+    # Answer region template settings
+    TEMPLATE_FOLDER = os.getenv('TEMPLATE_FOLDER', os.path.join(UPLOAD_FOLDER, 'templates'))
+    TEMPLATE_CACHE_FOLDER = os.getenv('TEMPLATE_CACHE_FOLDER', os.path.join('cache', 'templates'))
+    TEMPLATE_ALIGN_WIDTH = int(os.getenv('TEMPLATE_ALIGN_WIDTH', '1000'))  # px; pages are downscaled for feature matching
+    TEMPLATE_ORB_FEATURES = int(os.getenv('TEMPLATE_ORB_FEATURES', '2000'))
+    TEMPLATE_MIN_MATCHES = int(os.getenv('TEMPLATE_MIN_MATCHES', '25'))
+    
+    # OCR job queue settings
+    OCR_WORKERS = int(os.getenv('OCR_WORKERS', '2'))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1.0'))  # seconds
+    JOB_LEASE_TIMEOUT = float(os.getenv('JOB_LEASE_TIMEOUT', '3600'))  # seconds a running job may take before it is reclaimed
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))  # claims before a job whose worker keeps dying fails
+    
+    # Bulk upload settings
+    BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', '50'))  # answer sheets per transaction
+    BULK_MAX_ENTRIES = int(os.getenv('BULK_MAX_ENTRIES', '2000'))  # files per ZIP archive
+    BULK_MAX_ENTRY_SIZE = int(os.getenv('BULK_MAX_ENTRY_SIZE', str(64 * 1024 * 1024)))  # uncompressed bytes per file
+    BULK_MAX_EXTRACTED_SIZE = int(os.getenv('BULK_MAX_EXTRACTED_SIZE', str(2 * 1024 * 1024 * 1024)))  # uncompressed bytes per archive
+    BULK_MAX_COMPRESSION_RATIO = float(os.getenv('BULK_MAX_COMPRESSION_RATIO', '100'))  # uncompressed / compressed size per file
+    
+    # Exam-wide evaluation settings
+    EVALUATION_PROCESSES = int(os.getenv('EVALUATION_PROCESSES', '0'))  # 0 = one per CPU core
+    EVALUATION_COMMIT_BATCH = int(os.getenv('EVALUATION_COMMIT_BATCH', '100'))  # answer sheets per transaction
+    EVALUATION_HEARTBEAT_INTERVAL = float(os.getenv('EVALUATION_HEARTBEAT_INTERVAL', '15'))  # seconds
+    EVALUATION_RUN_TIMEOUT = float(os.getenv('EVALUATION_RUN_TIMEOUT', '120'))  # seconds without a heartbeat before a run is abandoned
+    CLUSTER_ANSWERS = os.getenv('CLUSTER_ANSWERS', 'True') == 'True'  # score near-identical answers once
+    CLUSTER_THRESHOLD = float(os.getenv('CLUSTER_THRESHOLD', '0.9'))  # min Jaccard similarity of token bigrams
+    CLUSTER_NUM_PERM = int(os.getenv('CLUSTER_NUM_PERM', '64'))
+    CLUSTER_BANDS = int(os.getenv('CLUSTER_BANDS', '16'))
+    
+    # Answer similarity settings
+    SIMILARITY_BACKEND = os.getenv('SIMILARITY_BACKEND', 'tfidf')  # tfidf, hashing or embedding
+    SIMILARITY_BACKEND_BY_EXAM = {
+        int(exam_id): backend
+        for exam_id, backend in json.loads(os.getenv('SIMILARITY_BACKEND_BY_EXAM', '{}')).items()
+    }  # per-exam overrides, e.g. {"12": "embedding"}
+    HASHING_FEATURES = int(os.getenv('HASHING_FEATURES', str(2 ** 18)))
+    EMBEDDING_MODEL_PATH = os.getenv('EMBEDDING_MODEL_PATH', '')  # local transformers model directory
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '32'))
+    EMBEDDING_MAX_LENGTH = int(os.getenv('EMBEDDING_MAX_LENGTH', '256'))  # tokens per answer
+    EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '256'))  # cached model-answer embeddings
+    
+    # Analytics response cache settings
+    ANALYTICS_CACHE_ENABLED = os.getenv('ANALYTICS_CACHE_ENABLED', 'True') == 'True'
+    ANALYTICS_CACHE_PATH = os.getenv('ANALYTICS_CACHE_PATH', os.path.join('cache', 'analytics_cache.sqlite3'))  # data versions, shared by workers
+    ANALYTICS_CACHE_SIZE = int(os.getenv('ANALYTICS_CACHE_SIZE', '256'))  # responses kept per process
+    ANALYTICS_CACHE_SHARED_RESPONSES = os.getenv('ANALYTICS_CACHE_SHARED_RESPONSES', 'False') == 'True'  # also keep responses in the file
+    
+    # Startup settings
+    WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'False') == 'True'  # build every subsystem before serving
     
     # JWT settings
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
@@ -0,0 +1,32 @@
+# gunicorn.conf.py
+# Serves the API with the app preloaded in the master process.
+# Usage: gunicorn -c gunicorn.conf.py app:app
+import gc
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+# Import the app once in the master; workers are forked from it and share
+# its memory copy-on-write instead of each importing everything again
+preload_app = True
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before workers fork.
+    # Only read-only NLP state is built here; services holding sockets,
+    # threads or SQLite handles are built per worker on first use.
+    from app import warmup, PRELOAD_SERVICES
+    for name, seconds in warmup(PRELOAD_SERVICES).items():
+        server.log.info('Warmed up %s in %ss', name, seconds)
+    
+    # Keep the garbage collector from touching (and so copying) the
+    # preloaded objects in every worker
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Never share database connections opened in the master
+    from app import app
+    from models.base import db
+    with app.app_context():
+        db.engine.dispose()
@@ -0,0 +1,65 @@
+# migrations/env.py
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+from flask import has_app_context
+
+# Make the backend packages importable when run through the alembic CLI
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.base import db
+
+config = context.config
+if config.config_file_name is not None and not has_app_context():
+    fileConfig(config.config_file_name)
+
+def get_engine():
+    # Use the app's engine so relative SQLite paths resolve exactly as they do at runtime
+    if has_app_context():
+        return db.engine
+
+    from app import app
+    with app.app_context():
+        return db.engine
+
+def get_metadata():
+    # Register every model on db.metadata
+    from models.user import User
+    from models.exam import Exam
+    from models.question import Question
+    from models.answer_sheet import AnswerSheet
+    from models.answer import Answer
+    from models.ocr_job import OCRJob
+    from models.region_template import RegionTemplate
+    from models.evaluation_run import EvaluationRun
+    from models.score_aggregate import ExamScoreAggregate, QuestionScoreAggregate
+    return db.metadata
+
+def run_migrations_offline():
+    context.configure(
+        url=str(get_engine().url),
+        target_metadata=get_metadata(),
+        literal_binds=True,
+        render_as_batch=True
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    with get_engine().connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=get_metadata(),
+            # SQLite can only alter tables by copying them
+            render_as_batch=connection.dialect.name == 'sqlite'
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,90 @@
+"""Initial schema: the five tables db.create_all() created before migrations existed
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('password', sa.String(length=100), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+    )
+    op.create_table(
+        'exam',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('subject', sa.String(length=50), nullable=False),
+        sa.Column('class_name', sa.String(length=20), nullable=False),
+        sa.Column('total_marks', sa.Integer(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'question',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        sa.Column('question_number', sa.Integer(), nullable=False),
+        sa.Column('question_text', sa.Text(), nullable=False),
+        sa.Column('model_answer', sa.Text(), nullable=False),
+        sa.Column('keywords', sa.Text(), nullable=False),
+        sa.Column('max_marks', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'answer_sheet',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.String(length=50), nullable=False),
+        sa.Column('student_name', sa.String(length=100), nullable=False),
+        sa.Column('file_path', sa.String(length=255), nullable=False),
+        sa.Column('processed', sa.Boolean(), nullable=True),
+        sa.Column('total_score', sa.Float(), nullable=True),
+        sa.Column('evaluated_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['evaluated_by'], ['user.id']),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'answer',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('answer_sheet_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('extracted_text', sa.Text(), nullable=True),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.Column('ai_confidence', sa.Float(), nullable=True),
+        sa.Column('teacher_reviewed', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['answer_sheet_id'], ['answer_sheet.id']),
+        sa.ForeignKeyConstraint(['question_id'], ['question.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('answer')
+    op.drop_table('answer_sheet')
+    op.drop_table('question')
+    op.drop_table('exam')
+    op.drop_table('user')
@@ -0,0 +1,117 @@
+"""Columns and tables added for OCR jobs, templates, identification and evaluation
+
+Databases that were created by db.create_all() from a newer model set
+already have some of these, so each column and table is only added when
+it is missing.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+NEW_COLUMNS = {
+    'answer': [
+        sa.Column('ocr_confidence', sa.Float(), nullable=True),
+        sa.Column('blank', sa.Boolean(), nullable=True, server_default=sa.false()),
+        sa.Column('cluster_id', sa.Integer(), nullable=True),
+        sa.Column('fingerprint', sa.String(length=64), nullable=True),
+    ],
+    'question': [
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('compiled', sa.Text(), nullable=True),
+    ],
+    'answer_sheet': [
+        sa.Column('identification_status', sa.String(length=20), nullable=True, server_default='manual'),
+        sa.Column('identification_note', sa.String(length=255), nullable=True),
+    ],
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    
+    # SQLite can only add columns through a table copy
+    for table, columns in NEW_COLUMNS.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        missing = [column for column in columns if column.name not in existing]
+        if missing:
+            with op.batch_alter_table(table) as batch_op:
+                for column in missing:
+                    batch_op.add_column(column)
+    
+    if 'ocr_job' not in tables:
+        op.create_table(
+            'ocr_job',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('answer_sheet_id', sa.Integer(), nullable=False),
+            sa.Column('file_path', sa.String(length=255), nullable=False),
+            sa.Column('batch_id', sa.String(length=32), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('total_pages', sa.Integer(), nullable=True),
+            sa.Column('processed_pages', sa.Integer(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('stage_timings', sa.Text(), nullable=True),
+            sa.Column('worker_pid', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['answer_sheet_id'], ['answer_sheet.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+    
+    if 'region_template' not in tables:
+        op.create_table(
+            'region_template',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('exam_id', sa.Integer(), nullable=False),
+            sa.Column('reference_path', sa.String(length=255), nullable=False),
+            sa.Column('regions', sa.Text(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('exam_id')
+        )
+    
+    if 'evaluation_run' not in tables:
+        op.create_table(
+            'evaluation_run',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('exam_id', sa.Integer(), nullable=False),
+            sa.Column('requested_by', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('total_sheets', sa.Integer(), nullable=True),
+            sa.Column('evaluated_sheets', sa.Integer(), nullable=True),
+            sa.Column('total_questions', sa.Integer(), nullable=True),
+            sa.Column('scored_questions', sa.Integer(), nullable=True),
+            sa.Column('summary', sa.Text(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+            sa.ForeignKeyConstraint(['requested_by'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('evaluation_run')
+    op.drop_table('region_template')
+    op.drop_table('ocr_job')
+    
+    for table, columns in reversed(list(NEW_COLUMNS.items())):
+        with op.batch_alter_table(table) as batch_op:
+            for column in reversed(columns):
+                batch_op.drop_column(column.name)
@@ -0,0 +1,43 @@
+"""Index the columns every hot lookup filters on
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns); a composite index also serves lookups on its first column
+INDEXES = [
+    ('ix_exam_created_by', 'exam', ['created_by']),
+    ('ix_question_exam_id', 'question', ['exam_id']),
+    ('ix_answer_sheet_exam_id_student_id', 'answer_sheet', ['exam_id', 'student_id']),
+    ('ix_answer_sheet_student_id', 'answer_sheet', ['student_id']),
+    ('ix_answer_answer_sheet_id_question_id', 'answer', ['answer_sheet_id', 'question_id']),
+    ('ix_answer_question_id', 'answer', ['question_id']),
+    ('ix_answer_cluster_id', 'answer', ['cluster_id']),
+    ('ix_ocr_job_status_id', 'ocr_job', ['status', 'id']),
+    ('ix_ocr_job_batch_id', 'ocr_job', ['batch_id']),
+    ('ix_ocr_job_answer_sheet_id', 'ocr_job', ['answer_sheet_id']),
+    ('ix_evaluation_run_exam_id_status', 'evaluation_run', ['exam_id', 'status']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # Tables created by db.create_all() from the current models already have them
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
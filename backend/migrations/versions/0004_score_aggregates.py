@@ -0,0 +1,59 @@
+"""Incrementally maintained exam and question score aggregates
+
+Existing data is summarized by running `flask rebuild-aggregates` after
+upgrading; until then analytics are computed from the answer sheets.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def _aggregate_columns():
+    return [
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('score_count', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('score_sq_sum', sa.Float(), nullable=False),
+        sa.Column('score_min', sa.Float(), nullable=True),
+        sa.Column('score_max', sa.Float(), nullable=True),
+    ] + [
+        sa.Column(f'band_{i}', sa.Integer(), nullable=False) for i in range(6)
+    ] + [
+        sa.Column('updated_at', sa.DateTime(), nullable=True)
+    ]
+
+
+def upgrade():
+    op.create_table(
+        'exam_score_aggregate',
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        *_aggregate_columns(),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+        sa.PrimaryKeyConstraint('exam_id')
+    )
+    op.create_table(
+        'question_score_aggregate',
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        *_aggregate_columns(),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+        sa.ForeignKeyConstraint(['question_id'], ['question.id']),
+        sa.PrimaryKeyConstraint('question_id')
+    )
+    op.create_index('ix_question_score_aggregate_exam_id', 'question_score_aggregate', ['exam_id'])
+
+
+def downgrade():
+    op.drop_index('ix_question_score_aggregate_exam_id', table_name='question_score_aggregate')
+    op.drop_table('question_score_aggregate')
+    op.drop_table('exam_score_aggregate')
@@ -0,0 +1,27 @@
+"""Count how often each OCR job has been claimed
+
+Jobs left running by a crashed worker are requeued, and the count stops a
+job that keeps killing its worker from being retried forever.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ocr_job') as batch_op:
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('ocr_job') as batch_op:
+        batch_op.drop_column('attempts')
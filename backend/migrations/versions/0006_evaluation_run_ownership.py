@@ -0,0 +1,43 @@
+"""Record which process owns an evaluation run and allow one active run per exam
+
+Runs that were queued or running before the upgrade belonged to a process
+that has since been restarted, so they are marked failed before the
+unique index is created.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+ACTIVE = sa.text("status IN ('queued', 'running')")
+
+
+def upgrade():
+    with op.batch_alter_table('evaluation_run') as batch_op:
+        batch_op.add_column(sa.Column('owner', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    
+    op.execute(
+        "UPDATE evaluation_run SET status = 'failed', error = 'Interrupted by a restart', "
+        "finished_at = CURRENT_TIMESTAMP WHERE status IN ('queued', 'running')"
+    )
+    op.create_index(
+        'uq_evaluation_run_active_exam', 'evaluation_run', ['exam_id'], unique=True,
+        sqlite_where=ACTIVE, postgresql_where=ACTIVE
+    )
+
+
+def downgrade():
+    op.drop_index('uq_evaluation_run_active_exam', table_name='evaluation_run')
+    with op.batch_alter_table('evaluation_run') as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('owner')
@@ -3,14 +3,25 @@
 from .base import db, datetime
 
 class Answer(db.Model):
+    __table_args__ = (
+        db.Index('ix_answer_answer_sheet_id_question_id', 'answer_sheet_id', 'question_id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     answer_sheet_id = db.Column(db.Integer, db.ForeignKey('answer_sheet.id'), nullable=False)
-    question_id = db.Column(db.Integer, db.ForeignKey('question.id'), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey('question.id'), nullable=False, index=True)
     extracted_text = db.Column(db.Text, nullable=True)
+    ocr_confidence = db.Column(db.Float, nullable=True)  # Mean Tesseract word confidence (0-1)
+    blank = db.Column(db.Boolean, default=False)  # Region was detected as unanswered; OCR was skipped
     score = db.Column(db.Float, nullable=True)
     feedback = db.Column(db.Text, nullable=True)
     ai_confidence = db.Column(db.Float, nullable=True)
     teacher_reviewed = db.Column(db.Boolean, default=False)
+    cluster_id = db.Column(db.Integer, nullable=True, index=True)  # Id of the representative answer this one was scored with
+    fingerprint = db.Column(db.String(64), nullable=True)  # Hash of the inputs the current score was computed from
+    
+    # Relationships
+    question = db.relationship('Question', lazy=True)
     
     def __repr__(self):
         return f'<Answer for Question {self.question_id} in AnswerSheet {self.answer_sheet_id}>'
@@ -3,18 +3,24 @@ from .base import db, datetime
 import json
 
 class AnswerSheet(db.Model):
+    __table_args__ = (
+        db.Index('ix_answer_sheet_exam_id_student_id', 'exam_id', 'student_id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False)
-    student_id = db.Column(db.String(50), nullable=False)
+    student_id = db.Column(db.String(50), nullable=False, index=True)
     student_name = db.Column(db.String(100), nullable=False)
     file_path = db.Column(db.String(255), nullable=False)
+    identification_status = db.Column(db.String(20), default='manual')  # manual, pending, auto, needs_review
+    identification_note = db.Column(db.String(255), nullable=True)
     processed = db.Column(db.Boolean, default=False)
     total_score = db.Column(db.Float, nullable=True)
     evaluated_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    answers = db.relationship('Answer', backref='answer_sheet', lazy=True)
+    answers = db.relationship('Answer', backref='answer_sheet', lazy=True, order_by='Answer.id')
     
     def __repr__(self):
         return f'<AnswerSheet {self.id} for Student {self.student_id}>'
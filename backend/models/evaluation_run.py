@@ -0,0 +1,51 @@
+# models/evaluation_run.py
+from .base import db, datetime
+import json
+
+class EvaluationRun(db.Model):
+    ACTIVE_STATUSES = ('queued', 'running')
+    
+    __table_args__ = (
+        db.Index('ix_evaluation_run_exam_id_status', 'exam_id', 'status'),
+        # At most one queued or running evaluation per exam
+        db.Index(
+            'uq_evaluation_run_active_exam', 'exam_id', unique=True,
+            sqlite_where=db.text("status IN ('queued', 'running')"),
+            postgresql_where=db.text("status IN ('queued', 'running')")
+        ),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False)
+    requested_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    total_sheets = db.Column(db.Integer, default=0)
+    evaluated_sheets = db.Column(db.Integer, default=0)
+    total_questions = db.Column(db.Integer, default=0)
+    scored_questions = db.Column(db.Integer, default=0)
+    summary = db.Column(db.Text, nullable=True)  # Stored as JSON string
+    error = db.Column(db.Text, nullable=True)
+    owner = db.Column(db.String(255), nullable=True)  # host:pid of the process evaluating the exam
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'exam_id': self.exam_id,
+            'status': self.status,
+            'total_sheets': self.total_sheets,
+            'evaluated_sheets': self.evaluated_sheets,
+            'total_questions': self.total_questions,
+            'scored_questions': self.scored_questions,
+            'summary': json.loads(self.summary) if self.summary else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<EvaluationRun {self.id} ({self.status}) for Exam {self.exam_id}>'
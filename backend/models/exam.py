@@ -7,7 +7,7 @@ class Exam(db.Model):
     subject = db.Column(db.String(50), nullable=False)
     class_name = db.Column(db.String(20), nullable=False)
     total_marks = db.Column(db.Integer, nullable=False)
-    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -0,0 +1,42 @@
+# models/ocr_job.py
+from .base import db, datetime
+import json
+
+class OCRJob(db.Model):
+    __table_args__ = (
+        db.Index('ix_ocr_job_status_id', 'status', 'id'),  # workers claim the oldest queued job
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    answer_sheet_id = db.Column(db.Integer, db.ForeignKey('answer_sheet.id'), nullable=False, index=True)
+    file_path = db.Column(db.String(255), nullable=False)
+    batch_id = db.Column(db.String(32), nullable=True, index=True)  # Set for jobs created by a bulk upload
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    total_pages = db.Column(db.Integer, nullable=True)
+    processed_pages = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text, nullable=True)
+    stage_timings = db.Column(db.Text, nullable=True)  # Stored as JSON string: {stage: {calls, total_ms, avg_ms}}
+    worker_pid = db.Column(db.Integer, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # Times a worker has claimed the job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'answer_sheet_id': self.answer_sheet_id,
+            'batch_id': self.batch_id,
+            'status': self.status,
+            'total_pages': self.total_pages,
+            'processed_pages': self.processed_pages,
+            'attempts': self.attempts,
+            'error': self.error,
+            'stage_timings': json.loads(self.stage_timings) if self.stage_timings else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<OCRJob {self.id} ({self.status}) for AnswerSheet {self.answer_sheet_id}>'
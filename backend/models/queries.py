@@ -0,0 +1,34 @@
+# models/queries.py
+# Query functions that load answer sheets together with everything the
+# handlers read from them. Related rows are eager-loaded, so the number of
+# queries does not grow with the number of sheets or answers.
+from sqlalchemy.orm import joinedload, selectinload
+from .answer_sheet import AnswerSheet
+from .answer import Answer
+
+def _with_answers_and_questions(query):
+    # sheet + exam in one joined query, then one query for all answers
+    # joined to their questions
+    return query.options(
+        joinedload(AnswerSheet.exam),
+        selectinload(AnswerSheet.answers).joinedload(Answer.question)
+    )
+
+def get_answer_sheet_with_answers(answer_sheet_id):
+    """Load an answer sheet with its exam, answers and their questions (2 queries)"""
+    return _with_answers_and_questions(AnswerSheet.query).filter(AnswerSheet.id == answer_sheet_id).first()
+
+def get_student_answer_sheets(student_id):
+    """Load every answer sheet of a student with exams, answers and questions (2 queries)"""
+    return _with_answers_and_questions(AnswerSheet.query).filter(
+        AnswerSheet.student_id == student_id
+    ).order_by(AnswerSheet.id).all()
+
+def get_answer_sheets_by_ids(answer_sheet_ids):
+    """Load answer sheets with their answers (2 queries)"""
+    if not answer_sheet_ids:
+        return []
+    
+    return AnswerSheet.query.options(selectinload(AnswerSheet.answers)).filter(
+        AnswerSheet.id.in_(list(answer_sheet_ids))
+    ).order_by(AnswerSheet.id).all()
@@ -1,15 +1,27 @@
 
 # models/question.py
 from .base import db, datetime
+from sqlalchemy import event, inspect
 
 class Question(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False)
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False, index=True)
     question_number = db.Column(db.Integer, nullable=False)
     question_text = db.Column(db.Text, nullable=False)
     model_answer = db.Column(db.Text, nullable=False)
     keywords = db.Column(db.Text, nullable=False)  # Stored as JSON string
     max_marks = db.Column(db.Float, nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)  # Bumped whenever the model answer or keywords change
+    compiled = db.Column(db.Text, nullable=True)  # Stored as JSON string: precompiled evaluation artifact
     
     def __repr__(self):
         return f'<Question {self.question_number} for Exam {self.exam_id}>'
+
+
+@event.listens_for(Question, 'before_update')
+def _bump_question_version(mapper, connection, target):
+    """Invalidate the compiled artifact when the graded content is edited"""
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ('model_answer', 'keywords')):
+        target.version = (target.version or 1) + 1
+        target.compiled = None
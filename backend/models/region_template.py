@@ -0,0 +1,63 @@
+# models/region_template.py
+from .base import db, datetime
+import re
+import json
+
+# Region ids name the question they hold; the OCR worker maps 'q3' to question 3
+REGION_ID_PATTERN = re.compile(r'q([1-9][0-9]*)')
+
+class RegionTemplate(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False, unique=True)
+    reference_path = db.Column(db.String(255), nullable=False)  # Blank reference sheet
+    regions = db.Column(db.Text, nullable=False)  # Stored as JSON string: [{"id": "q1", "page": 1, "box": [x, y, w, h]}]
+    version = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    exam = db.relationship('Exam', backref=db.backref('region_template', uselist=False))
+    
+    def get_regions(self):
+        return json.loads(self.regions)
+    
+    @staticmethod
+    def validate_regions(regions, question_numbers, page_shapes):
+        """
+        Return why a list of regions cannot be used as a template, or None
+        page_shapes are the (height, width) of each reference sheet page;
+        every box must lie inside its page
+        """
+        if not isinstance(regions, list) or not regions:
+            return 'Regions must be a non-empty list'
+        
+        seen = set()
+        for region in regions:
+            if not isinstance(region, dict):
+                return 'Each region must be an object with an id, a page and a box'
+            
+            region_id = region.get('id')
+            match = REGION_ID_PATTERN.fullmatch(region_id) if isinstance(region_id, str) else None
+            if match is None or int(match.group(1)) not in question_numbers:
+                return f'Region id {region_id!r} must be q<question number> for a question of this exam'
+            if region_id in seen:
+                return f'Region {region_id} is defined more than once'
+            seen.add(region_id)
+            
+            page = region.get('page', 1)
+            if type(page) is not int or not 1 <= page <= len(page_shapes):
+                return f'Region {region_id} is on page {page!r}, but the reference sheet has {len(page_shapes)} pages'
+            
+            box = region.get('box')
+            if not isinstance(box, list) or len(box) != 4 or any(type(value) is not int for value in box):
+                return f'Region {region_id} needs a box of four integers [x, y, w, h]'
+            
+            x, y, w, h = box
+            height, width = page_shapes[page - 1]
+            if x < 0 or y < 0 or w <= 0 or h <= 0 or x + w > width or y + h > height:
+                return f'Region {region_id} box {box} does not fit page {page} ({width}x{height})'
+        
+        return None
+    
+    def __repr__(self):
+        return f'<RegionTemplate v{self.version} for Exam {self.exam_id}>'
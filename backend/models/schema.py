@@ -0,0 +1,32 @@
+# models/schema.py
+# The schema is owned by the Alembic migrations in backend/migrations.
+import os
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import inspect
+from .base import db
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Revision matching the tables db.create_all() used to create
+INITIAL_REVISION = '0001'
+
+def alembic_config():
+    config = AlembicConfig(os.path.join(BACKEND_DIR, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(BACKEND_DIR, 'migrations'))
+    return config
+
+def upgrade_database(revision='head'):
+    """
+    Migrate the database to the given revision; must run in an app context
+    Databases created by db.create_all() before migrations existed are
+    stamped with the initial (baseline) revision first; later migrations
+    then add whatever columns, tables and indexes they are missing.
+    """
+    config = alembic_config()
+    
+    tables = inspect(db.engine).get_table_names()
+    if tables and 'alembic_version' not in tables:
+        command.stamp(config, INITIAL_REVISION)
+    
+    command.upgrade(config, revision)
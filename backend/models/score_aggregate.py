@@ -0,0 +1,67 @@
+# models/score_aggregate.py
+from .base import db, datetime
+
+# Score bands as percentages of the maximum score; half-open like
+# np.histogram, with the last band closed at 100%
+SCORE_BANDS = [0, 35, 50, 60, 75, 90, 100]
+SCORE_BAND_LABELS = ['0-35%', '35-50%', '50-60%', '60-75%', '75-90%', '90-100%']
+
+def score_band(score, maximum):
+    """Index of the band a score falls in, or None outside 0-100% of the maximum"""
+    if score is None or not maximum:
+        return None
+    
+    percentage = score * 100 / maximum
+    last = len(SCORE_BANDS) - 2
+    for i, (low, high) in enumerate(zip(SCORE_BANDS, SCORE_BANDS[1:])):
+        if low <= percentage < high or (i == last and percentage == high):
+            return i
+    return None
+
+class ExamScoreAggregate(db.Model):
+    """Running totals of an exam's answer sheet scores, kept current on every write"""
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), primary_key=True)
+    row_count = db.Column(db.Integer, nullable=False, default=0)  # answer sheets
+    processed_count = db.Column(db.Integer, nullable=False, default=0)
+    score_count = db.Column(db.Integer, nullable=False, default=0)  # sheets with a total score
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    score_sq_sum = db.Column(db.Float, nullable=False, default=0)
+    score_min = db.Column(db.Float, nullable=True)
+    score_max = db.Column(db.Float, nullable=True)
+    band_0 = db.Column(db.Integer, nullable=False, default=0)
+    band_1 = db.Column(db.Integer, nullable=False, default=0)
+    band_2 = db.Column(db.Integer, nullable=False, default=0)
+    band_3 = db.Column(db.Integer, nullable=False, default=0)
+    band_4 = db.Column(db.Integer, nullable=False, default=0)
+    band_5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def band_counts(self):
+        return [getattr(self, f'band_{i}') for i in range(len(SCORE_BAND_LABELS))]
+    
+    def __repr__(self):
+        return f'<ExamScoreAggregate for Exam {self.exam_id}>'
+
+class QuestionScoreAggregate(db.Model):
+    """Running totals of a question's answer scores, kept current on every write"""
+    question_id = db.Column(db.Integer, db.ForeignKey('question.id'), primary_key=True)
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False, index=True)
+    row_count = db.Column(db.Integer, nullable=False, default=0)  # answers
+    score_count = db.Column(db.Integer, nullable=False, default=0)  # answers with a score
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    score_sq_sum = db.Column(db.Float, nullable=False, default=0)
+    score_min = db.Column(db.Float, nullable=True)
+    score_max = db.Column(db.Float, nullable=True)
+    band_0 = db.Column(db.Integer, nullable=False, default=0)
+    band_1 = db.Column(db.Integer, nullable=False, default=0)
+    band_2 = db.Column(db.Integer, nullable=False, default=0)
+    band_3 = db.Column(db.Integer, nullable=False, default=0)
+    band_4 = db.Column(db.Integer, nullable=False, default=0)
+    band_5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def band_counts(self):
+        return [getattr(self, f'band_{i}') for i in range(len(SCORE_BAND_LABELS))]
+    
+    def __repr__(self):
+        return f'<QuestionScoreAggregate for Question {self.question_id}>'
@@ -1,13 +1,13 @@
 # modules/analytics.py
-import pandas as pd
-import numpy as np
 import json
-from sqlalchemy import func
+from sqlalchemy import func, case
 from models.base import db
 from models.answer_sheet import AnswerSheet
 from models.answer import Answer
 from models.question import Question
 from models.exam import Exam
+from models.queries import get_student_answer_sheets
+from models.score_aggregate import ExamScoreAggregate, QuestionScoreAggregate, SCORE_BANDS, SCORE_BAND_LABELS
 
 class AnalyticsEngine:
     def __init__(self):
@@ -20,73 +20,139 @@ class AnalyticsEngine:
         if not exam:
             return None
         
-        # Get all answer sheets for this exam
-        answer_sheets = AnswerSheet.query.filter_by(exam_id=exam_id).all()
+        # Read the incrementally maintained aggregates
+        exam_aggregate = ExamScoreAggregate.query.get(exam_id)
+        question_rows = db.session.query(
+            Question.question_number,
+            Question.max_marks,
+            QuestionScoreAggregate
+        ).outerjoin(
+            QuestionScoreAggregate, QuestionScoreAggregate.question_id == Question.id
+        ).filter(
+            Question.exam_id == exam_id
+        ).order_by(Question.id).all()
         
-        # Calculate statistics
-        total_students = len(answer_sheets)
-        completed_evaluations = sum(1 for sheet in answer_sheets if sheet.processed)
+        if exam_aggregate is None or any(aggregate is None for _, _, aggregate in question_rows):
+            # Aggregates have not been built for this exam yet
+            return self._compute_exam_statistics(exam)
         
-        # Calculate score statistics
-        scores = [sheet.total_score for sheet in answer_sheets if sheet.total_score is not None]
+        question_stats = [
+            self._question_stats(
+                question_number, max_marks,
+                aggregate.score_count, aggregate.score_sum, aggregate.score_max, aggregate.score_min
+            )
+            for question_number, max_marks, aggregate in question_rows
+        ]
         
-        if scores:
-            avg_score = sum(scores) / len(scores)
-            max_score = max(scores)
-            min_score = min(scores)
-            
+        return self._exam_statistics(
+            exam,
+            exam_aggregate.row_count,
+            exam_aggregate.processed_count,
+            exam_aggregate.score_count,
+            exam_aggregate.score_sum,
+            exam_aggregate.score_max,
+            exam_aggregate.score_min,
+            exam_aggregate.band_counts(),
+            question_stats
+        )
+    
+    def _compute_exam_statistics(self, exam):
+        """Compute exam statistics from the answer sheets with SQL aggregates"""
+        # Sheet counts and score aggregates in one query
+        sheet_stats = db.session.query(
+            func.count(AnswerSheet.id),
+            func.sum(case((AnswerSheet.processed == True, 1), else_=0)),
+            func.count(AnswerSheet.total_score),
+            func.sum(AnswerSheet.total_score),
+            func.max(AnswerSheet.total_score),
+            func.min(AnswerSheet.total_score)
+        ).filter(AnswerSheet.exam_id == exam.id).one()
+        
+        total_students, completed_evaluations, score_count, score_sum, max_score, min_score = sheet_stats
+        completed_evaluations = completed_evaluations or 0
+        
+        # Score bands as percentages of total marks
+        bins = SCORE_BANDS
+        percentage = AnswerSheet.total_score * 100 / exam.total_marks
+        band = case(
+            *[
+                ((percentage >= low) & ((percentage <= high) if i == len(bins) - 2 else (percentage < high)), i)
+                for i, (low, high) in enumerate(zip(bins, bins[1:]))
+            ],
+            else_=None
+        )
+        counts = [0] * (len(bins) - 1)
+        
+        if score_count:
             # Calculate score distribution
-            bins = [0, 35, 50, 60, 75, 90, 100]
-            hist, _ = np.histogram([s * 100 / exam.total_marks for s in scores], bins=bins)
-            score_distribution = {
-                'ranges': ['0-35%', '35-50%', '50-60%', '60-75%', '75-90%', '90-100%'],
-                'counts': hist.tolist()
-            }
+            bands = db.session.query(band.label('band')).filter(
+                AnswerSheet.exam_id == exam.id,
+                AnswerSheet.total_score.isnot(None)
+            ).subquery()
+            band_counts = db.session.query(bands.c.band, func.count()).group_by(bands.c.band).all()
+            for index, count in band_counts:
+                if index is not None:
+                    counts[index] = count
+        
+        # Question-wise statistics in one grouped query over this exam's answers
+        exam_answers = db.session.query(Answer.question_id, Answer.score).join(AnswerSheet).filter(
+            AnswerSheet.exam_id == exam.id
+        ).subquery()
+        
+        question_rows = db.session.query(
+            Question.question_number,
+            Question.max_marks,
+            func.count(exam_answers.c.score),
+            func.sum(exam_answers.c.score),
+            func.max(exam_answers.c.score),
+            func.min(exam_answers.c.score)
+        ).outerjoin(
+            exam_answers, exam_answers.c.question_id == Question.id
+        ).filter(
+            Question.exam_id == exam.id
+        ).group_by(Question.id, Question.question_number, Question.max_marks).order_by(Question.id).all()
+        
+        question_stats = [self._question_stats(*row) for row in question_rows]
+        
+        return self._exam_statistics(
+            exam, total_students, completed_evaluations,
+            score_count, score_sum, max_score, min_score, counts, question_stats
+        )
+    
+    def _question_stats(self, question_number, max_marks, score_count, score_sum, max_score, min_score):
+        if score_count:
+            avg_q_score = score_sum / score_count
+            max_q_score = max_score
+            min_q_score = min_score
+        else:
+            avg_q_score = 0
+            max_q_score = 0
+            min_q_score = 0
+        
+        # Calculate percentage of max score
+        avg_percentage = (avg_q_score / max_marks) * 100 if max_marks > 0 else 0
+        
+        return {
+            'question_number': question_number,
+            'max_marks': max_marks,
+            'avg_score': round(avg_q_score, 2),
+            'max_score': max_q_score,
+            'min_score': min_q_score,
+            'avg_percentage': round(avg_percentage, 2)
+        }
+    
+    def _exam_statistics(self, exam, total_students, completed_evaluations, score_count, score_sum,
+                         max_score, min_score, band_counts, question_stats):
+        if score_count:
+            avg_score = score_sum / score_count
         else:
             avg_score = 0
             max_score = 0
             min_score = 0
-            score_distribution = {
-                'ranges': ['0-35%', '35-50%', '50-60%', '60-75%', '75-90%', '90-100%'],
-                'counts': [0, 0, 0, 0, 0, 0]
-            }
-        
-        # Get question-wise statistics
-        questions = Question.query.filter_by(exam_id=exam_id).all()
-        question_stats = []
-        
-        for question in questions:
-            # Get all answers for this question
-            answers = Answer.query.join(AnswerSheet).filter(
-                AnswerSheet.exam_id == exam_id,
-                Answer.question_id == question.id
-            ).all()
-            
-            if answers:
-                q_scores = [a.score for a in answers if a.score is not None]
-                avg_q_score = sum(q_scores) / len(q_scores) if q_scores else 0
-                max_q_score = max(q_scores) if q_scores else 0
-                min_q_score = min(q_scores) if q_scores else 0
-                
-                # Calculate percentage of max score
-                avg_percentage = (avg_q_score / question.max_marks) * 100 if question.max_marks > 0 else 0
-            else:
-                avg_q_score = 0
-                max_q_score = 0
-                min_q_score = 0
-                avg_percentage = 0
-            
-            question_stats.append({
-                'question_number': question.question_number,
-                'max_marks': question.max_marks,
-                'avg_score': round(avg_q_score, 2),
-                'max_score': max_q_score,
-                'min_score': min_q_score,
-                'avg_percentage': round(avg_percentage, 2)
-            })
+            band_counts = [0] * len(SCORE_BAND_LABELS)
         
         return {
-            'exam_id': exam_id,
+            'exam_id': exam.id,
             'exam_title': exam.title,
             'subject': exam.subject,
             'class_name': exam.class_name,
@@ -96,14 +162,17 @@ class AnalyticsEngine:
             'avg_score': round(avg_score, 2),
             'max_score': max_score,
             'min_score': min_score,
-            'score_distribution': score_distribution,
+            'score_distribution': {
+                'ranges': list(SCORE_BAND_LABELS),
+                'counts': band_counts
+            },
             'question_stats': question_stats
         }
     
     def get_student_performance(self, student_id):
         """Get performance statistics for a specific student"""
-        # Get all answer sheets for this student
-        answer_sheets = AnswerSheet.query.filter_by(student_id=student_id).all()
+        # Get all answer sheets for this student with their exams, answers and questions
+        answer_sheets = get_student_answer_sheets(student_id)
         
         if not answer_sheets:
             return None
@@ -115,7 +184,7 @@ class AnalyticsEngine:
         exam_results = []
         
         for sheet in answer_sheets:
-            exam = Exam.query.get(sheet.exam_id)
+            exam = sheet.exam
             
             if sheet.processed and sheet.total_score is not None:
                 percentage = (sheet.total_score / exam.total_marks) * 100
@@ -124,10 +193,8 @@ class AnalyticsEngine:
             
             # Get question-wise results
             question_results = []
-            answers = Answer.query.filter_by(answer_sheet_id=sheet.id).all()
-            
-            for answer in answers:
-                question = Question.query.get(answer.question_id)
+            for answer in sheet.answers:
+                question = answer.question
                 
                 if answer.score is not None:
                     q_percentage = (answer.score / question.max_marks) * 100 if question.max_marks > 0 else 0
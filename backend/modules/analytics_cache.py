@@ -0,0 +1,177 @@
+# modules/analytics_cache.py
+import os
+import json
+import uuid
+import sqlite3
+import threading
+from collections import OrderedDict
+from sqlalchemy import event, select, inspect
+from sqlalchemy.orm import Session
+from models.exam import Exam
+from models.question import Question
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+
+class AnalyticsCache:
+    """
+    Cache of analytics responses keyed by scope ('exam' or 'student'), key
+    and a data version.
+    Versions live in a small SQLite file shared by every worker and are
+    bumped after each commit that touches an exam's or student's data, so a
+    cached response is never served for data that has changed. Responses
+    are kept in a bounded in-process LRU and, with shared_responses, also
+    in the SQLite file so other workers can reuse them.
+    """
+
+    def __init__(self, path, max_entries=256, shared_responses=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.shared_responses = shared_responses
+
+        self._entries = OrderedDict()  # (scope, key, version) -> data
+        self._entries_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS data_version ('
+            'scope TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (scope, key))'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS response ('
+            'scope TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, data TEXT NOT NULL, '
+            'PRIMARY KEY (scope, key))'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS cache_epoch (id INTEGER PRIMARY KEY CHECK (id = 1), epoch TEXT NOT NULL)')
+        self._conn.execute('INSERT OR IGNORE INTO cache_epoch (id, epoch) VALUES (1, ?)', (uuid.uuid4().hex[:8],))
+        self._conn.commit()
+
+        # Versions restart if the file is recreated; the epoch keeps old ETags from matching
+        self.epoch = self._conn.execute('SELECT epoch FROM cache_epoch WHERE id = 1').fetchone()[0]
+
+    def version(self, scope, key):
+        """Current data version of an exam or student"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT version FROM data_version WHERE scope = ? AND key = ?', (scope, str(key))
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, scopes):
+        """Invalidate every cached response for a set of (scope, key) pairs"""
+        if not scopes:
+            return
+
+        with self._lock:
+            for scope, key in scopes:
+                self._conn.execute(
+                    'INSERT INTO data_version (scope, key, version) VALUES (?, ?, 1) '
+                    'ON CONFLICT (scope, key) DO UPDATE SET version = version + 1',
+                    (scope, str(key))
+                )
+                self._conn.execute('DELETE FROM response WHERE scope = ? AND key = ?', (scope, str(key)))
+            self._conn.commit()
+
+    def etag(self, scope, key, version):
+        return f'{scope}-{key}-{self.epoch}-{version}'
+
+    def get(self, scope, key, version):
+        """Return the cached response data for a version, or None on a miss"""
+        entry_key = (scope, str(key), version)
+        with self._entries_lock:
+            data = self._entries.get(entry_key)
+            if data is not None:
+                self._entries.move_to_end(entry_key)
+                return data
+
+        if not self.shared_responses:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM response WHERE scope = ? AND key = ? AND version = ?',
+                (scope, str(key), version)
+            ).fetchone()
+        if row is None:
+            return None
+
+        data = json.loads(row[0])
+        self._remember(entry_key, data)
+        return data
+
+    def put(self, scope, key, version, data):
+        self._remember((scope, str(key), version), data)
+
+        if self.shared_responses:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO response (scope, key, version, data) VALUES (?, ?, ?, ?)',
+                    (scope, str(key), version, json.dumps(data))
+                )
+                self._conn.commit()
+
+    def _remember(self, entry_key, data):
+        with self._entries_lock:
+            self._entries[entry_key] = data
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+def register_invalidation(cache):
+    """Bump the versions of the exams and students touched by every commit"""
+    def after_flush(session, flush_context):
+        scopes = session.info.setdefault('analytics_scopes', set())
+        scopes.update(_touched_scopes(session))
+
+    def after_commit(session):
+        cache.bump(session.info.pop('analytics_scopes', None))
+
+    def after_rollback(session):
+        session.info.pop('analytics_scopes', None)
+
+    event.listen(Session, 'after_flush', after_flush)
+    event.listen(Session, 'after_commit', after_commit)
+    event.listen(Session, 'after_rollback', after_rollback)
+
+def _touched_scopes(session):
+    """(scope, key) pairs whose analytics change with the current flush"""
+    scopes = set()
+    sheet_ids = set()
+    exam_ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, AnswerSheet):
+            scopes.add(('exam', obj.exam_id))
+            scopes.add(('student', obj.student_id))
+            # A sheet assigned to another student changes both students' results
+            previous = inspect(obj).attrs.student_id.history.deleted
+            if previous and previous[0] is not None:
+                scopes.add(('student', previous[0]))
+        elif isinstance(obj, Answer):
+            sheet_ids.add(obj.answer_sheet_id)
+        elif isinstance(obj, Question):
+            exam_ids.add(obj.exam_id)
+        elif isinstance(obj, Exam):
+            exam_ids.add(obj.id)
+
+    if sheet_ids:
+        for exam_id, student_id in session.connection().execute(
+            select(AnswerSheet.exam_id, AnswerSheet.student_id).where(AnswerSheet.id.in_(sheet_ids))
+        ):
+            scopes.add(('exam', exam_id))
+            scopes.add(('student', student_id))
+
+    if exam_ids:
+        # Question and exam details appear in the results of every student who sat the exam
+        for (student_id,) in session.connection().execute(
+            select(AnswerSheet.student_id).where(AnswerSheet.exam_id.in_(exam_ids)).distinct()
+        ):
+            scopes.add(('student', student_id))
+        scopes.update(('exam', exam_id) for exam_id in exam_ids)
+
+    return scopes
@@ -0,0 +1,95 @@
+# modules/answer_clustering.py
+import zlib
+import numpy as np
+
+# Mersenne prime for the MinHash permutations
+_PRIME = (1 << 31) - 1
+
+class AnswerClusterer:
+    """
+    Groups identical and near-identical answers to one question.
+    Answers are compared on their normalized text: identical texts are
+    grouped by hash, and near-duplicates are found with MinHash signatures
+    over token bigrams, banded LSH for candidates, and an exact Jaccard
+    check. Each cluster is scored once through its representative.
+    """
+
+    def __init__(self, threshold=0.9, num_perm=64, bands=16, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.int64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.int64)
+
+    def _shingles(self, normalized_text):
+        tokens = normalized_text.split()
+        if len(tokens) < 2:
+            return set(tokens)
+        return {f'{tokens[i]} {tokens[i + 1]}' for i in range(len(tokens) - 1)}
+
+    def _signature(self, shingles):
+        hashes = np.array([zlib.crc32(s.encode('utf-8')) % _PRIME for s in shingles], dtype=np.int64)
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def cluster(self, normalized_texts):
+        """
+        Cluster a list of normalized texts
+        Returns a list giving, for each text, the index of its cluster's
+        representative (the first member in input order)
+        """
+        parent = list(range(len(normalized_texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # Keep the earliest member as the root
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        # Identical normalized texts. Texts that normalize to nothing stay
+        # on their own: a blank answer and one of only stopwords both
+        # normalize to '' but are not scored alike
+        first_seen = {}
+        distinct = []
+        for i, text in enumerate(normalized_texts):
+            if not text:
+                continue
+            if text in first_seen:
+                union(first_seen[text], i)
+            else:
+                first_seen[text] = i
+                distinct.append(i)
+
+        # Near-duplicates among the distinct texts
+        shingles = {i: self._shingles(normalized_texts[i]) for i in distinct}
+        buckets = {}
+        for i in distinct:
+            if not shingles[i]:
+                continue
+
+            signature = self._signature(shingles[i])
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                buckets.setdefault(key, []).append(i)
+
+        checked = set()
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pair = (members[x], members[y])
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+
+                    a, b = shingles[pair[0]], shingles[pair[1]]
+                    if len(a & b) / len(a | b) >= self.threshold:
+                        union(*pair)
+
+        return [find(i) for i in range(len(normalized_texts))]
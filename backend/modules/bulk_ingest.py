@@ -0,0 +1,172 @@
+# modules/bulk_ingest.py
+import io
+import os
+import csv
+import uuid
+import shutil
+import zipfile
+from werkzeug.utils import secure_filename
+from models.base import db
+from models.answer_sheet import AnswerSheet
+
+def file_extension(filename):
+    """Lower-case extension of an uploaded filename, '' if it has none"""
+    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+def stored_filename(filename, extension, prefix=''):
+    """
+    Unique name to save an upload under, ending in its validated extension
+    secure_filename drops non-ASCII characters, so a name like 'रमेश.pdf'
+    would otherwise be saved as just 'pdf'
+    """
+    stem = secure_filename(filename.rsplit('.', 1)[0])
+    return f'{prefix}{uuid.uuid4().hex}_{stem}.{extension}' if stem else f'{prefix}{uuid.uuid4().hex}.{extension}'
+
+class BulkIngestor:
+    """
+    Ingests a whole class of answer sheets in one request.
+    Files come from a ZIP archive or a multi-file upload and are mapped to
+    students through a CSV roster (filename, student_id, student_name);
+    with AUTO_IDENTIFY, files missing from the roster are identified from
+    their header instead.
+    Each file gets an AnswerSheet and a queued OCR job; the OCR worker pool
+    then processes the batch in parallel.
+    """
+    
+    def __init__(self, config, job_queue):
+        self.config = config
+        self.job_queue = job_queue
+    
+    def read_roster(self, roster_file):
+        """Parse the roster CSV into a mapping of filename -> (student_id, student_name)"""
+        roster = {}
+        reader = csv.DictReader(io.TextIOWrapper(roster_file.stream, encoding='utf-8-sig'))
+        
+        for row in reader:
+            filename = os.path.basename((row.get('filename') or '').strip())
+            student_id = (row.get('student_id') or '').strip()
+            if filename and student_id:
+                roster[filename] = (student_id, (row.get('student_name') or '').strip())
+        
+        return roster
+    
+    def _entry_problem(self, info):
+        """Why an archive entry must not be extracted, or None"""
+        if info.file_size > self.config.BULK_MAX_ENTRY_SIZE:
+            return 'File is too large once extracted'
+        if info.file_size > self.config.BULK_MAX_COMPRESSION_RATIO * max(info.compress_size, 1):
+            return 'File is compressed too highly to be an answer sheet'
+        return None
+    
+    def _iter_archive(self, archive_file, report):
+        """
+        Yield (filename, file object) for each entry, reading one entry at a time
+        Entries over the size or compression ratio limits are reported as
+        skipped; an archive with too many entries or too much data in total
+        is rejected with BadZipFile before anything is extracted. The limits
+        use the sizes in the central directory, which zipfile enforces while
+        reading, so an entry cannot inflate past its declared size.
+        """
+        with zipfile.ZipFile(archive_file.stream) as archive:
+            entries = []
+            total_size = 0
+            
+            for info in archive.infolist():
+                filename = os.path.basename(info.filename)
+                
+                # Skip directories and OS metadata such as __MACOSX/ and .DS_Store
+                if info.is_dir() or not filename or filename.startswith('.') or info.filename.startswith('__MACOSX/'):
+                    continue
+                
+                problem = self._entry_problem(info)
+                if problem is not None:
+                    report.append({'filename': filename, 'status': 'skipped', 'message': problem})
+                    continue
+                
+                entries.append((filename, info))
+                total_size += info.file_size
+            
+            if len(entries) > self.config.BULK_MAX_ENTRIES:
+                raise zipfile.BadZipFile(f'Archive has more than {self.config.BULK_MAX_ENTRIES} files')
+            if total_size > self.config.BULK_MAX_EXTRACTED_SIZE:
+                raise zipfile.BadZipFile('Archive is too large once extracted')
+            
+            for filename, info in entries:
+                with archive.open(info) as entry:
+                    yield filename, entry
+    
+    def _iter_files(self, files):
+        for file in files:
+            if file.filename:
+                yield os.path.basename(file.filename), file.stream
+    
+    def ingest(self, exam_id, roster, archive_file=None, files=None):
+        """
+        Save every sheet, create its AnswerSheet and OCR job in batched
+        transactions, and return (batch_id, per-file report)
+        """
+        batch_id = uuid.uuid4().hex
+        report = []
+        entries = self._iter_archive(archive_file, report) if archive_file is not None else self._iter_files(files or [])
+        pending = 0
+        
+        for filename, stream in entries:
+            extension = file_extension(filename)
+            if extension not in self.config.ALLOWED_EXTENSIONS:
+                report.append({'filename': filename, 'status': 'skipped', 'message': 'Unsupported file format'})
+                continue
+            
+            student = roster.get(filename)
+            if student is not None:
+                student_id, student_name = student
+                identification_status = 'manual'
+            elif self.config.AUTO_IDENTIFY:
+                # Identified from the sheet header by the OCR worker
+                student_id, student_name = '', ''
+                identification_status = 'pending'
+            else:
+                report.append({'filename': filename, 'status': 'skipped', 'message': 'Not found in roster'})
+                continue
+            
+            # Stream the file to disk without holding it in memory
+            file_path = os.path.join(self.config.UPLOAD_FOLDER, stored_filename(filename, extension))
+            with open(file_path, 'wb') as out:
+                shutil.copyfileobj(stream, out)
+            
+            answer_sheet = AnswerSheet(
+                exam_id=exam_id,
+                student_id=student_id,
+                student_name=student_name,
+                file_path=file_path,
+                processed=False,
+                identification_status=identification_status
+            )
+            db.session.add(answer_sheet)
+            db.session.flush()
+            
+            job = self.job_queue.enqueue(answer_sheet.id, file_path, batch_id=batch_id, commit=False)
+            db.session.flush()
+            
+            report.append({
+                'filename': filename,
+                'status': 'queued',
+                'student_id': student_id or None,
+                'identification_status': identification_status,
+                'answer_sheet_id': answer_sheet.id,
+                'job_id': job.id
+            })
+            
+            pending += 1
+            if pending >= self.config.BULK_BATCH_SIZE:
+                db.session.commit()
+                pending = 0
+        
+        db.session.commit()
+        
+        # Roster entries that had no matching file
+        uploaded = {entry['filename'] for entry in report}
+        for filename, (student_id, _) in roster.items():
+            if filename not in uploaded:
+                report.append({'filename': filename, 'status': 'missing', 'student_id': student_id, 'message': 'No file uploaded'})
+        
+        return batch_id, report
@@ -1,51 +1,236 @@
 # modules/evaluation.py
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-import string
+import regex
 import json
+import hashlib
+import threading
+from functools import lru_cache
+from collections import OrderedDict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from modules.keyword_matcher import KeywordMatcher
+from modules.similarity import create_similarity_backend, term_counts, pairwise_tfidf_similarity
+
+# Word tokens as NLTK's word_tokenize splits them: contractions become
+# 'ca' + "n't" or 'it' + "'s", hyphenated words and decimals stay whole,
+# and punctuation-only tokens are never produced. Word characters include
+# combining marks (\p{M}) so Devanagari and Gujarati vowel signs and
+# viramas stay inside their words; the stdlib re \w excludes them.
+WORD_TOKEN_PATTERN = regex.compile(
+    r"[\w\p{M}]+(?=n't\b)|n't\b|'(?:s|re|ve|ll|d|m)\b|[\w\p{M}]+(?:[-.][\w\p{M}]+)*"
+)
 
 class EvaluationEngine:
-    def __init__(self):
+    # Bump when preprocessing changes so stored question artifacts are rebuilt
+    ARTIFACT_VERSION = 3
+    
+    # Bump when scoring changes so every answer is re-evaluated once
+    EVALUATOR_VERSION = 2
+    
+    def __init__(self, cache_size=512, lemma_cache_size=100000, config=None):
+        self.config = config
+        
         # Initialize NLTK components
         self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = frozenset(stopwords.words('english'))
+        
+        # WordNet lookups are slow and answers reuse a small vocabulary
+        self._lemmatize = lru_cache(maxsize=lemma_cache_size)(self.lemmatizer.lemmatize)
         
+        # One keyword automaton per distinct keyword list, shared by every student
+        self._matcher = lru_cache(maxsize=cache_size)(self._build_matcher)
+        
+        # Compiled question artifacts keyed by (question id, question version)
+        self.cache_size = cache_size
+        self._compiled = OrderedDict()
+        self._compiled_lock = threading.Lock()
+        
+        # Similarity backends are built on first use
+        self._backends = {}
+        self._backends_lock = threading.Lock()
+        
+    def warmup(self):
+        """Load the lazily loaded NLTK corpora and the default similarity backend"""
+        self.preprocess_text('Warming up the evaluation engines')
+        self.get_backend(self.backend_for_exam(None))
+    
     def preprocess_text(self, text):
         """Preprocess text for evaluation"""
-        # Tokenize
-        tokens = word_tokenize(text.lower())
+        # Tokenize with a compiled regex instead of word_tokenize
+        tokens = WORD_TOKEN_PATTERN.findall(text.lower())
+        
+        # Remove stopwords and lemmatize through the memoized lemma table
+        stop_words = self.stop_words
+        lemmatize = self._lemmatize
+        
+        return ' '.join([lemmatize(token) for token in tokens if token not in stop_words])
+    
+    def preprocess_texts(self, texts):
+        """Preprocess a list of texts, normalizing each distinct text once"""
+        normalized = {}
+        for text in texts:
+            if text not in normalized:
+                normalized[text] = self.preprocess_text(text)
+        
+        return [normalized[text] for text in texts]
+    
+    def fingerprint(self, extracted_text, blank, question, backend='tfidf'):
+        """
+        Fingerprint of everything an answer's score depends on: its text,
+        the question version and marks, the evaluator version and the
+        similarity backend
+        """
+        inputs = [
+            extracted_text or '',
+            bool(blank),
+            question.id,
+            question.version,
+            question.max_marks,
+            self.ARTIFACT_VERSION,
+            self.EVALUATOR_VERSION
+        ]
+        # The default backend is left out so existing fingerprints stay valid
+        if backend != 'tfidf':
+            inputs.append(backend)
+        
+        digest = hashlib.sha256()
+        digest.update(json.dumps(inputs).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def rescore_fingerprint(self, answer, question, backend='tfidf'):
+        """
+        Fingerprint to score an Answer under, or None if it must keep its score
+        Teacher-reviewed answers are never overwritten, and answers whose
+        inputs are unchanged since they were scored are skipped
+        """
+        if answer.teacher_reviewed:
+            return None
+        
+        fingerprint = self.fingerprint(answer.extracted_text, answer.blank, question, backend)
+        if answer.fingerprint == fingerprint and answer.score is not None:
+            return None
+        
+        return fingerprint
+    
+    def record_result(self, answer, score, feedback, fingerprint, cluster_id=None):
+        """Write a score and its feedback back to an Answer (the caller commits)"""
+        answer.score = score
+        answer.feedback = feedback
+        answer.fingerprint = fingerprint
+        answer.cluster_id = cluster_id
+        # Evaluation can only be as reliable as the OCR it was run on
+        if answer.ocr_confidence is not None:
+            answer.ai_confidence = answer.ocr_confidence
+        else:
+            answer.ai_confidence = 0.8  # Placeholder for answers without OCR confidence
+    
+    def backend_for_exam(self, exam_id):
+        """Name of the similarity backend configured for an exam"""
+        if self.config is None:
+            return 'tfidf'
+        return self.config.SIMILARITY_BACKEND_BY_EXAM.get(exam_id, self.config.SIMILARITY_BACKEND)
+    
+    def get_backend(self, name='tfidf'):
+        """Return the shared similarity backend with the given name"""
+        with self._backends_lock:
+            backend = self._backends.get(name)
+            if backend is None:
+                backend = create_similarity_backend(name, self.config)
+                self._backends[name] = backend
+        
+        return backend
+    
+    def compile_question(self, model_answer, keywords, question_version=1):
+        """
+        Precompute everything about a question that does not depend on the student
+        Returns a JSON-serializable artifact with the normalized model answer,
+        its term counts (the two-document TF-IDF vocabulary) and the
+        normalized keywords
+        """
+        model_text = self.preprocess_text(model_answer)
+        keyword_texts = [self.preprocess_text(keyword) for keyword in keywords]
+        
+        return {
+            'artifact_version': self.ARTIFACT_VERSION,
+            'question_version': question_version,
+            'model_text': model_text,
+            'model_counts': dict(term_counts(model_text)),
+            'keywords': list(keywords),
+            'keyword_texts': keyword_texts,
+            'keyword_tokens': [text.split() for text in keyword_texts]
+        }
+    
+    def get_compiled(self, question):
+        """
+        Return the compiled artifact for a Question
+        The in-process LRU is checked first, then the artifact stored on the
+        question; stale or missing artifacts are rebuilt and written back to
+        question.compiled (the caller commits).
+        """
+        key = (question.id, question.version)
+        
+        with self._compiled_lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
         
-        # Remove punctuation and stopwords
-        tokens = [token for token in tokens if token not in string.punctuation]
-        tokens = [token for token in tokens if token not in self.stop_words]
+        compiled = json.loads(question.compiled) if question.compiled else None
+        if (compiled is None
+                or compiled.get('artifact_version') != self.ARTIFACT_VERSION
+                or compiled.get('question_version') != question.version):
+            compiled = self.compile_question(question.model_answer, json.loads(question.keywords), question.version)
+            question.compiled = json.dumps(compiled)
         
-        # Lemmatize
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+        with self._compiled_lock:
+            self._compiled[key] = compiled
+            self._compiled.move_to_end(key)
+            while len(self._compiled) > self.cache_size:
+                self._compiled.popitem(last=False)
         
-        return ' '.join(tokens)
+        return compiled
+    
+    def _compiled_similarity(self, processed_student, model_counts):
+        """
+        Cosine similarity of a pairwise TF-IDF fit, computed from the model
+        answer's precomputed term counts instead of fitting a vectorizer
+        """
+        return pairwise_tfidf_similarity(model_counts, processed_student)
+    
+    def _build_matcher(self, keyword_tokens):
+        return KeywordMatcher(keyword_tokens)
+    
+    def get_matcher(self, keyword_tokens):
+        """Return the cached keyword automaton for a list of keyword token sequences"""
+        return self._matcher(tuple(tuple(tokens) for tokens in keyword_tokens))
+    
+    def match_keywords(self, processed_answer, keywords, keyword_tokens):
+        """
+        Find keywords in a preprocessed answer in one pass of the automaton
+        Returns a tuple of (matched_keywords, positions) where positions maps
+        each matched keyword to its (start, end) token spans
+        """
+        matcher = self.get_matcher(keyword_tokens)
+        hits = matcher.match_positions(processed_answer.split())
+        
+        matched_keywords = [keyword for i, keyword in enumerate(keywords) if i in hits]
+        positions = {keywords[i]: spans for i, spans in hits.items()}
+        
+        return matched_keywords, positions
     
     def keyword_matching(self, student_answer, keywords):
         """
         Check for presence of keywords in student answer
         Returns a tuple of (matched_keywords, match_ratio)
         """
-        # Preprocess student answer
+        # Preprocess student answer and keywords
         processed_answer = self.preprocess_text(student_answer)
+        keyword_tokens = [self.preprocess_text(keyword).split() for keyword in keywords]
         
-        # Check for keyword matches
-        matched_keywords = []
-        for keyword in keywords:
-            # Preprocess keyword
-            processed_keyword = self.preprocess_text(keyword)
-            
-            # Check if keyword is in the answer
-            if processed_keyword in processed_answer:
-                matched_keywords.append(keyword)
+        # Check for keyword matches on whole tokens
+        matched_keywords, _ = self.match_keywords(processed_answer, keywords, keyword_tokens)
         
         # Calculate match ratio
         match_ratio = len(matched_keywords) / len(keywords) if keywords else 0
@@ -74,20 +259,35 @@ class EvaluationEngine:
         
         return similarity
     
-    def evaluate_answer(self, student_answer, model_answer, keywords, max_score):
+    def evaluate_answer(self, student_answer, model_answer, keywords, max_score, compiled=None, backend='tfidf'):
         """
         Evaluate a student answer against a model answer and keywords
+        If a compiled question artifact is given, the model answer and
+        keywords are not preprocessed again
         Returns a tuple of (score, feedback)
         """
+        if backend != 'tfidf':
+            return self.evaluate_batch([student_answer], model_answer, keywords, max_score, compiled=compiled, backend=backend)[0]
+        
         # Check for empty answer
         if not student_answer or student_answer.isspace():
             return 0, "No answer provided."
         
-        # Keyword matching
-        matched_keywords, keyword_ratio = self.keyword_matching(student_answer, keywords)
-        
-        # Semantic similarity
-        similarity = self.semantic_similarity(student_answer, model_answer)
+        if compiled is not None:
+            processed_answer = self.preprocess_text(student_answer)
+            
+            # Keyword matching with the question's shared automaton
+            matched_keywords, _ = self.match_keywords(processed_answer, compiled['keywords'], compiled['keyword_tokens'])
+            keyword_ratio = len(matched_keywords) / len(keywords) if keywords else 0
+            
+            # Semantic similarity against the precompiled vocabulary
+            similarity = self._compiled_similarity(processed_answer, compiled['model_counts'])
+        else:
+            # Keyword matching
+            matched_keywords, keyword_ratio = self.keyword_matching(student_answer, keywords)
+            
+            # Semantic similarity
+            similarity = self.semantic_similarity(student_answer, model_answer)
         
         # Calculate score
         # Weight: 60% keyword matching, 40% semantic similarity
@@ -99,6 +299,76 @@ class EvaluationEngine:
         
         return score, feedback
     
+    def evaluate_batch(self, student_answers, model_answer, keywords, max_score, compiled=None, backend='tfidf', representatives=None):
+        """
+        Evaluate every student answer to one question in a single pass
+        Similarities come from one call to the named similarity backend,
+        except tfidf with a compiled question artifact, which scores each
+        answer against the artifact's precomputed model term counts (the
+        same pairwise fit TfidfSimilarity computes). Every backend scores
+        each answer on its own, so a batch gives the same scores as
+        evaluate_answer would one answer at a time. A compiled question
+        artifact skips preprocessing the model answer and keywords.
+        representatives optionally gives, for each answer, the index of its
+        cluster representative: only representatives are scored, and the
+        other members share their score with feedback written for their
+        own text.
+        Returns a list of (score, feedback) tuples in the order of student_answers
+        """
+        if representatives is None:
+            representatives = list(range(len(student_answers)))
+        
+        results = [(0, "No answer provided.")] * len(student_answers)
+        
+        # Only non-empty representatives are scored
+        indices = sorted(i for i in set(representatives) if student_answers[i] and not student_answers[i].isspace())
+        if not indices:
+            return results
+        
+        if compiled is not None:
+            processed_model = compiled['model_text']
+            keyword_tokens = compiled['keyword_tokens']
+        else:
+            processed_model = self.preprocess_text(model_answer)
+            keyword_tokens = [self.preprocess_text(keyword).split() for keyword in keywords]
+        processed_answers = self.preprocess_texts([student_answers[i] for i in indices])
+        
+        # Semantic similarity against the model answer for the whole batch
+        similarity_backend = self.get_backend(backend)
+        if backend == 'tfidf' and compiled is not None:
+            similarities = [self._compiled_similarity(answer, compiled['model_counts']) for answer in processed_answers]
+        elif similarity_backend.normalized_input:
+            similarities = similarity_backend.similarities(processed_model, processed_answers)
+        else:
+            similarities = similarity_backend.similarities(model_answer, [student_answers[i] for i in indices])
+        
+        scored = {}
+        for i, processed_answer, similarity in zip(indices, processed_answers, similarities):
+            # Keyword matching
+            matched_keywords, _ = self.match_keywords(processed_answer, keywords, keyword_tokens)
+            keyword_ratio = len(matched_keywords) / len(keywords) if keywords else 0
+            
+            # Calculate score
+            # Weight: 60% keyword matching, 40% semantic similarity
+            similarity = float(similarity)
+            weighted_score = (0.6 * keyword_ratio + 0.4 * similarity) * max_score
+            score = min(round(weighted_score, 1), max_score)  # Round to 1 decimal place
+            
+            scored[i] = (score, matched_keywords, similarity)
+        
+        for i, representative in enumerate(representatives):
+            if representative not in scored:
+                continue
+            
+            score, matched_keywords, similarity = scored[representative]
+            
+            # Generate feedback
+            feedback = self._generate_feedback(student_answers[i], model_answer, matched_keywords, keywords, similarity)
+            
+            results[i] = (score, feedback)
+        
+        return results
+    
     def _generate_feedback(self, student_answer, model_answer, matched_keywords, all_keywords, similarity):
         """Generate feedback for the student"""
         feedback = []
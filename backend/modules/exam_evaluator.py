@@ -0,0 +1,318 @@
+# modules/exam_evaluator.py
+import os
+import json
+import socket
+import threading
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from models.base import db
+from models.evaluation_run import EvaluationRun
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from models.question import Question
+from modules.answer_clustering import AnswerClusterer
+from modules.job_queue import process_alive
+
+# Evaluation engine of a scoring worker process
+_engine = None
+
+def _init_scoring_worker(config):
+    global _engine
+    from modules.evaluation import EvaluationEngine
+    _engine = EvaluationEngine(config=config)
+
+def _score_question(question_id, model_answer, compiled, max_marks, answer_texts, cluster_settings=None, backend='tfidf'):
+    """
+    Score every answer to one question; runs in a worker process
+    With cluster_settings, near-identical answers are scored once through
+    their cluster representative; each member still gets feedback for its
+    own text.
+    Returns (question_id, results, representatives) where representatives
+    gives the index of each answer's cluster representative
+    """
+    representatives = list(range(len(answer_texts)))
+    if cluster_settings is not None:
+        normalized = _engine.preprocess_texts(answer_texts)
+        representatives = AnswerClusterer(**cluster_settings).cluster(normalized)
+    
+    results = _engine.evaluate_batch(
+        answer_texts,
+        model_answer,
+        compiled['keywords'],
+        max_marks,
+        compiled=compiled,
+        backend=backend,
+        representatives=representatives
+    )
+    
+    return question_id, results, representatives
+
+def _owner():
+    """Identifies the process evaluating a run"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def _owner_alive(owner):
+    """
+    Whether a run's owning process still exists; processes on other hosts
+    cannot be checked and are judged by their heartbeat alone
+    """
+    if not owner:
+        return True
+    
+    host, _, pid = owner.rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    
+    return process_alive(int(pid))
+
+class ExamEvaluator:
+    """
+    Evaluates an exam's answer sheets in one operation, re-scoring only
+    answers whose fingerprint changed and never teacher-reviewed ones.
+    Scoring is CPU-bound, so each question's cohort of answers is clustered
+    into near-duplicate groups and its representatives scored by
+    evaluate_batch in a process pool sized to the machine's cores. Results
+    are written back in batched transactions, and progress is kept on an
+    EvaluationRun row that clients poll. The row records its owning
+    process and a heartbeat, so a run whose process died is abandoned
+    instead of blocking the exam forever.
+    """
+    
+    def __init__(self, config, evaluation_engine):
+        self.config = config
+        self.evaluation_engine = evaluation_engine
+    
+    def start(self, app, exam_id, user_id):
+        """
+        Create an EvaluationRun and evaluate the exam in a background thread
+        Returns (run, created); an active run for the exam is returned as is
+        Active runs whose owning process died or stopped sending heartbeats
+        are failed first. The database allows one active run per exam, so
+        of two requests racing to start one, only the first creates it.
+        """
+        self.expire_stale_runs(exam_id)
+        
+        run = EvaluationRun(
+            exam_id=exam_id,
+            requested_by=user_id,
+            status='queued',
+            owner=_owner(),
+            heartbeat_at=datetime.utcnow()
+        )
+        db.session.add(run)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            active = self._active_run(exam_id)
+            if active is None:
+                raise
+            return active, False
+        
+        thread = threading.Thread(target=self._run_in_context, args=(app, run.id), daemon=True)
+        thread.start()
+        
+        return run, True
+    
+    def _active_run(self, exam_id):
+        return EvaluationRun.query.filter(
+            EvaluationRun.exam_id == exam_id,
+            EvaluationRun.status.in_(EvaluationRun.ACTIVE_STATUSES)
+        ).first()
+    
+    def expire_stale_runs(self, exam_id):
+        """
+        Fail the exam's active runs whose owner is gone: its process no
+        longer exists on this host, or it has not sent a heartbeat for
+        EVALUATION_RUN_TIMEOUT seconds
+        Returns the number of runs expired
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.config.EVALUATION_RUN_TIMEOUT)
+        expired = 0
+        
+        for run in EvaluationRun.query.filter(
+            EvaluationRun.exam_id == exam_id,
+            EvaluationRun.status.in_(EvaluationRun.ACTIVE_STATUSES)
+        ).all():
+            last_seen = run.heartbeat_at or run.created_at
+            if last_seen is not None and last_seen >= cutoff and _owner_alive(run.owner):
+                continue
+            
+            # Conditional on the heartbeat we saw, so a run that just beat is kept
+            expired += EvaluationRun.query.filter(
+                EvaluationRun.id == run.id,
+                EvaluationRun.status.in_(EvaluationRun.ACTIVE_STATUSES),
+                EvaluationRun.heartbeat_at.is_(None) if run.heartbeat_at is None else EvaluationRun.heartbeat_at == run.heartbeat_at
+            ).update({
+                'status': 'failed',
+                'error': 'The process running this evaluation stopped',
+                'finished_at': datetime.utcnow()
+            }, synchronize_session=False)
+        
+        db.session.commit()
+        return expired
+    
+    def get_status(self, run_id):
+        run = EvaluationRun.query.get(run_id)
+        return run.to_dict() if run else None
+    
+    def _run_in_context(self, app, run_id):
+        with app.app_context():
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(app, run_id, stop), daemon=True)
+            heartbeat.start()
+            try:
+                self.run(run_id)
+            finally:
+                stop.set()
+                heartbeat.join()
+    
+    def _heartbeat(self, app, run_id, stop):
+        """Refresh a run's heartbeat until it finishes, on a connection of its own"""
+        table = EvaluationRun.__table__
+        with app.app_context():
+            while not stop.wait(self.config.EVALUATION_HEARTBEAT_INTERVAL):
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        update(table)
+                        .where(table.c.id == run_id, table.c.status.in_(EvaluationRun.ACTIVE_STATUSES))
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+    
+    def run(self, run_id):
+        """Evaluate the changed answers of the run's exam"""
+        run = EvaluationRun.query.get(run_id)
+        run.status = 'running'
+        run.started_at = datetime.utcnow()
+        run.heartbeat_at = run.started_at
+        db.session.commit()
+        
+        try:
+            summary = self._evaluate(run)
+            run.status = 'done'
+            run.summary = json.dumps(summary)
+        except Exception as e:
+            db.session.rollback()
+            run.status = 'failed'
+            run.error = str(e)
+        
+        run.finished_at = datetime.utcnow()
+        db.session.commit()
+    
+    def _evaluate(self, run):
+        sheets = AnswerSheet.query.filter_by(exam_id=run.exam_id).all()
+        questions = {q.id: q for q in Question.query.filter_by(exam_id=run.exam_id).all()}
+        backend = self.evaluation_engine.backend_for_exam(run.exam_id)
+        
+        answers = []
+        if sheets:
+            answers = Answer.query.filter(Answer.answer_sheet_id.in_([sheet.id for sheet in sheets])).all()
+        
+        # Only answers whose inputs changed are re-scored; teacher-reviewed
+        # answers are never overwritten
+        fingerprints = {}
+        cohorts = {}
+        for answer in answers:
+            fingerprint = self.evaluation_engine.rescore_fingerprint(answer, questions[answer.question_id], backend)
+            if fingerprint is None:
+                continue
+            
+            fingerprints[answer.id] = fingerprint
+            cohorts.setdefault(answer.question_id, []).append(answer)
+        
+        answers_by_sheet = {}
+        for answer in answers:
+            answers_by_sheet.setdefault(answer.answer_sheet_id, []).append(answer)
+        
+        # Sheets that need their totals (re)written
+        touched = [
+            sheet for sheet in sheets
+            if not sheet.processed or any(a.id in fingerprints for a in answers_by_sheet.get(sheet.id, []))
+        ]
+        
+        compiled = {question_id: self.evaluation_engine.get_compiled(questions[question_id]) for question_id in cohorts}
+        
+        run.total_sheets = len(touched)
+        run.total_questions = len(cohorts)
+        db.session.commit()
+        
+        cluster_settings = None
+        if self.config.CLUSTER_ANSWERS:
+            cluster_settings = {
+                'threshold': self.config.CLUSTER_THRESHOLD,
+                'num_perm': self.config.CLUSTER_NUM_PERM,
+                'bands': self.config.CLUSTER_BANDS
+            }
+        
+        # Score each question's cohort of changed answers in parallel
+        scores = {}
+        clusters = {}
+        if cohorts:
+            workers = self.config.EVALUATION_PROCESSES or os.cpu_count() or 1
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(cohorts)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_scoring_worker,
+                initargs=(self.config,)
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _score_question,
+                        question_id,
+                        questions[question_id].model_answer,
+                        compiled[question_id],
+                        questions[question_id].max_marks,
+                        ['' if a.blank else (a.extracted_text or '') for a in cohort],
+                        cluster_settings,
+                        backend
+                    )
+                    for question_id, cohort in cohorts.items()
+                ]
+                
+                for future in as_completed(futures):
+                    question_id, results, representatives = future.result()
+                    cohort = cohorts[question_id]
+                    for answer, result, representative in zip(cohort, results, representatives):
+                        scores[answer.id] = result
+                        # Clusters are identified by their representative answer
+                        clusters[answer.id] = cohort[representative].id if cluster_settings else None
+                    
+                    run.scored_questions += 1
+                    db.session.commit()
+        
+        # Write results back a batch of sheets at a time
+        batch_size = max(1, self.config.EVALUATION_COMMIT_BATCH)
+        totals = []
+        
+        for i, sheet in enumerate(touched, start=1):
+            total_score = 0
+            for answer in answers_by_sheet.get(sheet.id, []):
+                if answer.id in scores:
+                    score, feedback = scores[answer.id]
+                    self.evaluation_engine.record_result(answer, score, feedback, fingerprints[answer.id], clusters[answer.id])
+                
+                total_score += answer.score or 0
+            
+            sheet.total_score = total_score
+            sheet.processed = True
+            sheet.evaluated_by = run.requested_by
+            totals.append(total_score)
+            
+            if i % batch_size == 0 or i == len(touched):
+                run.evaluated_sheets = i
+                db.session.commit()
+        
+        return {
+            'sheets_evaluated': len(touched),
+            'sheets_unchanged': len(sheets) - len(touched),
+            'answers_evaluated': len(scores),
+            'answers_unchanged': len(answers) - len(scores),
+            'answers_scored_via_cluster': sum(1 for answer_id, cluster_id in clusters.items() if cluster_id not in (None, answer_id)),
+            'max_possible': sum(q.max_marks for q in questions.values()),
+            'avg_score': round(sum(totals) / len(totals), 2) if totals else 0,
+            'max_score': max(totals) if totals else 0,
+            'min_score': min(totals) if totals else 0
+        }
@@ -0,0 +1,64 @@
+# modules/identification.py
+import re
+from models.answer_sheet import AnswerSheet
+
+class StudentIdentifier:
+    """
+    Resolves the student for answer sheets uploaded without one, from the
+    QR code, barcode or roll-number box on page 1.
+    Sheets whose identity is missing, conflicting or unknown are marked
+    'needs_review' so a teacher can resolve them from the review list.
+    """
+    
+    def __init__(self, config):
+        self.config = config
+        self.id_pattern = re.compile(config.STUDENT_ID_PATTERN)
+    
+    def identify(self, answer_sheet, ocr_engine):
+        """Fill in student_id/student_name on a pending answer sheet"""
+        candidates = [
+            c for c in ocr_engine.read_student_id(answer_sheet.file_path)
+            if self.id_pattern.fullmatch(c['student_id'])
+        ]
+        student_ids = {c['student_id'] for c in candidates}
+        
+        if not student_ids:
+            return self._needs_review(answer_sheet, 'No student ID found on the sheet')
+        
+        if len(student_ids) > 1:
+            return self._needs_review(answer_sheet, f"Conflicting student IDs: {', '.join(sorted(student_ids))}")
+        
+        student_id = student_ids.pop()
+        answer_sheet.student_id = student_id
+        
+        # Prefer a name carried in the code, then the name on an earlier sheet
+        student_name = next((c['student_name'] for c in candidates if c['student_name']), None)
+        if student_name is None:
+            previous = AnswerSheet.query.filter(
+                AnswerSheet.student_id == student_id,
+                AnswerSheet.id != answer_sheet.id,
+                AnswerSheet.student_name != ''
+            ).order_by(AnswerSheet.id.desc()).first()
+            student_name = previous.student_name if previous else None
+        
+        if student_name is None:
+            return self._needs_review(answer_sheet, f'Unknown student {student_id}')
+        
+        answer_sheet.student_name = student_name
+        
+        duplicate = AnswerSheet.query.filter(
+            AnswerSheet.exam_id == answer_sheet.exam_id,
+            AnswerSheet.student_id == student_id,
+            AnswerSheet.id != answer_sheet.id
+        ).first()
+        if duplicate:
+            return self._needs_review(answer_sheet, f'Student {student_id} already has answer sheet {duplicate.id}')
+        
+        answer_sheet.identification_status = 'auto'
+        answer_sheet.identification_note = None
+        return True
+    
+    def _needs_review(self, answer_sheet, note):
+        answer_sheet.identification_status = 'needs_review'
+        answer_sheet.identification_note = note
+        return False
@@ -0,0 +1,286 @@
+# modules/job_queue.py
+import os
+import json
+import time
+import multiprocessing
+from datetime import datetime, timedelta
+from flask import Flask
+from models.base import db
+from models.ocr_job import OCRJob
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from models.question import Question
+from models.region_template import RegionTemplate
+from modules.identification import StudentIdentifier
+
+class JobQueue:
+    """
+    Database-backed queue for answer-sheet OCR jobs.
+    The web process only enqueues jobs; a pool of local worker processes
+    claims them from the same database, so no external broker is needed.
+    Jobs left running by a worker that died, or held past
+    JOB_LEASE_TIMEOUT, are requeued by the remaining workers.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.identifier = StudentIdentifier(config)
+
+    def enqueue(self, answer_sheet_id, file_path, batch_id=None, commit=True):
+        """
+        Create a queued OCR job for an answer sheet and return it
+        Pass commit=False to add the job to a larger transaction
+        """
+        job = OCRJob(
+            answer_sheet_id=answer_sheet_id,
+            file_path=file_path,
+            batch_id=batch_id,
+            status='queued'
+        )
+
+        db.session.add(job)
+        if commit:
+            db.session.commit()
+
+        return job
+
+    def get_batch_status(self, batch_id):
+        """Get the status of every job in a bulk upload batch"""
+        jobs = OCRJob.query.filter_by(batch_id=batch_id).order_by(OCRJob.id).all()
+        if not jobs:
+            return None
+
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+
+        return {
+            'batch_id': batch_id,
+            'total': len(jobs),
+            'counts': counts,
+            'jobs': [job.to_dict() for job in jobs]
+        }
+
+    def get_status(self, job_id):
+        """Get the status of a job, including extracted text once it is done"""
+        job = OCRJob.query.get(job_id)
+        if not job:
+            return None
+
+        status = job.to_dict()
+
+        if job.status == 'done':
+            rows = db.session.query(Question.question_number, Answer.extracted_text).join(
+                Answer, Answer.question_id == Question.id
+            ).filter(Answer.answer_sheet_id == job.answer_sheet_id).all()
+            status['extracted_text'] = {f'q{number}': text for number, text in rows}
+
+        return status
+
+    def claim_next(self):
+        """
+        Atomically claim the oldest queued job.
+        Returns the claimed job, or None if the queue is empty.
+        """
+        while True:
+            job = OCRJob.query.filter_by(status='queued').order_by(OCRJob.id).first()
+            if job is None:
+                return None
+
+            # Only one worker can win the queued -> running transition
+            claimed = OCRJob.query.filter_by(id=job.id, status='queued').update({
+                'status': 'running',
+                'started_at': datetime.utcnow(),
+                'worker_pid': os.getpid(),
+                'attempts': OCRJob.attempts + 1
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if claimed:
+                db.session.refresh(job)
+                return job
+
+    def recover_stale_jobs(self):
+        """
+        Requeue running jobs whose worker died or whose lease expired
+        A job that has already been claimed JOB_MAX_ATTEMPTS times is failed
+        instead, so a sheet that crashes its worker is not retried forever.
+        Returns the number of jobs recovered.
+        """
+        lease_start = datetime.utcnow() - timedelta(seconds=self.config.JOB_LEASE_TIMEOUT)
+        recovered = 0
+
+        for job in OCRJob.query.filter_by(status='running').all():
+            expired = job.started_at is None or job.started_at < lease_start
+            if not expired and process_alive(job.worker_pid):
+                continue
+
+            if job.attempts >= self.config.JOB_MAX_ATTEMPTS:
+                values = {
+                    'status': 'failed',
+                    'error': f'Worker stopped before finishing the job ({job.attempts} attempts)',
+                    'finished_at': datetime.utcnow()
+                }
+            else:
+                values = {'status': 'queued', 'started_at': None, 'worker_pid': None, 'processed_pages': 0}
+
+            # Conditional on the claim we saw, so a job another worker just
+            # recovered or finished is left alone
+            recovered += OCRJob.query.filter_by(
+                id=job.id, status='running', worker_pid=job.worker_pid, attempts=job.attempts
+            ).update(values, synchronize_session=False)
+
+        db.session.commit()
+        return recovered
+
+    def run_job(self, job, ocr_engine):
+        """Run OCR for a claimed job and create the Answer rows"""
+        answer_sheet = AnswerSheet.query.get(job.answer_sheet_id)
+        attempt = job.attempts
+
+        def on_page(page_number, total_pages):
+            job.processed_pages = page_number
+            job.total_pages = total_pages
+            db.session.commit()
+
+        try:
+            # Sheets uploaded without a student are identified from page 1
+            if answer_sheet.identification_status == 'pending':
+                self.identifier.identify(answer_sheet, ocr_engine)
+                db.session.commit()
+
+            # Use the exam's region template if one has been registered
+            region_template = RegionTemplate.query.filter_by(exam_id=answer_sheet.exam_id).first()
+            exam_template = ocr_engine.load_template(region_template) if region_template else None
+
+            # A student writes every exam in the same script, so detection is
+            # cached per student; sheets still waiting for a student would
+            # all share one key
+            script_key = answer_sheet.student_id or None
+
+            extracted_text = ocr_engine.process_answer_sheet(
+                job.file_path,
+                exam_template,
+                progress_callback=on_page,
+                script_key=script_key
+            )
+
+            # A job whose lease expired may have been given to another worker
+            if not OCRJob.query.filter_by(id=job.id, status='running', worker_pid=os.getpid(), attempts=attempt).count():
+                db.session.rollback()
+                return
+
+            # Create answer records for each question
+            questions = Question.query.filter_by(exam_id=answer_sheet.exam_id).all()
+
+            for question in questions:
+                question_id = f'q{question.question_number}'
+                # No region was found for the question, so nothing was read; this
+                # is not a blank answer, and a confidence of 0 flags it for review
+                region = extracted_text.get(question_id, {'text': '', 'blank': False, 'confidence': 0.0})
+
+                new_answer = Answer(
+                    answer_sheet_id=answer_sheet.id,
+                    question_id=question.id,
+                    extracted_text=region['text'],
+                    ocr_confidence=region['confidence'],
+                    blank=region['blank']
+                )
+
+                db.session.add(new_answer)
+
+            job.status = 'done'
+            job.stage_timings = json.dumps(ocr_engine.last_timings)
+
+        except Exception as e:
+            db.session.rollback()
+            job.status = 'failed'
+            job.error = str(e)
+
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    def work(self, ocr_engine):
+        """Process jobs forever, sleeping while the queue is empty"""
+        poll_interval = self.config.JOB_POLL_INTERVAL
+
+        # Jobs left running by a worker that crashed or was killed
+        self.recover_stale_jobs()
+
+        while True:
+            job = self.claim_next()
+            if job is None:
+                self.recover_stale_jobs()
+                time.sleep(poll_interval)
+                continue
+
+            self.run_job(job, ocr_engine)
+
+    def run_workers(self, num_workers=None):
+        """Start the OCR worker processes and block until they exit"""
+        num_workers = num_workers or self.config.OCR_WORKERS
+        context = multiprocessing.get_context('spawn')
+
+        workers = [
+            context.Process(target=_worker_main, args=(self.config,), name=f'ocr-worker-{i}')
+            for i in range(num_workers)
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
+
+
+def process_alive(pid):
+    """Whether a process with this pid exists on this machine"""
+    if pid is None:
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+
+    return True
+
+
+def _worker_main(config):
+    """Entry point of a single OCR worker process"""
+    # Imported here so the web process does not pay for OCR dependencies
+    from modules.ocr_engine import OCREngine
+    # Register every table so foreign keys resolve
+    from models.user import User
+    from models.exam import Exam
+
+    from modules.score_aggregates import register_listeners
+
+    app = Flask(__name__)
+    app.config.from_object(config)
+    db.init_app(app)
+    register_listeners()
+
+    # Answers and identified students change analytics served by the web workers
+    if config.ANALYTICS_CACHE_ENABLED:
+        from modules.analytics_cache import AnalyticsCache, register_invalidation
+        register_invalidation(AnalyticsCache(
+            config.ANALYTICS_CACHE_PATH,
+            max_entries=config.ANALYTICS_CACHE_SIZE,
+            shared_responses=config.ANALYTICS_CACHE_SHARED_RESPONSES
+        ))
+
+    ocr_engine = OCREngine(config)
+
+    # The schema is created by `flask init-db`, not by every worker start
+    with app.app_context():
+        JobQueue(config).work(ocr_engine)
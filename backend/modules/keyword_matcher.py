@@ -0,0 +1,79 @@
+# modules/keyword_matcher.py
+from collections import deque
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over token sequences.
+    Built once per question from the normalized keywords (single words or
+    multi-word phrases); find() reports every keyword occurrence in one pass
+    over an answer's tokens. Matching is on whole tokens, so 'cell' does not
+    match inside 'cellular'.
+    """
+    
+    def __init__(self, keyword_tokens):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        
+        # Keywords that normalize to nothing (e.g. only stopwords) match trivially
+        self.empty_keywords = []
+        
+        # Build the trie
+        for index, tokens in enumerate(keyword_tokens):
+            if not tokens:
+                self.empty_keywords.append(index)
+                continue
+            
+            node = 0
+            for token in tokens:
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][token] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = child
+            
+            self._output[node].append((index, len(tokens)))
+        
+        # Breadth-first pass to add failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+    
+    def find(self, tokens):
+        """
+        Find all keyword occurrences in a token list
+        Returns a list of (keyword_index, start, end) token positions
+        """
+        matches = []
+        node = 0
+        
+        for position, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            
+            for index, length in self._output[node]:
+                matches.append((index, position - length + 1, position + 1))
+        
+        return matches
+    
+    def match_positions(self, tokens):
+        """Return a dict of keyword index -> list of (start, end) positions"""
+        positions = {index: [] for index in self.empty_keywords}
+        for index, start, end in self.find(tokens):
+            positions.setdefault(index, []).append((start, end))
+        return positions
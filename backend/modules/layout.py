@@ -0,0 +1,114 @@
+# modules/layout.py
+import os
+import glob
+import cv2
+import numpy as np
+
+class LayoutRegistry:
+    """
+    Registers exam region templates against a blank reference sheet and
+    aligns incoming pages to them.
+    ORB features of each reference page are computed once per template
+    version and cached on disk and in memory, so each scanned page only
+    needs its own features extracted and matched.
+    """
+    
+    def __init__(self, config):
+        self.config = config
+        self.cache_folder = config.TEMPLATE_CACHE_FOLDER
+        self._loaded = {}  # exam_id -> template dict
+        
+        os.makedirs(self.cache_folder, exist_ok=True)
+    
+    def _cache_path(self, exam_id, version):
+        return os.path.join(self.cache_folder, f'exam_{exam_id}_v{version}.npz')
+    
+    def _features(self, image):
+        """Detect ORB features on a downscaled copy, returned in full-size coordinates"""
+        scale = min(1.0, self.config.TEMPLATE_ALIGN_WIDTH / image.shape[1])
+        if scale < 1.0:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        orb = cv2.ORB_create(nfeatures=self.config.TEMPLATE_ORB_FEATURES)
+        keypoints, descriptors = orb.detectAndCompute(image, None)
+        
+        points = np.float32([kp.pt for kp in keypoints]).reshape(-1, 2) / scale
+        if descriptors is None:
+            descriptors = np.zeros((0, 32), np.uint8)
+        
+        return points, descriptors
+    
+    def register(self, exam_id, version, regions, reference_pages):
+        """
+        Compute and cache alignment artifacts for a template.
+        reference_pages are the preprocessed pages of the blank reference sheet.
+        """
+        pages = []
+        for page in reference_pages:
+            points, descriptors = self._features(page)
+            pages.append({'points': points, 'descriptors': descriptors, 'shape': page.shape[:2]})
+        
+        # Drop artifacts of older versions of this template
+        for stale in glob.glob(os.path.join(self.cache_folder, f'exam_{exam_id}_v*.npz')):
+            os.remove(stale)
+        
+        arrays = {}
+        for i, page in enumerate(pages):
+            arrays[f'points_{i}'] = page['points']
+            arrays[f'descriptors_{i}'] = page['descriptors']
+            arrays[f'shape_{i}'] = np.array(page['shape'])
+        np.savez(self._cache_path(exam_id, version), page_count=len(pages), **arrays)
+        
+        template = {'exam_id': exam_id, 'version': version, 'regions': regions, 'pages': pages}
+        self._loaded[exam_id] = template
+        return template
+    
+    def load(self, exam_id, version, regions):
+        """Return cached artifacts for a template version, or None if not registered"""
+        template = self._loaded.get(exam_id)
+        if template is not None and template['version'] == version:
+            return template
+        
+        path = self._cache_path(exam_id, version)
+        if not os.path.exists(path):
+            return None
+        
+        with np.load(path) as data:
+            pages = [
+                {
+                    'points': data[f'points_{i}'],
+                    'descriptors': data[f'descriptors_{i}'],
+                    'shape': tuple(data[f'shape_{i}'])
+                }
+                for i in range(int(data['page_count']))
+            ]
+        
+        template = {'exam_id': exam_id, 'version': version, 'regions': regions, 'pages': pages}
+        self._loaded[exam_id] = template
+        return template
+    
+    def align(self, image, reference):
+        """
+        Warp a page onto its reference page.
+        Falls back to a plain resize when too few features match.
+        """
+        ref_height, ref_width = reference['shape']
+        points, descriptors = self._features(image)
+        
+        good = []
+        if len(descriptors) and len(reference['descriptors']):
+            matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+            for pair in matcher.knnMatch(descriptors, reference['descriptors'], k=2):
+                # Lowe's ratio test
+                if len(pair) == 2 and pair[0].distance < 0.75 * pair[1].distance:
+                    good.append(pair[0])
+        
+        if len(good) >= self.config.TEMPLATE_MIN_MATCHES:
+            src = points[[m.queryIdx for m in good]]
+            dst = reference['points'][[m.trainIdx for m in good]]
+            homography, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+            
+            if homography is not None:
+                return cv2.warpPerspective(image, homography, (ref_width, ref_height), borderValue=255)
+        
+        return cv2.resize(image, (ref_width, ref_height), interpolation=cv2.INTER_AREA)
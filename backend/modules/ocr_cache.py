@@ -0,0 +1,151 @@
+# modules/ocr_cache.py
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+class OCRCache:
+    """
+    Persistent, content-addressed cache of OCR results.
+    Entries are keyed by a hash of the preprocessed region pixels plus the
+    Tesseract configuration, stored in a SQLite file shared by all OCR workers
+    and evicted least-recently-used once max_entries is exceeded.
+    Lookups only read: hit/miss counters and last_used refreshes are kept
+    in memory and written by flush(), once per answer sheet. last_used is
+    only refreshed once it is touch_interval seconds old, which is all the
+    precision LRU eviction needs.
+    """
+
+    def __init__(self, path, max_entries=50000, touch_interval=3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+
+        # Counters and last_used refreshes not yet written by flush()
+        self._hits = 0
+        self._misses = 0
+        self._touched = {}  # key -> last_used
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS ocr_cache ('
+            'key TEXT PRIMARY KEY, text TEXT NOT NULL, confidence REAL, last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_ocr_cache_last_used ON ocr_cache (last_used)')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS ocr_cache_stats ('
+            'id INTEGER PRIMARY KEY CHECK (id = 1), hits INTEGER NOT NULL, misses INTEGER NOT NULL)'
+        )
+        self._conn.execute('INSERT OR IGNORE INTO ocr_cache_stats (id, hits, misses) VALUES (1, 0, 0)')
+        self._conn.commit()
+
+        # Entry count as of the last count plus this process's inserts; other
+        # workers' inserts are picked up when eviction recounts
+        self._entries = self._conn.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0]
+
+    @staticmethod
+    def make_key(image, ocr_config):
+        """Hash the region pixels together with the OCR configuration"""
+        digest = hashlib.sha256()
+        digest.update(ocr_config.encode('utf-8'))
+        digest.update(str(image.shape).encode('ascii'))
+        digest.update(str(image.dtype).encode('ascii'))
+        digest.update(memoryview(image if image.flags['C_CONTIGUOUS'] else image.copy()))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached (text, confidence) for a key, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute('SELECT text, confidence, last_used FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            now = time.time()
+            if now - row[2] >= self.touch_interval:
+                self._touched[key] = now
+
+        return row[0], row[1]
+
+    def put(self, key, text, confidence=None):
+        """Store a result and evict the least recently used entries over the limit"""
+        with self._lock:
+            inserted = self._conn.execute(
+                'INSERT OR IGNORE INTO ocr_cache (key, text, confidence, last_used) VALUES (?, ?, ?, ?)',
+                (key, text, confidence, time.time())
+            ).rowcount
+            if inserted:
+                self._entries += 1
+            else:
+                self._conn.execute(
+                    'UPDATE ocr_cache SET text = ?, confidence = ?, last_used = ? WHERE key = ?',
+                    (text, confidence, time.time(), key)
+                )
+
+            if self._entries > self.max_entries:
+                self._evict()
+
+            self._conn.commit()
+
+    def _evict(self):
+        """Delete the least recently used entries, leaving room for a batch of inserts"""
+        count = self._conn.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0]
+        target = self.max_entries - max(1, self.max_entries // 100)
+
+        if count > target:
+            self._conn.execute(
+                'DELETE FROM ocr_cache WHERE key IN ('
+                'SELECT key FROM ocr_cache ORDER BY last_used ASC LIMIT ?)',
+                (count - target,)
+            )
+            count = target
+
+        self._entries = count
+
+    def flush(self):
+        """Write the pending hit/miss counters and last_used refreshes"""
+        with self._lock:
+            if not (self._hits or self._misses or self._touched):
+                return
+
+            self._conn.execute(
+                'UPDATE ocr_cache_stats SET hits = hits + ?, misses = misses + ? WHERE id = 1',
+                (self._hits, self._misses)
+            )
+            self._conn.executemany(
+                'UPDATE ocr_cache SET last_used = ? WHERE key = ?',
+                [(last_used, key) for key, last_used in self._touched.items()]
+            )
+            self._conn.commit()
+
+            self._hits = 0
+            self._misses = 0
+            self._touched = {}
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries"""
+        self.flush()
+
+        with self._lock:
+            hits, misses = self._conn.execute(
+                'SELECT hits, misses FROM ocr_cache_stats WHERE id = 1'
+            ).fetchone()
+            entries = self._conn.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0]
+
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0,
+            'entries': entries,
+            'max_entries': self.max_entries
+        }
@@ -5,9 +5,23 @@ import pytesseract
 from PIL import Image
 import os
 import json
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+import re
 import tempfile
+import threading
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
+from modules.ocr_cache import OCRCache
+from modules.layout import LayoutRegistry
+from modules.preprocessing import PreprocessingPipeline
+
+# Unicode ranges used to tell which Tesseract language a text was written in
+SCRIPT_PATTERNS = {
+    'eng': re.compile(r'[A-Za-z]'),
+    'hin': re.compile(r'[\u0900-\u097F]'),
+    'guj': re.compile(r'[\u0A80-\u0AFF]')
+}
 
 class OCREngine:
     def __init__(self, config):
@@ -18,47 +32,138 @@ class OCREngine:
         
         # Create upload directory if it doesn't exist
         os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
-    
-    def preprocess_image(self, image):
-        """Preprocess image for better OCR results"""
-        # Convert to grayscale if it's a color image
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        # Persistent cache of OCR results keyed by region pixels
+        if config.OCR_CACHE_ENABLED:
+            self.cache = OCRCache(config.OCR_CACHE_PATH, config.OCR_CACHE_MAX_ENTRIES, config.OCR_CACHE_TOUCH_INTERVAL)
         else:
-            gray = image
+            self.cache = None
         
-        # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 11, 2
-        )
+        # Per-exam region templates and their alignment artifacts
+        self.layouts = LayoutRegistry(config)
         
-        # Noise removal
-        kernel = np.ones((1, 1), np.uint8)
-        opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+        # Page preprocessing; one buffer slot per page that can be in flight
+        self.pipeline = PreprocessingPipeline(config, buffer_slots=max(1, config.OCR_PAGE_WINDOW))
+        self._pipeline_lock = threading.Lock()
+        self.last_timings = {}
         
-        return opening
+        # Detected languages per student, so the student's other sheets skip detection
+        self._script_cache = OrderedDict()
+        self._script_cache_lock = threading.Lock()
+    
+    def preprocess_image(self, image):
+        """Preprocess image for better OCR results"""
+        return self.pipeline.run(image)
     
     def load_file(self, filepath):
         """Load image or PDF file and return list of images"""
+        return list(self.iter_pages(filepath))
+    
+    def count_pages(self, filepath):
+        """Return the number of pages in an image or PDF file"""
+        if filepath.lower().endswith(('.png', '.jpg', '.jpeg', '.tif', '.tiff')):
+            return 1
+        elif filepath.lower().endswith('.pdf'):
+            return pdfinfo_from_path(filepath)['Pages']
+        else:
+            raise ValueError("Unsupported file format")
+    
+    def iter_pages(self, filepath):
+        """
+        Yield the pages of an image or PDF file one at a time as NumPy arrays.
+        PDFs are rasterized PDF_RASTER_WINDOW pages at a time, so memory use
+        does not grow with the number of pages.
+        """
+        grayscale = self.config.PDF_GRAYSCALE
+        
         if filepath.lower().endswith(('.png', '.jpg', '.jpeg', '.tif', '.tiff')):
-            return [cv2.imread(filepath)]
+            flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+            yield cv2.imread(filepath, flags)
         elif filepath.lower().endswith('.pdf'):
-            # Convert PDF to images
-            images = convert_from_path(filepath)
-            return [np.array(img) for img in images]
+            total_pages = self.count_pages(filepath)
+            window = max(1, self.config.PDF_RASTER_WINDOW)
+            
+            for first_page in range(1, total_pages + 1, window):
+                last_page = min(first_page + window - 1, total_pages)
+                
+                # Convert only this window of pages to images
+                images = convert_from_path(
+                    filepath,
+                    dpi=self.config.PDF_DPI,
+                    first_page=first_page,
+                    last_page=last_page,
+                    grayscale=grayscale
+                )
+                
+                while images:
+                    img = images.pop(0)
+                    # pdf2image returns RGB; OpenCV expects BGR
+                    page = np.asarray(img) if grayscale else cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+                    img.close()
+                    yield page
         else:
             raise ValueError("Unsupported file format")
     
-    def detect_answer_regions(self, image, template=None):
+    def reference_pages(self, reference_path):
+        """Preprocessed pages of a blank reference sheet"""
+        return [self.preprocess_image(page) for page in self.iter_pages(reference_path)]
+    
+    def register_template(self, region_template, reference_pages=None):
+        """
+        Register a RegionTemplate against its blank reference sheet.
+        reference_pages, if already read with reference_pages(), are reused.
+        Returns the template to pass to process_answer_sheet.
+        """
+        if reference_pages is None:
+            reference_pages = self.reference_pages(region_template.reference_path)
+        
+        return self.layouts.register(
+            region_template.exam_id,
+            region_template.version,
+            region_template.get_regions(),
+            reference_pages
+        )
+    
+    def load_template(self, region_template):
+        """Load cached alignment artifacts for a RegionTemplate, registering it if needed"""
+        template = self.layouts.load(
+            region_template.exam_id,
+            region_template.version,
+            region_template.get_regions()
+        )
+        
+        if template is None:
+            template = self.register_template(region_template)
+        
+        return template
+    
+    def detect_answer_regions(self, image, template=None, page_num=0):
         """
         Detect answer regions in the image.
         If template is provided, use template matching.
         Otherwise, use general document segmentation.
         """
         if template is not None:
-            # Template matching implementation
-            pass
+            # Only this page's handwriting boxes are cropped
+            if page_num >= len(template['pages']):
+                return []
+            
+            # Align the page to the reference sheet so template boxes line up
+            aligned = self.layouts.align(image, template['pages'][page_num])
+            
+            regions = []
+            for region in template['regions']:
+                if region.get('page', 1) != page_num + 1:
+                    continue
+                
+                x, y, w, h = region['box']
+                regions.append({
+                    'id': region['id'],
+                    'image': aligned[y:y + h, x:x + w],
+                    'coordinates': (x, y, x + w, y + h)
+                })
+            
+            return regions
         else:
             # Simple document segmentation
             # For this example, we'll divide the page into question regions
@@ -81,20 +186,252 @@ class OCREngine:
             
             return regions
     
-    def extract_text(self, image):
-        """Extract text from preprocessed image using OCR"""
+    def is_blank_region(self, binary):
+        """
+        Cheap check for an unanswered region on a binarized image.
+        A region is blank if it has too little ink overall or no connected
+        stroke large enough to be handwriting rather than scanner noise.
+        """
+        ink = binary < 128
+        ink_ratio = np.count_nonzero(ink) / ink.size if ink.size else 0
+        if ink_ratio < self.config.BLANK_INK_RATIO:
+            return True
+        
+        # Count ink components bigger than speckle noise (label 0 is background)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(ink.astype(np.uint8), connectivity=8)
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        return np.count_nonzero(areas >= self.config.BLANK_MIN_COMPONENT_AREA) == 0
+    
+    def _parse_id_payload(self, payload, source):
+        """Split a decoded code of the form 'ID' or 'ID|Name' into a candidate"""
+        parts = [part.strip() for part in payload.split('|', 1)]
+        return {
+            'student_id': parts[0],
+            'student_name': parts[1] if len(parts) > 1 and parts[1] else None,
+            'source': source
+        }
+    
+    def read_student_id(self, filepath):
+        """
+        Read the student identifier from page 1 of an answer sheet
+        QR codes and barcodes are decoded first; if there are none, the
+        fixed roll-number box (ROLL_NUMBER_BOX, as page fractions) is OCR'd.
+        Returns a list of candidates {'student_id', 'student_name', 'source'}
+        """
+        page = next(self.iter_pages(filepath))
+        candidates = []
+        
+        # QR code
+        payload, _, _ = cv2.QRCodeDetector().detectAndDecode(page)
+        if payload:
+            candidates.append(self._parse_id_payload(payload, 'qr'))
+        
+        # 1D barcodes; the decode API changed in OpenCV 4.8
+        if hasattr(cv2, 'barcode'):
+            detector = cv2.barcode.BarcodeDetector()
+            if hasattr(detector, 'detectAndDecodeWithType'):
+                ok, decoded, _, _ = detector.detectAndDecodeWithType(page)
+            else:
+                ok, decoded, _, _ = detector.detectAndDecode(page)
+            
+            for payload in (decoded or []) if ok else []:
+                if payload:
+                    candidates.append(self._parse_id_payload(payload, 'barcode'))
+        
+        if candidates:
+            return candidates
+        
+        # Handwritten or printed roll number in a fixed box
+        height, width = page.shape[:2]
+        x, y, w, h = self.config.ROLL_NUMBER_BOX
+        box = page[int(y * height):int((y + h) * height), int(x * width):int((x + w) * width)]
+        
+        box = self.preprocess_image(box) if box.size else box
+        if box.size and not self.is_blank_region(box):
+            roll_config = '--oem 3 --psm 7 -l eng -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+            text = pytesseract.image_to_string(box, config=roll_config)
+            roll_number = re.sub(r'\s+', '', text)
+            if roll_number:
+                candidates.append({'student_id': roll_number, 'student_name': None, 'source': 'roll_box'})
+        
+        return candidates
+    
+    def tesseract_config(self, languages=None):
+        """Build the Tesseract command-line configuration"""
         # Configure tesseract for handwritten text
-        custom_config = f'--oem 3 --psm 6 -l {self.config.OCR_LANGUAGES}'
+        return f'--oem 3 --psm 6 -l {languages or self.config.OCR_LANGUAGES}'
+    
+    def detect_languages(self, text):
+        """
+        Pick the smallest set of configured languages whose script appears in text
+        Returns a Tesseract language string, or None if there is too little text
+        """
+        configured = self.config.OCR_LANGUAGES.split('+')
+        counts = {
+            lang: len(SCRIPT_PATTERNS[lang].findall(text))
+            for lang in configured if lang in SCRIPT_PATTERNS
+        }
+        
+        total = sum(counts.values())
+        if total < self.config.SCRIPT_MIN_CHARS:
+            return None
+        
+        # Languages without a known script are always kept
+        chosen = [
+            lang for lang in configured
+            if lang not in counts or counts[lang] / total >= self.config.SCRIPT_MIN_SHARE
+        ]
+        
+        return '+'.join(chosen)
+    
+    def _script_state(self, script_key):
+        """Detection state shared by one sheet's region threads"""
+        languages = None
+        if script_key is not None:
+            with self._script_cache_lock:
+                if script_key in self._script_cache:
+                    languages = self._script_cache[script_key]
+                    self._script_cache.move_to_end(script_key)
+        
+        return {
+            'languages': languages,
+            'detecting': False,  # a region is OCR'ing with every language to detect the script
+            'attempts': 0,
+            'changed': threading.Condition()
+        }
+    
+    def _sheet_languages(self, script):
+        """
+        Return (languages, detecting) for a region about to be OCR'd
+        While the sheet's script is unknown, one region at a time is OCR'd
+        with every language (languages is None) and detecting is True; the
+        others wait for its result instead of also running every language.
+        After SCRIPT_DETECTION_ATTEMPTS regions had too little text to tell,
+        regions stop waiting, but each still detects from its own text.
+        """
+        if not self.config.OCR_SCRIPT_DETECTION:
+            return self.config.OCR_LANGUAGES, False
         
-        # Extract text using OCR
-        text = pytesseract.image_to_string(image, config=custom_config)
+        with script['changed']:
+            while script['languages'] is None:
+                if script['detecting']:
+                    script['changed'].wait()
+                    continue
+                
+                if script['attempts'] < self.config.SCRIPT_DETECTION_ATTEMPTS:
+                    script['detecting'] = True
+                    script['attempts'] += 1
+                    return None, True
+                
+                return None, False
+            
+            return script['languages'], False
+    
+    def _record_sheet_languages(self, script, script_key, text, detecting):
+        """
+        Detect the sheet's script from a region's all-language text, share
+        it with the sheet's other regions and cache it per script_key
+        text is None when the region's OCR failed
+        """
+        languages = self.detect_languages(text) if text else None
+        
+        with script['changed']:
+            if detecting:
+                script['detecting'] = False
+            if languages is not None and script['languages'] is None:
+                script['languages'] = languages
+            else:
+                languages = None
+            script['changed'].notify_all()
         
-        return text.strip()
+        if languages is not None and script_key is not None:
+            with self._script_cache_lock:
+                self._script_cache[script_key] = languages
+                self._script_cache.move_to_end(script_key)
+                while len(self._script_cache) > self.config.SCRIPT_CACHE_SIZE:
+                    self._script_cache.popitem(last=False)
     
-    def process_answer_sheet(self, file, exam_template=None):
+    def _run_tesseract(self, image, scale, custom_config):
+        """
+        Run Tesseract on a rescaled image
+        Returns a tuple of (text, mean word confidence between 0 and 1)
+        """
+        if scale != 1.0:
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation)
+        
+        data = pytesseract.image_to_data(image, config=custom_config, output_type=pytesseract.Output.DICT)
+        
+        # Rebuild the text line by line; non-word boxes have a confidence of -1
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data['text']):
+            conf = float(data['conf'][i])
+            if conf < 0 or not word.strip():
+                continue
+            
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(line_key, []).append(word)
+            confidences.append(conf)
+        
+        text = '\n'.join(' '.join(words) for _, words in sorted(lines.items()))
+        confidence = sum(confidences) / len(confidences) / 100 if confidences else 0.0
+        
+        return text.strip(), confidence
+    
+    def extract_text_with_confidence(self, image, languages=None):
+        """
+        Extract text from preprocessed image using OCR
+        A fast low-resolution pass is tried first; regions whose mean word
+        confidence falls below OCR_CONFIDENCE_THRESHOLD are re-OCR'd at a
+        higher resolution with extra denoising, keeping the better result.
+        Returns a tuple of (text, confidence)
+        """
+        custom_config = self.tesseract_config(languages)
+        
+        # Skip Tesseract if this exact region was already recognized
+        if self.cache is not None:
+            key = self.cache.make_key(
+                image,
+                f'{custom_config} fast={self.config.OCR_FAST_SCALE} '
+                f'high={self.config.OCR_HIGH_SCALE} min={self.config.OCR_CONFIDENCE_THRESHOLD}'
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Fast first pass
+        text, confidence = self._run_tesseract(image, self.config.OCR_FAST_SCALE, custom_config)
+        
+        # Retry uncertain regions at high resolution after removing speckle noise
+        if confidence < self.config.OCR_CONFIDENCE_THRESHOLD:
+            denoised = cv2.medianBlur(image, 3)
+            retry_text, retry_confidence = self._run_tesseract(denoised, self.config.OCR_HIGH_SCALE, custom_config)
+            
+            if retry_confidence > confidence:
+                text, confidence = retry_text, retry_confidence
+        
+        if self.cache is not None:
+            self.cache.put(key, text, confidence)
+        
+        return text, confidence
+    
+    def extract_text(self, image):
+        """Extract text from preprocessed image using OCR"""
+        text, _ = self.extract_text_with_confidence(image)
+        return text
+    
+    def process_answer_sheet(self, file, exam_template=None, progress_callback=None, script_key=None):
         """
         Process a complete answer sheet and extract text from all regions
-        Returns a dictionary mapping question IDs to extracted text
+        Returns a dictionary mapping question IDs to region results of the
+        form {'text': ..., 'blank': ..., 'confidence': ...}; blank regions
+        are not OCR'd
+        If progress_callback is given, it is called as
+        progress_callback(pages_done, total_pages) after each page
+        script_key, e.g. the student ID, caches the detected languages for
+        the student's other sheets; leave it None when the student is not known
+        Per-stage timings of the run are left in self.last_timings
         """
         # Save file if it's a FileStorage object
         if hasattr(file, 'save'):
@@ -104,30 +441,82 @@ class OCREngine:
         else:
             filepath = file
         
-        # Load images from file
-        images = self.load_file(filepath)
+        total_pages = self.count_pages(filepath)
+        max_pending = max(1, self.config.OCR_PAGE_WINDOW)
         
         results = {}
         
-        for page_num, image in enumerate(images):
-            # Preprocess the image
-            preprocessed = self.preprocess_image(image)
+        # Languages detected for this sheet, shared by all region threads
+        script = self._script_state(script_key)
+        
+        def collect(page_num, page_regions):
+            # Wait for a page's regions in question order so results are deterministic
+            for region_id, future in page_regions:
+                results[region_id] = future.result()
             
-            # Detect answer regions
-            regions = self.detect_answer_regions(preprocessed, exam_template)
+            if progress_callback is not None:
+                progress_callback(page_num + 1, total_pages)
+        
+        # Pooled page buffers are only safe for one sheet at a time
+        with self._pipeline_lock:
+            self.pipeline.reset_timings()
             
-            # Extract text from each region
-            for region in regions:
-                region_id = region['id']
-                region_image = region['image']
-                
-                # Further preprocess the region if needed
-                region_preprocessed = self.preprocess_image(region_image)
+            # Tesseract runs as a subprocess, so threads are enough to keep
+            # several regions (across pages) in flight at once
+            with ThreadPoolExecutor(max_workers=max(1, self.config.OCR_CONCURRENCY)) as executor:
+                pending = deque()
                 
-                # Extract text
-                text = self.extract_text(region_preprocessed)
+                # Pages are streamed from disk; at most OCR_PAGE_WINDOW pages are
+                # held in memory while their regions are being OCR'd
+                for page_num, image in enumerate(self.iter_pages(filepath)):
+                    # Preprocess the page once, into a reusable buffer
+                    preprocessed = self.pipeline.run(image, reuse_buffers=True)
+                    del image
+                    
+                    # Detect answer regions; these are views into the page
+                    with self.pipeline.timed('detect_regions'):
+                        regions = self.detect_answer_regions(preprocessed, exam_template, page_num)
+                    
+                    # Queue text extraction for each region
+                    pending.append((page_num, [
+                        (region['id'], executor.submit(self._extract_region_text, region['image'], script, script_key))
+                        for region in regions
+                    ]))
+                    del preprocessed, regions
+                    
+                    if len(pending) >= max_pending:
+                        collect(*pending.popleft())
                 
-                # Store result
-                results[region_id] = text
+                while pending:
+                    collect(*pending.popleft())
+            
+            self.last_timings = self.pipeline.timings()
+        
+        # Cache counters are written once per sheet rather than per region
+        if self.cache is not None:
+            self.cache.flush()
         
         return results
+    
+    def _extract_region_text(self, region_image, script, script_key=None):
+        """Extract the text of an already binarized region unless it is blank"""
+        with self.pipeline.timed('blank_check'):
+            blank = self.is_blank_region(region_image)
+        
+        if blank:
+            return {'text': '', 'blank': True, 'confidence': 1.0}
+        
+        with self.pipeline.timed('ocr'):
+            languages, detecting = self._sheet_languages(script)
+            if languages is not None:
+                text, confidence = self.extract_text_with_confidence(region_image, languages)
+            else:
+                # Until the script is known, a region is OCR'd with every
+                # language and its own text is used to detect it
+                text = None
+                try:
+                    text, confidence = self.extract_text_with_confidence(region_image)
+                finally:
+                    self._record_sheet_languages(script, script_key, text, detecting)
+        
+        return {'text': text, 'blank': False, 'confidence': confidence}
@@ -0,0 +1,127 @@
+# modules/preprocessing.py
+import time
+import threading
+from contextlib import contextmanager
+import cv2
+import numpy as np
+
+class PreprocessingPipeline:
+    """
+    Page preprocessing for OCR: grayscale -> optional deskew/denoise -> binarize.
+    Each page is processed exactly once. Stage outputs can be written into
+    preallocated buffers that are reused across pages; buffer_slots sets how
+    many pages may be alive at once (e.g. while their regions are OCR'd).
+    Time spent in every stage is accumulated for profiling.
+    """
+
+    def __init__(self, config, buffer_slots=1):
+        self.deskew = config.PREPROCESS_DESKEW
+        self.denoise = config.PREPROCESS_DENOISE
+        self.max_skew = config.PREPROCESS_MAX_SKEW
+        self.buffer_slots = max(1, buffer_slots)
+
+        self._buffers = {}  # (slot, stage) -> ndarray
+        self._next_slot = 0
+        self._times = {}  # stage -> [total seconds, calls]
+        self._times_lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, stage):
+        """Accumulate the time spent in a block under a stage name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._times_lock:
+                entry = self._times.setdefault(stage, [0.0, 0])
+                entry[0] += elapsed
+                entry[1] += 1
+
+    def timings(self):
+        """Return per-stage call counts and total/average milliseconds"""
+        with self._times_lock:
+            return {
+                stage: {
+                    'calls': calls,
+                    'total_ms': round(total * 1000, 2),
+                    'avg_ms': round(total * 1000 / calls, 2) if calls else 0
+                }
+                for stage, (total, calls) in self._times.items()
+            }
+
+    def reset_timings(self):
+        with self._times_lock:
+            self._times = {}
+
+    def _buffer(self, slot, stage, shape):
+        if slot is None:
+            return None
+
+        buffer = self._buffers.get((slot, stage))
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, np.uint8)
+            self._buffers[(slot, stage)] = buffer
+        return buffer
+
+    def _deskew(self, gray, dst):
+        """Rotate the page so its text lines are horizontal"""
+        # Estimate the skew on a downscaled copy; only the angle is needed
+        small = cv2.resize(gray, None, fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA)
+        _, ink = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        coords = cv2.findNonZero(ink)
+        if coords is None:
+            return gray
+
+        # minAreaRect's angle convention differs between OpenCV versions
+        angle = cv2.minAreaRect(coords)[-1]
+        if angle > 45:
+            angle -= 90
+        elif angle < -45:
+            angle += 90
+
+        if abs(angle) < 0.1 or abs(angle) > self.max_skew:
+            return gray
+
+        height, width = gray.shape
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        return cv2.warpAffine(
+            gray, matrix, (width, height), dst=dst,
+            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+        )
+
+    def run(self, image, reuse_buffers=False):
+        """
+        Preprocess a page and return the binarized image
+        With reuse_buffers, the result lives in a pooled buffer that is
+        overwritten buffer_slots pages later.
+        """
+        slot = None
+        if reuse_buffers:
+            slot = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self.buffer_slots
+
+        shape = image.shape[:2]
+
+        with self.timed('grayscale'):
+            if image.ndim == 3:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._buffer(slot, 'gray', shape))
+            else:
+                gray = image
+
+        if self.deskew:
+            with self.timed('deskew'):
+                gray = self._deskew(gray, self._buffer(slot, 'deskew', shape))
+
+        if self.denoise:
+            with self.timed('denoise'):
+                gray = cv2.medianBlur(gray, 3, dst=self._buffer(slot, 'denoise', shape))
+
+        with self.timed('binarize'):
+            binary = cv2.adaptiveThreshold(
+                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                cv2.THRESH_BINARY, 11, 2,
+                dst=self._buffer(slot, 'binary', shape)
+            )
+
+        return binary
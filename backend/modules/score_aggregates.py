@@ -0,0 +1,296 @@
+# modules/score_aggregates.py
+import math
+from datetime import datetime
+from sqlalchemy import event, inspect, select, update, insert, delete, func, case
+from sqlalchemy.orm import Session
+from models.base import db
+from models.exam import Exam
+from models.question import Question
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from models.score_aggregate import ExamScoreAggregate, QuestionScoreAggregate, SCORE_BAND_LABELS, score_band
+
+def _exam_maximum(connection, key):
+    return connection.execute(select(Exam.total_marks).where(Exam.id == key)).scalar()
+
+def _question_maximum(connection, key):
+    return connection.execute(select(Question.max_marks).where(Question.id == key)).scalar()
+
+def _question_extra(connection, key):
+    return {'exam_id': connection.execute(select(Question.exam_id).where(Question.id == key)).scalar()}
+
+def _no_extra(connection, key):
+    return {}
+
+class _Level:
+    """
+    How one aggregate table is derived from its source rows
+    maximum(connection, key) returns the marks scores are banded against;
+    extra(connection, key) returns any further columns of a new row
+    """
+
+    def __init__(self, model, key, source_key, score, maximum, processed=None, extra=_no_extra):
+        self.table = model.__table__
+        self.key = self.table.c[key]
+        self.key_name = key
+        self.source_key = source_key
+        self.score = score
+        self.maximum = maximum
+        self.processed = processed
+        self.extra = extra
+
+EXAM_LEVEL = _Level(
+    ExamScoreAggregate, 'exam_id', AnswerSheet.exam_id, AnswerSheet.total_score,
+    maximum=_exam_maximum, processed=AnswerSheet.processed
+)
+QUESTION_LEVEL = _Level(
+    QuestionScoreAggregate, 'question_id', Answer.question_id, Answer.score,
+    maximum=_question_maximum, extra=_question_extra
+)
+
+class _Delta:
+    """Changes to one aggregate row collected from a flush"""
+
+    def __init__(self):
+        self.rows = 0
+        self.processed = 0
+        self.added = []
+        self.removed = []
+
+    def change(self, old, new):
+        if old == new:
+            return
+        if old is not None:
+            self.removed.append(old)
+        if new is not None:
+            self.added.append(new)
+
+def compute_row(connection, level, key):
+    """Aggregate values for one exam or question, computed from scratch"""
+    columns = [level.score] + ([level.processed] if level.processed is not None else [])
+    rows = connection.execute(select(*columns).where(level.source_key == key)).all()
+
+    scores = [row[0] for row in rows if row[0] is not None]
+    maximum = level.maximum(connection, key)
+
+    bands = [0] * len(SCORE_BAND_LABELS)
+    for score in scores:
+        band = score_band(score, maximum)
+        if band is not None:
+            bands[band] += 1
+
+    values = {
+        level.key_name: key,
+        'row_count': len(rows),
+        'score_count': len(scores),
+        'score_sum': float(sum(scores)),
+        'score_sq_sum': float(sum(score * score for score in scores)),
+        'score_min': min(scores) if scores else None,
+        'score_max': max(scores) if scores else None,
+        'updated_at': datetime.utcnow()
+    }
+    if level.processed is not None:
+        values['processed_count'] = sum(1 for row in rows if row[1])
+    for i, count in enumerate(bands):
+        values[f'band_{i}'] = count
+    values.update(level.extra(connection, key))
+
+    return values
+
+def rebuild_row(connection, level, key):
+    """Replace the aggregate row of one exam or question; returns (old, new) values"""
+    old = connection.execute(select(level.table).where(level.key == key)).mappings().first()
+    new = compute_row(connection, level, key)
+
+    connection.execute(delete(level.table).where(level.key == key))
+    connection.execute(insert(level.table).values(**new))
+
+    return (dict(old) if old is not None else None), new
+
+def _apply_delta(connection, level, key, delta):
+    """Apply a flush's changes to one aggregate row as in-place increments"""
+    c = level.table.c
+    values = {}
+
+    if delta.rows:
+        values['row_count'] = c.row_count + delta.rows
+    if delta.processed:
+        values['processed_count'] = c.processed_count + delta.processed
+
+    if delta.added or delta.removed:
+        values['score_count'] = c.score_count + (len(delta.added) - len(delta.removed))
+        values['score_sum'] = c.score_sum + (sum(delta.added) - sum(delta.removed))
+        values['score_sq_sum'] = c.score_sq_sum + (
+            sum(v * v for v in delta.added) - sum(v * v for v in delta.removed)
+        )
+
+        maximum = level.maximum(connection, key)
+        band_deltas = [0] * len(SCORE_BAND_LABELS)
+        for score, step in [(v, 1) for v in delta.added] + [(v, -1) for v in delta.removed]:
+            band = score_band(score, maximum)
+            if band is not None:
+                band_deltas[band] += step
+        for i, step in enumerate(band_deltas):
+            if step:
+                values[f'band_{i}'] = c[f'band_{i}'] + step
+
+        if delta.removed:
+            # A removed score may have been the minimum or maximum, so both
+            # are re-read from the (already flushed) source rows
+            values['score_min'] = select(func.min(level.score)).where(level.source_key == key).scalar_subquery()
+            values['score_max'] = select(func.max(level.score)).where(level.source_key == key).scalar_subquery()
+        else:
+            low, high = min(delta.added), max(delta.added)
+            values['score_min'] = case((c.score_min.is_(None), low), (c.score_min > low, low), else_=c.score_min)
+            values['score_max'] = case((c.score_max.is_(None), high), (c.score_max < high, high), else_=c.score_max)
+
+    if not values:
+        return
+
+    values['updated_at'] = datetime.utcnow()
+    result = connection.execute(update(level.table).where(level.key == key).values(**values))
+
+    # No row yet (e.g. data from before aggregates existed); the flushed
+    # source rows already include this change, so build it from scratch
+    if result.rowcount == 0:
+        rebuild_row(connection, level, key)
+
+def _history(obj, name):
+    """(old, new) values of an attribute in the current flush"""
+    history = inspect(obj).attrs[name].history
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else getattr(obj, name)
+    return old, new, history.has_changes()
+
+def _after_flush(session, flush_context):
+    exam_deltas = {}
+    question_deltas = {}
+    rebuild = {EXAM_LEVEL: set(), QUESTION_LEVEL: set()}
+
+    for obj in session.new:
+        if isinstance(obj, AnswerSheet):
+            delta = exam_deltas.setdefault(obj.exam_id, _Delta())
+            delta.rows += 1
+            delta.processed += 1 if obj.processed else 0
+            delta.change(None, obj.total_score)
+        elif isinstance(obj, Answer):
+            delta = question_deltas.setdefault(obj.question_id, _Delta())
+            delta.rows += 1
+            delta.change(None, obj.score)
+        elif isinstance(obj, Exam):
+            rebuild[EXAM_LEVEL].add(obj.id)
+        elif isinstance(obj, Question):
+            rebuild[QUESTION_LEVEL].add(obj.id)
+
+    for obj in session.dirty:
+        if isinstance(obj, AnswerSheet):
+            old_score, new_score, score_changed = _history(obj, 'total_score')
+            old_processed, new_processed, processed_changed = _history(obj, 'processed')
+            if score_changed or processed_changed:
+                delta = exam_deltas.setdefault(obj.exam_id, _Delta())
+                if score_changed:
+                    delta.change(old_score, new_score)
+                if processed_changed:
+                    delta.processed += bool(new_processed) - bool(old_processed)
+        elif isinstance(obj, Answer):
+            old_score, new_score, score_changed = _history(obj, 'score')
+            if score_changed:
+                question_deltas.setdefault(obj.question_id, _Delta()).change(old_score, new_score)
+        elif isinstance(obj, Exam):
+            # Bands are relative to the maximum, so a new maximum re-bands everything
+            if _history(obj, 'total_marks')[2]:
+                rebuild[EXAM_LEVEL].add(obj.id)
+        elif isinstance(obj, Question):
+            if _history(obj, 'max_marks')[2]:
+                rebuild[QUESTION_LEVEL].add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, AnswerSheet):
+            delta = exam_deltas.setdefault(obj.exam_id, _Delta())
+            delta.rows -= 1
+            delta.processed -= 1 if obj.processed else 0
+            delta.change(obj.total_score, None)
+        elif isinstance(obj, Answer):
+            delta = question_deltas.setdefault(obj.question_id, _Delta())
+            delta.rows -= 1
+            delta.change(obj.score, None)
+
+    if not (exam_deltas or question_deltas or rebuild[EXAM_LEVEL] or rebuild[QUESTION_LEVEL]):
+        return
+
+    # Same connection and transaction as the flush, so aggregates commit
+    # or roll back together with the scores they summarize
+    connection = session.connection()
+
+    for level, deltas in ((EXAM_LEVEL, exam_deltas), (QUESTION_LEVEL, question_deltas)):
+        for key in rebuild[level]:
+            rebuild_row(connection, level, key)
+        for key, delta in deltas.items():
+            if key not in rebuild[level]:
+                _apply_delta(connection, level, key, delta)
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+def register_listeners():
+    """Keep the aggregate tables current on every flush that writes scores"""
+    # Load the previous value on assignment so deltas know what to subtract
+    for attribute in (AnswerSheet.total_score, AnswerSheet.processed, Answer.score, Exam.total_marks, Question.max_marks):
+        if not event.contains(attribute, 'set', _load_previous_value):
+            event.listen(attribute, 'set', _load_previous_value, active_history=True)
+
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+
+def _rows_match(old, new):
+    if old is None:
+        return False
+
+    for name, value in new.items():
+        if name == 'updated_at':
+            continue
+        if isinstance(value, float) and old[name] is not None:
+            if not math.isclose(old[name], value, rel_tol=1e-9, abs_tol=1e-6):
+                return False
+        elif old[name] != value:
+            return False
+    return True
+
+def rebuild_aggregates(exam_id=None):
+    """
+    Recompute the aggregate tables from scratch, for one exam or all of them
+    Returns how many rows were rebuilt and which ones had drifted from the
+    recomputed values (or were missing)
+    """
+    connection = db.session.connection()
+
+    exam_query = select(Exam.id)
+    question_query = select(Question.id, Question.exam_id)
+    if exam_id is not None:
+        exam_query = exam_query.where(Exam.id == exam_id)
+        question_query = question_query.where(Question.exam_id == exam_id)
+
+    report = {'exams': 0, 'questions': 0, 'mismatched_exams': [], 'mismatched_questions': []}
+
+    rebuilt_exams = set()
+    for key in connection.execute(exam_query).scalars().all():
+        old, new = rebuild_row(connection, EXAM_LEVEL, key)
+        report['exams'] += 1
+        rebuilt_exams.add(key)
+        if not _rows_match(old, new):
+            report['mismatched_exams'].append(key)
+
+    for key, question_exam_id in connection.execute(question_query).all():
+        old, new = rebuild_row(connection, QUESTION_LEVEL, key)
+        report['questions'] += 1
+        rebuilt_exams.add(question_exam_id)
+        if not _rows_match(old, new):
+            report['mismatched_questions'].append(key)
+
+    # The rows are written with Core statements the ORM flush never sees, so
+    # hand the rebuilt exams to the analytics cache invalidation directly
+    scopes = db.session.info.setdefault('analytics_scopes', set())
+    scopes.update(('exam', key) for key in rebuilt_exams)
+
+    db.session.commit()
+    return report
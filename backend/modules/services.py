@@ -0,0 +1,67 @@
+# modules/services.py
+import time
+import threading
+
+class LazyService:
+    """
+    Builds a subsystem the first time it is used.
+    Attribute access is forwarded to the built instance, so a LazyService
+    can stand in wherever the instance itself was used. Heavy imports
+    (cv2, nltk, sklearn, pandas, matplotlib) belong inside the factory so
+    they are only paid for by the processes that need them.
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def instance(self):
+        """
+        Return the instance, building it on first call
+        Not named get() so it cannot hide a get() method of the service
+        """
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined on LazyService itself
+        return getattr(self.instance(), name)
+
+class ServiceRegistry:
+    """Named lazy services with an explicit warmup step"""
+
+    def __init__(self):
+        self._services = {}
+
+    def register(self, name, factory):
+        service = LazyService(name, factory)
+        self._services[name] = service
+        return service
+
+    def warmup(self, names=None):
+        """
+        Build the named services (all by default) and run their warmup()
+        hooks, if they have one
+        Returns the seconds spent per service
+        """
+        timings = {}
+        for name in names or list(self._services):
+            start = time.perf_counter()
+            instance = self._services[name].instance()
+            if hasattr(instance, 'warmup'):
+                instance.warmup()
+            timings[name] = round(time.perf_counter() - start, 3)
+
+        return timings
+
+    def status(self):
+        return {name: service.loaded for name, service in self._services.items()}
@@ -0,0 +1,190 @@
+# modules/similarity.py
+import re
+import math
+import threading
+from collections import Counter, OrderedDict
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+# Same tokenization TfidfVectorizer uses by default
+TFIDF_TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+def term_counts(text):
+    """Term counts of a text as TfidfVectorizer tokenizes it"""
+    return Counter(TFIDF_TOKEN_PATTERN.findall(text))
+
+def pairwise_tfidf_similarity(model_counts, answer_text):
+    """
+    Cosine similarity of a TF-IDF vectorizer fitted on just the model
+    answer and one student answer, computed from term counts.
+    With two documents and smooth IDF, a term in both documents has
+    idf = 1 and a term in only one has idf = ln(3/2) + 1.
+    """
+    answer_counts = term_counts(answer_text)
+    if not answer_counts or not model_counts:
+        return 0
+
+    single_idf = math.log(1.5) + 1
+
+    dot = 0.0
+    model_norm = 0.0
+    for term, count in model_counts.items():
+        if term in answer_counts:
+            dot += count * answer_counts[term]
+            model_norm += count * count
+        else:
+            model_norm += (count * single_idf) ** 2
+
+    answer_norm = 0.0
+    for term, count in answer_counts.items():
+        weight = count if term in model_counts else count * single_idf
+        answer_norm += weight * weight
+
+    return dot / math.sqrt(model_norm * answer_norm)
+
+class TfidfSimilarity:
+    """
+    TF-IDF cosine similarity of each answer against the model answer alone
+    Every answer gets the score of its own two-document fit, the same one
+    evaluate_answer uses, so a score never depends on which other answers
+    are scored with it.
+    """
+    name = 'tfidf'
+    normalized_input = True  # works on preprocessed (lemmatized) text
+
+    def similarities(self, model_text, answer_texts):
+        """Return the similarity of every answer text to the model text"""
+        model_counts = term_counts(model_text)
+        return np.array([pairwise_tfidf_similarity(model_counts, text) for text in answer_texts], dtype=float)
+
+class HashingSimilarity:
+    """
+    Cosine similarity of hashed term-frequency vectors
+    Nothing is fitted, so every answer is scored independently of its
+    cohort and memory stays constant regardless of vocabulary size.
+    """
+    name = 'hashing'
+    normalized_input = True
+
+    def __init__(self, n_features=2 ** 18):
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm='l2')
+
+    def similarities(self, model_text, answer_texts):
+        if not answer_texts:
+            return np.zeros(0)
+
+        matrix = self.vectorizer.transform([model_text] + list(answer_texts))
+        return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+class EmbeddingSimilarity:
+    """
+    Cosine similarity of sentence embeddings from a locally stored
+    transformers model, run on CPU in batches
+    The model is loaded on first use and model-answer embeddings are kept
+    in a bounded LRU, so each model answer is encoded once.
+    """
+    name = 'embedding'
+    normalized_input = False  # the model sees the answer as written
+
+    def __init__(self, model_path, batch_size=32, max_length=256, cache_size=256):
+        if not model_path:
+            raise ValueError('EMBEDDING_MODEL_PATH must point to a local model to use the embedding backend')
+
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache_size = cache_size
+
+        self._tokenizer = None
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._model_embeddings = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _load(self):
+        with self._load_lock:
+            if self._model is None:
+                import torch
+                from transformers import AutoTokenizer, AutoModel
+
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_path, local_files_only=True)
+                model = AutoModel.from_pretrained(self.model_path, local_files_only=True)
+                model.to(torch.device('cpu'))
+                model.eval()
+                self._model = model
+
+    def encode(self, texts):
+        """Return L2-normalized, mean-pooled embeddings for a list of texts"""
+        import torch
+
+        if self._model is None:
+            self._load()
+
+        embeddings = []
+        with torch.no_grad():
+            for start in range(0, len(texts), self.batch_size):
+                batch = self._tokenizer(
+                    list(texts[start:start + self.batch_size]),
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors='pt'
+                )
+                output = self._model(**batch).last_hidden_state
+
+                # Mean of the token embeddings, ignoring padding
+                mask = batch['attention_mask'].unsqueeze(-1).to(output.dtype)
+                pooled = (output * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+                embeddings.append(pooled.numpy())
+
+        return np.vstack(embeddings) if embeddings else np.zeros((0, 0))
+
+    def _model_embedding(self, model_text):
+        with self._cache_lock:
+            embedding = self._model_embeddings.get(model_text)
+            if embedding is not None:
+                self._model_embeddings.move_to_end(model_text)
+                return embedding
+
+        embedding = self.encode([model_text])[0]
+
+        with self._cache_lock:
+            self._model_embeddings[model_text] = embedding
+            while len(self._model_embeddings) > self.cache_size:
+                self._model_embeddings.popitem(last=False)
+
+        return embedding
+
+    def similarities(self, model_text, answer_texts):
+        if not answer_texts:
+            return np.zeros(0)
+
+        model_embedding = self._model_embedding(model_text)
+        answer_embeddings = self.encode(answer_texts)
+
+        # Scores expect a similarity between 0 and 1
+        return np.clip(answer_embeddings @ model_embedding, 0, 1)
+
+SIMILARITY_BACKENDS = ('tfidf', 'hashing', 'embedding')
+
+def create_similarity_backend(name, config=None):
+    """Build the similarity backend with the given name from config settings"""
+    if name == 'tfidf':
+        return TfidfSimilarity()
+
+    if name == 'hashing':
+        n_features = config.HASHING_FEATURES if config is not None else 2 ** 18
+        return HashingSimilarity(n_features)
+
+    if name == 'embedding':
+        if config is None:
+            raise ValueError('The embedding backend needs EMBEDDING_MODEL_PATH from the config')
+        return EmbeddingSimilarity(
+            config.EMBEDDING_MODEL_PATH,
+            batch_size=config.EMBEDDING_BATCH_SIZE,
+            max_length=config.EMBEDDING_MAX_LENGTH,
+            cache_size=config.EMBEDDING_CACHE_SIZE
+        )
+
+    raise ValueError(f'Unknown similarity backend: {name}')
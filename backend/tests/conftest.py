@@ -0,0 +1,89 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Point every file the app writes at a scratch directory before config.py is imported
+_scratch = tempfile.mkdtemp(prefix='digital-marking-tests-')
+os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(_scratch, 'test.db')
+os.environ['UPLOAD_FOLDER'] = os.path.join(_scratch, 'uploads')
+os.environ['OCR_CACHE_PATH'] = os.path.join(_scratch, 'ocr_cache.sqlite3')
+os.environ['ANALYTICS_CACHE_PATH'] = os.path.join(_scratch, 'analytics_cache.sqlite3')
+os.environ['TEMPLATE_CACHE_FOLDER'] = os.path.join(_scratch, 'templates')
+
+def nltk_corpora_available():
+    """The evaluation engine needs the NLTK stopwords and WordNet corpora"""
+    try:
+        from nltk.corpus import stopwords, wordnet
+        stopwords.words('english')
+        wordnet.ensure_loaded()
+        return True
+    except LookupError:
+        return False
+
+requires_nltk_corpora = pytest.mark.skipif(
+    not nltk_corpora_available(),
+    reason='NLTK stopwords/wordnet corpora are not installed'
+)
+
+@pytest.fixture
+def app():
+    from app import app as flask_app
+    from models.base import db
+    
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_headers(app):
+    from flask_jwt_extended import create_access_token
+    from models.base import db
+    from models.user import User
+    
+    user = User(username='teacher', email='teacher@example.com', password='x', role='teacher')
+    db.session.add(user)
+    db.session.commit()
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+@pytest.fixture
+def seeded(app):
+    """Two exams with three questions each, six students, scored answers"""
+    from tests.seed import seed_exams
+    return seed_exams()
+
+@pytest.fixture
+def count_queries(app):
+    """
+    Context manager that records every SQL statement sent to the database
+    Usage: with count_queries() as statements: ...
+    """
+    from sqlalchemy import event
+    from models.base import db
+    
+    @contextmanager
+    def counter():
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    
+    return counter
@@ -0,0 +1,62 @@
+# tests/seed.py
+import json
+import random
+from models.base import db
+from models.user import User
+from models.exam import Exam
+from models.question import Question
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+
+def seed_exams(num_exams=2, num_questions=3, num_students=6, seed=7):
+    """
+    Create exams with questions, answer sheets and scored answers
+    Scores cover every band, unscored sheets and unscored answers.
+    """
+    rng = random.Random(seed)
+    
+    user = User.query.filter_by(username='seed').first()
+    if user is None:
+        user = User(username='seed', email='seed@example.com', password='x', role='teacher')
+        db.session.add(user)
+        db.session.flush()
+    
+    exams = []
+    for e in range(num_exams):
+        exam = Exam(title=f'Exam {e}', subject='Science', class_name='8A',
+                    total_marks=num_questions * 10, created_by=user.id)
+        db.session.add(exam)
+        db.session.flush()
+        
+        questions = []
+        for q in range(num_questions):
+            question = Question(exam_id=exam.id, question_number=q + 1, question_text=f'Q{q + 1}',
+                                model_answer='Water evaporates and condenses into clouds',
+                                keywords=json.dumps(['water', 'clouds']), max_marks=10)
+            db.session.add(question)
+            questions.append(question)
+        db.session.flush()
+        
+        for s in range(num_students):
+            sheet = AnswerSheet(exam_id=exam.id, student_id=f'S{s:03d}', student_name=f'Student {s}',
+                                file_path=f'/tmp/{e}_{s}.pdf')
+            db.session.add(sheet)
+            db.session.flush()
+            
+            total = 0
+            for question in questions:
+                # Leave one answer of the last student unscored
+                score = None if (s == num_students - 1 and question is questions[0]) else round(rng.uniform(0, 10), 1)
+                db.session.add(Answer(answer_sheet_id=sheet.id, question_id=question.id,
+                                      extracted_text='water cycle', score=score))
+                total += score or 0
+            
+            # The first student's sheet is not evaluated yet
+            if s > 0:
+                sheet.total_score = total
+                sheet.processed = True
+        
+        exams.append(exam)
+    
+    db.session.commit()
+    return exams
@@ -0,0 +1,143 @@
+# tests/test_analytics.py
+import numpy as np
+import pytest
+from models.exam import Exam
+from models.question import Question
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from modules.analytics import AnalyticsEngine
+
+# The original Python implementations, kept as the reference the SQL and
+# aggregate versions must match
+
+def reference_exam_statistics(exam_id):
+    exam = Exam.query.get(exam_id)
+    answer_sheets = AnswerSheet.query.filter_by(exam_id=exam_id).all()
+    
+    total_students = len(answer_sheets)
+    completed_evaluations = sum(1 for sheet in answer_sheets if sheet.processed)
+    scores = [sheet.total_score for sheet in answer_sheets if sheet.total_score is not None]
+    
+    ranges = ['0-35%', '35-50%', '50-60%', '60-75%', '75-90%', '90-100%']
+    if scores:
+        avg_score = sum(scores) / len(scores)
+        max_score = max(scores)
+        min_score = min(scores)
+        hist, _ = np.histogram([s * 100 / exam.total_marks for s in scores], bins=[0, 35, 50, 60, 75, 90, 100])
+        score_distribution = {'ranges': ranges, 'counts': hist.tolist()}
+    else:
+        avg_score = max_score = min_score = 0
+        score_distribution = {'ranges': ranges, 'counts': [0] * 6}
+    
+    question_stats = []
+    for question in Question.query.filter_by(exam_id=exam_id).all():
+        answers = Answer.query.join(AnswerSheet).filter(
+            AnswerSheet.exam_id == exam_id,
+            Answer.question_id == question.id
+        ).all()
+        
+        q_scores = [a.score for a in answers if a.score is not None]
+        avg_q_score = sum(q_scores) / len(q_scores) if q_scores else 0
+        avg_percentage = (avg_q_score / question.max_marks) * 100 if question.max_marks > 0 else 0
+        
+        question_stats.append({
+            'question_number': question.question_number,
+            'max_marks': question.max_marks,
+            'avg_score': round(avg_q_score, 2),
+            'max_score': max(q_scores) if q_scores else 0,
+            'min_score': min(q_scores) if q_scores else 0,
+            'avg_percentage': round(avg_percentage, 2)
+        })
+    
+    return {
+        'exam_id': exam_id,
+        'exam_title': exam.title,
+        'subject': exam.subject,
+        'class_name': exam.class_name,
+        'total_marks': exam.total_marks,
+        'total_students': total_students,
+        'completed_evaluations': completed_evaluations,
+        'avg_score': round(avg_score, 2),
+        'max_score': max_score,
+        'min_score': min_score,
+        'score_distribution': score_distribution,
+        'question_stats': question_stats
+    }
+
+def reference_student_performance(student_id):
+    answer_sheets = AnswerSheet.query.filter_by(student_id=student_id).all()
+    if not answer_sheets:
+        return None
+    
+    exam_results = []
+    for sheet in answer_sheets:
+        exam = Exam.query.get(sheet.exam_id)
+        
+        if sheet.processed and sheet.total_score is not None:
+            percentage = (sheet.total_score / exam.total_marks) * 100
+        else:
+            percentage = 0
+        
+        question_results = []
+        for answer in Answer.query.filter_by(answer_sheet_id=sheet.id).all():
+            question = Question.query.get(answer.question_id)
+            
+            if answer.score is not None:
+                q_percentage = (answer.score / question.max_marks) * 100 if question.max_marks > 0 else 0
+            else:
+                q_percentage = 0
+            
+            question_results.append({
+                'question_number': question.question_number,
+                'max_marks': question.max_marks,
+                'score': answer.score,
+                'percentage': round(q_percentage, 2),
+                'feedback': answer.feedback
+            })
+        
+        exam_results.append({
+            'exam_id': exam.id,
+            'exam_title': exam.title,
+            'subject': exam.subject,
+            'date': sheet.created_at.strftime('%Y-%m-%d'),
+            'total_marks': exam.total_marks,
+            'score': sheet.total_score,
+            'percentage': round(percentage, 2),
+            'processed': sheet.processed,
+            'question_results': question_results
+        })
+    
+    return {
+        'student_id': student_id,
+        'student_name': answer_sheets[0].student_name,
+        'exam_count': len(exam_results),
+        'exam_results': exam_results
+    }
+
+@pytest.fixture
+def engine(seeded):
+    return AnalyticsEngine()
+
+def test_exam_statistics_match_reference(engine):
+    for exam in Exam.query.all():
+        expected = reference_exam_statistics(exam.id)
+        
+        # From the incrementally maintained aggregates
+        assert engine.get_exam_statistics(exam.id) == expected
+        # From SQL aggregates over the answer sheets
+        assert engine._compute_exam_statistics(exam) == expected
+
+def test_exam_statistics_without_scores_match_reference(engine):
+    exam = Exam.query.first()
+    for sheet in AnswerSheet.query.filter_by(exam_id=exam.id).all():
+        sheet.total_score = None
+    for answer in Answer.query.join(AnswerSheet).filter(AnswerSheet.exam_id == exam.id).all():
+        answer.score = None
+    
+    assert engine._compute_exam_statistics(exam) == reference_exam_statistics(exam.id)
+
+def test_student_performance_matches_reference(engine):
+    student_ids = [student_id for (student_id,) in AnswerSheet.query.with_entities(AnswerSheet.student_id).distinct()]
+    
+    for student_id in student_ids + ['missing']:
+        assert engine.get_student_performance(student_id) == reference_student_performance(student_id)
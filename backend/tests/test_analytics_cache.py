@@ -0,0 +1,46 @@
+# tests/test_analytics_cache.py
+from sqlalchemy import update
+from models.base import db
+from models.exam import Exam
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from models.score_aggregate import ExamScoreAggregate
+from modules.score_aggregates import rebuild_aggregates
+
+def test_exam_analytics_are_cached_by_data_version(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    url = f'/api/analytics/exam/{exam.id}'
+    
+    first = client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    
+    unchanged = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    
+    # A new score changes the exam's data version
+    answer = Answer.query.join(AnswerSheet).filter(AnswerSheet.exam_id == exam.id, Answer.score.isnot(None)).first()
+    answer.score = 0
+    db.session.commit()
+    
+    changed = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+def test_rebuilt_aggregates_change_the_data_version(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    url = f'/api/analytics/exam/{exam.id}'
+    
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+    
+    # Drift the stored aggregate behind the ORM's back, then repair it
+    db.session.execute(
+        update(ExamScoreAggregate).where(ExamScoreAggregate.exam_id == exam.id).values(score_sum=0)
+    )
+    db.session.commit()
+    report = rebuild_aggregates(exam.id)
+    assert report['mismatched_exams'] == [exam.id]
+    
+    changed = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
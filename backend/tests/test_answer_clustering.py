@@ -0,0 +1,33 @@
+# tests/test_answer_clustering.py
+from modules.answer_clustering import AnswerClusterer
+from tests.conftest import requires_nltk_corpora
+
+MODEL_ANSWER = 'Water evaporates from the sea, condenses into clouds and falls as rain.'
+
+def test_identical_texts_share_a_representative():
+    texts = ['water evaporate cloud', 'plant sunlight', 'water evaporate cloud']
+    assert AnswerClusterer().cluster(texts) == [0, 1, 0]
+
+def test_empty_texts_are_never_grouped():
+    # A blank answer and a stopword-only answer both normalize to ''
+    texts = ['', 'water evaporate cloud', '', 'water evaporate cloud', '']
+    assert AnswerClusterer().cluster(texts) == [0, 1, 2, 1, 4]
+
+@requires_nltk_corpora
+def test_cluster_members_get_feedback_for_their_own_text():
+    from modules.evaluation import EvaluationEngine
+    
+    engine = EvaluationEngine()
+    answers = [
+        'Water evaporates and forms clouds.',
+        'Water evaporates and forms clouds. ' * 20,
+        '',
+        'It is the.'
+    ]
+    results = engine.evaluate_batch(answers, MODEL_ANSWER, ['water', 'clouds'], 10, representatives=[0, 0, 2, 3])
+    
+    assert results[0][0] == results[1][0]
+    assert 'too brief' not in results[1][1]
+    assert 'unnecessarily long' in results[1][1]
+    assert results[2] == (0, "No answer provided.")
+    assert results[3][1] != "No answer provided."
@@ -0,0 +1,119 @@
+# tests/test_bulk_upload.py
+import io
+import random
+import zipfile
+from config import Config
+from models.exam import Exam
+from models.answer_sheet import AnswerSheet
+
+def roster(*rows):
+    lines = ['filename,student_id,student_name'] + [','.join(row) for row in rows]
+    return (io.BytesIO('\n'.join(lines).encode('utf-8')), 'roster.csv')
+
+def archive(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for filename, data in entries:
+            zf.writestr(filename, data)
+    buffer.seek(0)
+    return (buffer, 'sheets.zip')
+
+def upload_archive(client, auth_headers, exam, entries):
+    return client.post('/api/upload-answer-sheets/bulk', headers=auth_headers, data={
+        'exam_id': str(exam.id),
+        'archive': archive(entries)
+    }, content_type='multipart/form-data')
+
+def test_non_ascii_filename_keeps_its_extension(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    
+    response = client.post('/api/upload-answer-sheets/bulk', headers=auth_headers, data={
+        'exam_id': str(exam.id),
+        'roster': roster(('रमेश.pdf', 'S100', 'Ramesh')),
+        'files': [(io.BytesIO(b'%PDF-1.4'), 'रमेश.pdf')]
+    }, content_type='multipart/form-data')
+    
+    assert response.status_code == 202
+    entry = response.get_json()['files'][0]
+    assert entry['status'] == 'queued'
+    assert AnswerSheet.query.get(entry['answer_sheet_id']).file_path.endswith('.pdf')
+
+def test_bulk_route_has_its_own_size_limit(app, client, auth_headers, seeded):
+    exam = Exam.query.first()
+    sheet = b'%PDF-1.4' + b'0' * (app.config['MAX_CONTENT_LENGTH'] + 1)
+    
+    single = client.post('/api/upload-answer-sheet', headers=auth_headers, data={
+        'exam_id': str(exam.id),
+        'student_id': 'S100',
+        'file': (io.BytesIO(sheet), 'sheet.pdf')
+    }, content_type='multipart/form-data')
+    assert single.status_code == 413
+    
+    bulk = client.post('/api/upload-answer-sheets/bulk', headers=auth_headers, data={
+        'exam_id': str(exam.id),
+        'roster': roster(('sheet.pdf', 'S100', '')),
+        'files': [(io.BytesIO(sheet), 'sheet.pdf')]
+    }, content_type='multipart/form-data')
+    assert bulk.status_code == 202
+
+def test_oversized_and_highly_compressed_entries_are_skipped(client, auth_headers, seeded, monkeypatch):
+    monkeypatch.setattr(Config, 'BULK_MAX_ENTRY_SIZE', 4096)
+    monkeypatch.setattr(Config, 'BULK_MAX_COMPRESSION_RATIO', 20)
+    exam = Exam.query.first()
+    count = AnswerSheet.query.count()
+    
+    response = upload_archive(client, auth_headers, exam, [
+        ('bomb.pdf', b'%PDF-1.4' + b'\0' * 4000),
+        ('large.pdf', b'%PDF-1.4' + random.Random(1).randbytes(8192)),
+        ('sheet.pdf', b'%PDF-1.4' + bytes(range(256)))
+    ])
+    
+    assert response.status_code == 202
+    report = {entry['filename']: entry for entry in response.get_json()['files']}
+    assert report['bomb.pdf']['status'] == 'skipped'
+    assert 'compressed' in report['bomb.pdf']['message']
+    assert report['large.pdf']['status'] == 'skipped'
+    assert 'too large' in report['large.pdf']['message']
+    assert report['sheet.pdf']['status'] == 'queued'
+    assert AnswerSheet.query.count() == count + 1
+
+def test_archives_over_the_total_limits_are_rejected(client, auth_headers, seeded, monkeypatch):
+    exam = Exam.query.first()
+    count = AnswerSheet.query.count()
+    sheets = [(f'{i}.pdf', b'%PDF-1.4' + bytes(range(256))) for i in range(3)]
+    
+    monkeypatch.setattr(Config, 'BULK_MAX_ENTRIES', 2)
+    too_many = upload_archive(client, auth_headers, exam, sheets)
+    assert too_many.status_code == 400
+    assert 'more than 2 files' in too_many.get_json()['message']
+    
+    monkeypatch.setattr(Config, 'BULK_MAX_ENTRIES', 10)
+    monkeypatch.setattr(Config, 'BULK_MAX_EXTRACTED_SIZE', 600)
+    too_large = upload_archive(client, auth_headers, exam, sheets)
+    assert too_large.status_code == 400
+    
+    # Nothing is queued from a rejected archive
+    assert AnswerSheet.query.count() == count
+
+def test_single_upload_keeps_the_extension_of_a_non_ascii_filename(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    
+    response = client.post('/api/upload-answer-sheet', headers=auth_headers, data={
+        'exam_id': str(exam.id),
+        'student_id': 'S100',
+        'file': (io.BytesIO(b'%PDF-1.4'), 'रमेश.pdf')
+    }, content_type='multipart/form-data')
+    
+    assert response.status_code == 202
+    assert AnswerSheet.query.get(response.get_json()['answer_sheet_id']).file_path.endswith('.pdf')
+
+def test_single_upload_rejects_unsupported_formats(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    
+    response = client.post('/api/upload-answer-sheet', headers=auth_headers, data={
+        'exam_id': str(exam.id),
+        'student_id': 'S100',
+        'file': (io.BytesIO(b'hello'), 'notes.txt')
+    }, content_type='multipart/form-data')
+    
+    assert response.status_code == 400
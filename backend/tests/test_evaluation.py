@@ -0,0 +1,67 @@
+# tests/test_evaluation.py
+from types import SimpleNamespace
+import pytest
+from tests.conftest import requires_nltk_corpora
+
+MODEL_ANSWER = 'Water evaporates from the sea, condenses into clouds and falls as rain.'
+KEYWORDS = ['evaporation', 'clouds', 'rain']
+
+ANSWERS = [
+    'Water evaporates from the sea and forms clouds, then falls as rain.',
+    'The sun heats the sea.',
+    'Plants need sunlight.'
+]
+
+@pytest.fixture
+def engine():
+    from modules.evaluation import EvaluationEngine
+    return EvaluationEngine()
+
+@requires_nltk_corpora
+@pytest.mark.parametrize('answer', ANSWERS)
+def test_hashing_evaluate_answer_matches_the_batch(engine, answer):
+    single = engine.evaluate_answer(answer, MODEL_ANSWER, KEYWORDS, 10, backend='hashing')
+    batch = engine.evaluate_batch([answer] + ANSWERS, MODEL_ANSWER, KEYWORDS, 10, backend='hashing')
+    
+    assert single == batch[0]
+    assert 0 <= single[0] <= 10
+
+@requires_nltk_corpora
+def test_hashing_evaluate_answer_with_a_compiled_question(engine):
+    compiled = engine.compile_question(MODEL_ANSWER, KEYWORDS)
+    
+    for answer in ANSWERS:
+        assert (engine.evaluate_answer(answer, MODEL_ANSWER, KEYWORDS, 10, compiled=compiled, backend='hashing')
+                == engine.evaluate_answer(answer, MODEL_ANSWER, KEYWORDS, 10, backend='hashing'))
+
+@requires_nltk_corpora
+def test_hashing_evaluate_answer_ranks_answers_like_tfidf(engine):
+    hashing = [engine.evaluate_answer(answer, MODEL_ANSWER, KEYWORDS, 10, backend='hashing')[0] for answer in ANSWERS]
+    tfidf = [engine.evaluate_answer(answer, MODEL_ANSWER, KEYWORDS, 10)[0] for answer in ANSWERS]
+    
+    assert hashing == sorted(hashing, reverse=True)
+    assert tfidf == sorted(tfidf, reverse=True)
+
+@requires_nltk_corpora
+def test_hashing_evaluate_answer_with_no_answer(engine):
+    assert engine.evaluate_answer('   ', MODEL_ANSWER, KEYWORDS, 10, backend='hashing') == (0, "No answer provided.")
+
+@requires_nltk_corpora
+def test_rescore_skips_reviewed_and_unchanged_answers(engine):
+    question = SimpleNamespace(id=1, version=1, max_marks=10)
+    answer = SimpleNamespace(extracted_text=ANSWERS[0], blank=False, teacher_reviewed=False,
+                             fingerprint=None, score=None, ocr_confidence=None)
+    
+    fingerprint = engine.rescore_fingerprint(answer, question)
+    assert fingerprint is not None
+    
+    engine.record_result(answer, 7.5, 'Good', fingerprint)
+    assert (answer.score, answer.fingerprint, answer.cluster_id, answer.ai_confidence) == (7.5, fingerprint, None, 0.8)
+    assert engine.rescore_fingerprint(answer, question) is None
+    
+    # A new question version or backend needs a new score, unless a teacher reviewed it
+    question.version = 2
+    assert engine.rescore_fingerprint(answer, question) not in (None, fingerprint)
+    assert engine.rescore_fingerprint(answer, SimpleNamespace(id=1, version=1, max_marks=10), 'hashing') is not None
+    answer.teacher_reviewed = True
+    assert engine.rescore_fingerprint(answer, question) is None
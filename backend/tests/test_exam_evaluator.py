@@ -0,0 +1,60 @@
+# tests/test_exam_evaluator.py
+import subprocess
+import sys
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from models.base import db
+from models.exam import Exam
+from models.evaluation_run import EvaluationRun
+from modules.exam_evaluator import ExamEvaluator, _owner
+
+@pytest.fixture
+def evaluator(seeded):
+    return ExamEvaluator(Config, evaluation_engine=None)
+
+@pytest.fixture
+def exam_id(seeded):
+    return Exam.query.first().id
+
+def active_run(exam_id, owner=None, heartbeat_at=None):
+    run = EvaluationRun(exam_id=exam_id, status='running', owner=owner or _owner(),
+                        heartbeat_at=heartbeat_at or datetime.utcnow())
+    db.session.add(run)
+    db.session.commit()
+    return run.id
+
+def test_one_active_run_per_exam(exam_id):
+    active_run(exam_id)
+    
+    db.session.add(EvaluationRun(exam_id=exam_id, status='queued'))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+    
+    db.session.add(EvaluationRun(exam_id=exam_id, status='done'))
+    db.session.commit()
+
+def test_start_returns_the_live_active_run(evaluator, exam_id, app):
+    run_id = active_run(exam_id)
+    
+    run, created = evaluator.start(app, exam_id, user_id=None)
+    
+    assert not created
+    assert run.id == run_id
+
+def test_run_without_heartbeat_is_expired(evaluator, exam_id):
+    run_id = active_run(exam_id, heartbeat_at=datetime.utcnow() - timedelta(seconds=Config.EVALUATION_RUN_TIMEOUT + 60))
+    
+    assert evaluator.expire_stale_runs(exam_id) == 1
+    assert db.session.get(EvaluationRun, run_id).status == 'failed'
+
+def test_run_of_dead_process_is_expired(evaluator, exam_id):
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    host = _owner().rpartition(':')[0]
+    run_id = active_run(exam_id, owner=f'{host}:{process.pid}')
+    
+    assert evaluator.expire_stale_runs(exam_id) == 1
+    assert db.session.get(EvaluationRun, run_id).status == 'failed'
@@ -0,0 +1,64 @@
+# tests/test_job_queue.py
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+import pytest
+from config import Config
+from models.base import db
+from models.answer_sheet import AnswerSheet
+from models.ocr_job import OCRJob
+from modules.job_queue import JobQueue, process_alive
+
+@pytest.fixture
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+@pytest.fixture
+def queue(seeded):
+    return JobQueue(Config)
+
+def running_job(worker_pid, attempts=1, started_at=None):
+    sheet = AnswerSheet.query.first()
+    job = OCRJob(answer_sheet_id=sheet.id, file_path='sheet.pdf', status='running', worker_pid=worker_pid,
+                 attempts=attempts, started_at=started_at or datetime.utcnow())
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+def test_process_alive(dead_pid):
+    assert process_alive(os.getpid())
+    assert not process_alive(dead_pid)
+    assert not process_alive(None)
+
+def test_job_of_dead_worker_is_requeued(queue, dead_pid):
+    job_id = running_job(dead_pid)
+    
+    assert queue.recover_stale_jobs() == 1
+    
+    job = db.session.get(OCRJob, job_id)
+    assert job.status == 'queued'
+    assert job.worker_pid is None
+    
+    claimed = queue.claim_next()
+    assert claimed.id == job_id
+    assert claimed.attempts == 2
+
+def test_job_that_keeps_crashing_fails(queue, dead_pid):
+    job_id = running_job(dead_pid, attempts=Config.JOB_MAX_ATTEMPTS)
+    
+    queue.recover_stale_jobs()
+    
+    job = db.session.get(OCRJob, job_id)
+    assert job.status == 'failed'
+    assert job.finished_at is not None
+
+def test_live_job_is_left_until_its_lease_expires(queue):
+    current = running_job(os.getpid())
+    expired = running_job(os.getpid(), started_at=datetime.utcnow() - timedelta(seconds=Config.JOB_LEASE_TIMEOUT + 60))
+    
+    assert queue.recover_stale_jobs() == 1
+    assert db.session.get(OCRJob, current).status == 'running'
+    assert db.session.get(OCRJob, expired).status == 'queued'
@@ -0,0 +1,59 @@
+# tests/test_keyword_matcher.py
+import pytest
+from modules.keyword_matcher import KeywordMatcher
+
+def brute_force(keyword_tokens, tokens):
+    """Every (keyword_index, start, end) where a keyword's tokens appear"""
+    return sorted(
+        (index, start, start + len(keyword))
+        for index, keyword in enumerate(keyword_tokens) if keyword
+        for start in range(len(tokens) - len(keyword) + 1)
+        if tokens[start:start + len(keyword)] == keyword
+    )
+
+def test_whole_tokens_only():
+    matcher = KeywordMatcher([['cell']])
+    
+    assert matcher.find('cellular respiration in the cell wall'.split()) == [(0, 4, 5)]
+    assert matcher.find(['cellular', 'cells', 'subcell']) == []
+
+def test_multi_word_phrase():
+    matcher = KeywordMatcher([['water', 'cycle']])
+    
+    assert matcher.find('the water cycle move water'.split()) == [(0, 1, 3)]
+    assert matcher.find('water water cycle'.split()) == [(0, 1, 3)]
+    assert matcher.find('water in a cycle'.split()) == []
+
+def test_overlapping_keywords():
+    keywords = [['water', 'cycle'], ['cycle'], ['water'], ['cycle', 'rain'], ['sea', 'water', 'cycle', 'rain']]
+    tokens = 'sea water cycle rain'.split()
+    
+    assert sorted(KeywordMatcher(keywords).find(tokens)) == [
+        (0, 1, 3), (1, 2, 3), (2, 1, 2), (3, 2, 4), (4, 0, 4)
+    ]
+
+def test_failure_links_recover_a_shorter_match():
+    # 'a b c' fails at 'd', where 'b c d' has to be picked up without rescanning
+    keywords = [['a', 'b', 'c', 'e'], ['b', 'c', 'd']]
+    
+    assert KeywordMatcher(keywords).find('a b c d'.split()) == [(1, 1, 4)]
+
+@pytest.mark.parametrize('text', [
+    'water evaporate form cloud cloud fall rain',
+    'cloud rain cloud rain cloud',
+    'rain rain rain',
+    ''
+])
+def test_matches_brute_force(text):
+    keywords = [['cloud'], ['rain'], ['cloud', 'rain'], ['rain', 'cloud', 'rain'], ['water', 'evaporate']]
+    tokens = text.split()
+    
+    assert sorted(KeywordMatcher(keywords).find(tokens)) == brute_force(keywords, tokens)
+
+def test_match_positions():
+    keywords = [['cloud'], ['water', 'cycle'], [], ['rain']]
+    matcher = KeywordMatcher(keywords)
+    
+    positions = matcher.match_positions('cloud form in the water cycle then cloud'.split())
+    
+    assert positions == {0: [(0, 1), (7, 8)], 1: [(4, 6)], 2: []}
@@ -0,0 +1,74 @@
+# tests/test_migrations.py
+import pytest
+from sqlalchemy import inspect, text
+
+@pytest.fixture
+def migrated_app():
+    from app import app as flask_app
+    from models.base import db
+    
+    with flask_app.app_context():
+        db.drop_all()
+        db.session.execute(text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.session.execute(text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+
+def test_baseline_create_all_database_is_upgraded(migrated_app):
+    from alembic import command
+    from models.base import db
+    from models.schema import alembic_config, upgrade_database
+    from models.answer import Answer
+    
+    # Build the tables exactly as the original db.create_all() did, then
+    # forget the revision as if migrations had never run
+    command.upgrade(alembic_config(), '0001')
+    db.session.execute(text('DROP TABLE alembic_version'))
+    db.session.execute(text(
+        "INSERT INTO user (id, username, email, password, role) VALUES (1, 't', 't@x', 'x', 'teacher')"
+    ))
+    db.session.execute(text(
+        "INSERT INTO exam (id, title, subject, class_name, total_marks, created_by) VALUES (1, 'E', 'S', 'C', 10, 1)"
+    ))
+    db.session.execute(text(
+        "INSERT INTO question (id, exam_id, question_number, question_text, model_answer, keywords, max_marks) "
+        "VALUES (1, 1, 1, 'Q', 'A', '[]', 10)"
+    ))
+    db.session.execute(text(
+        "INSERT INTO answer_sheet (id, exam_id, student_id, student_name, file_path) VALUES (1, 1, 'S1', 'N', 'f.pdf')"
+    ))
+    db.session.execute(text(
+        "INSERT INTO answer (id, answer_sheet_id, question_id, extracted_text, score) VALUES (1, 1, 1, 'text', 4)"
+    ))
+    db.session.commit()
+    
+    upgrade_database()
+    db.session.remove()
+    
+    inspector = inspect(db.engine)
+    assert {'ocr_job', 'region_template', 'evaluation_run', 'exam_score_aggregate'} <= set(inspector.get_table_names())
+    assert 'fingerprint' in {c['name'] for c in inspector.get_columns('answer')}
+    
+    # Existing rows are readable through the current models
+    answer = Answer.query.get(1)
+    assert answer.score == 4
+    assert answer.question.version == 1
+    assert answer.answer_sheet.identification_status == 'manual'
+
+def test_migrations_match_models(migrated_app):
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from models.base import db
+    from models.schema import upgrade_database
+    
+    upgrade_database()
+    db.session.remove()
+    
+    with db.engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+    
+    # Server defaults only exist for backfilling old rows; they are not drift
+    assert [d for d in diff if d[0] not in ('modify_default',)] == []
@@ -0,0 +1,75 @@
+# tests/test_ocr_cache.py
+import sqlite3
+import pytest
+from modules.ocr_cache import OCRCache
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'ocr_cache.sqlite3')
+
+def statements(cache):
+    """Record the statements the cache runs from now on"""
+    recorded = []
+    cache._conn.set_trace_callback(recorded.append)
+    return recorded
+
+def test_lookups_only_read_until_flushed(cache_path):
+    cache = OCRCache(cache_path)
+    cache.put('a', 'water cycle', 0.9)
+    
+    recorded = statements(cache)
+    assert cache.get('a') == ('water cycle', 0.9)
+    assert cache.get('b') is None
+    assert all(statement.startswith('SELECT') for statement in recorded)
+    
+    # Another connection sees the counters once they are flushed
+    cache.flush()
+    hits, misses = sqlite3.connect(cache_path).execute('SELECT hits, misses FROM ocr_cache_stats').fetchone()
+    assert (hits, misses) == (1, 1)
+
+def test_stats_include_unflushed_lookups(cache_path):
+    cache = OCRCache(cache_path)
+    cache.put('a', 'water cycle', 0.9)
+    cache.get('a')
+    cache.get('a')
+    cache.get('b')
+    
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+
+def test_last_used_is_refreshed_only_when_stale(cache_path):
+    cache = OCRCache(cache_path, touch_interval=3600)
+    cache.put('fresh', 'x')
+    cache.put('stale', 'y')
+    cache._conn.execute("UPDATE ocr_cache SET last_used = 0 WHERE key = 'stale'")
+    
+    cache.get('fresh')
+    cache.get('stale')
+    
+    assert list(cache._touched) == ['stale']
+    cache.flush()
+    assert cache._conn.execute("SELECT last_used FROM ocr_cache WHERE key = 'stale'").fetchone()[0] > 0
+
+def test_inserts_do_not_recount_until_the_limit(cache_path):
+    cache = OCRCache(cache_path, max_entries=200)
+    
+    recorded = statements(cache)
+    for i in range(150):
+        cache.put(f'k{i}', 'x')
+    cache.put('k0', 'replaced')
+    assert not any('COUNT' in statement for statement in recorded)
+    assert cache._entries == 150
+    
+    for i in range(150, 260):
+        cache.put(f'k{i}', 'x')
+    assert cache._conn.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0] <= 200
+    assert cache.get('k259') == ('x', None)
+
+def test_entry_count_survives_a_restart(cache_path):
+    first = OCRCache(cache_path, max_entries=10)
+    for i in range(10):
+        first.put(f'k{i}', 'x')
+    
+    second = OCRCache(cache_path, max_entries=10)
+    second.put('k10', 'x')
+    assert second._conn.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0] <= 10
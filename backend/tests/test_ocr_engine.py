@@ -0,0 +1,139 @@
+# tests/test_ocr_engine.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from config import Config
+from modules.ocr_engine import OCREngine
+
+class ScriptConfig(Config):
+    OCR_CACHE_ENABLED = False
+    OCR_LANGUAGES = 'eng+hin+guj'
+    SCRIPT_DETECTION_ATTEMPTS = 3
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = OCREngine(ScriptConfig)
+    engine.calls = []
+    engine.texts = {}
+    engine.delay = 0
+    calls_lock = threading.Lock()
+    
+    def run_tesseract(image, scale, custom_config):
+        languages = custom_config.split('-l ')[1]
+        with calls_lock:
+            engine.calls.append(languages)
+        if languages == ScriptConfig.OCR_LANGUAGES:
+            time.sleep(engine.delay)
+        return engine.texts[int(image[0, 0])], 0.9
+    
+    monkeypatch.setattr(engine, '_run_tesseract', run_tesseract)
+    monkeypatch.setattr(engine, 'is_blank_region', lambda binary: False)
+    return engine
+
+def region(number):
+    return np.full((4, 4), number, dtype=np.uint8)
+
+def test_detection_pass_is_the_regions_first_pass(engine):
+    engine.texts = {1: 'Water evaporates from the sea', 2: 'and falls as rain'}
+    script = engine._script_state('S001')
+    
+    first = engine._extract_region_text(region(1), script, 'S001')
+    second = engine._extract_region_text(region(2), script, 'S001')
+    
+    assert first['text'] == 'Water evaporates from the sea'
+    assert second['text'] == 'and falls as rain'
+    assert engine.calls == ['eng+hin+guj', 'eng']
+    assert engine._script_cache['S001'] == 'eng'
+
+def test_short_answer_does_not_stop_detection(engine):
+    engine.texts = {1: '42', 2: 'Water evaporates from the sea', 3: 'and falls as rain'}
+    script = engine._script_state(None)
+    
+    for number in (1, 2, 3):
+        engine._extract_region_text(region(number), script)
+    
+    assert engine.calls == ['eng+hin+guj', 'eng+hin+guj', 'eng']
+    assert script['languages'] == 'eng'
+
+def test_detection_continues_after_the_waiting_attempts(engine):
+    engine.texts = {1: '42', 2: 'Water evaporates from the sea', 3: 'and falls as rain'}
+    script = engine._script_state(None)
+    script['attempts'] = ScriptConfig.SCRIPT_DETECTION_ATTEMPTS
+    
+    for number in (1, 2, 3):
+        engine._extract_region_text(region(number), script)
+    
+    assert engine.calls == ['eng+hin+guj', 'eng+hin+guj', 'eng']
+
+def test_regions_wait_for_detection_in_the_thread_pool(engine):
+    engine.texts = {number: 'Water evaporates from the sea' for number in range(1, 6)}
+    engine.delay = 0.1
+    script = engine._script_state('S001')
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(engine._extract_region_text, region(number), script, 'S001')
+                   for number in range(1, 6)]
+        results = [future.result() for future in futures]
+    
+    assert all(result['text'] == 'Water evaporates from the sea' for result in results)
+    assert engine.calls == ['eng+hin+guj'] + ['eng'] * 4
+
+def test_cached_script_skips_detection(engine):
+    engine.texts = {1: 'Water evaporates from the sea'}
+    engine._extract_region_text(region(1), engine._script_state('S001'), 'S001')
+    engine.calls.clear()
+    
+    engine._extract_region_text(region(1), engine._script_state('S001'), 'S001')
+    
+    assert engine.calls == ['eng']
+
+def test_failed_detection_pass_releases_waiting_regions(engine, monkeypatch):
+    script = engine._script_state(None)
+    
+    def extract_text_with_confidence(image, languages=None):
+        raise RuntimeError('tesseract failed')
+    
+    monkeypatch.setattr(engine, 'extract_text_with_confidence', extract_text_with_confidence)
+    
+    with pytest.raises(RuntimeError):
+        engine._extract_region_text(region(1), script)
+    
+    assert not script['detecting']
+
+@pytest.fixture
+def blank_check():
+    return OCREngine(ScriptConfig).is_blank_region
+
+def page(height=100, width=200):
+    return np.full((height, width), 255, dtype=np.uint8)
+
+def test_empty_region_is_blank(blank_check):
+    assert blank_check(page())
+    assert blank_check(page(0, 0))
+
+def test_scattered_speckle_is_blank(blank_check):
+    binary = page()
+    # 2x2 dots: enough ink overall, but every blob is below BLANK_MIN_COMPONENT_AREA
+    for y in range(5, 100, 10):
+        for x in range(5, 200, 10):
+            binary[y:y + 2, x:x + 2] = 0
+    
+    assert np.count_nonzero(binary < 128) / binary.size > ScriptConfig.BLANK_INK_RATIO
+    assert blank_check(binary)
+
+def test_stroke_is_not_blank(blank_check):
+    binary = page()
+    binary[50:53, 40:160] = 0
+    
+    assert not blank_check(binary)
+
+def test_component_area_threshold(blank_check):
+    area = ScriptConfig.BLANK_MIN_COMPONENT_AREA
+    small, large = page(40, 40), page(40, 40)
+    small[10:11, 5:5 + area - 1] = 0
+    large[10:11, 5:5 + area] = 0
+    
+    assert blank_check(small)
+    assert not blank_check(large)
@@ -0,0 +1,45 @@
+# tests/test_query_budget.py
+# Statement budgets for the hot paths; related rows are eager-loaded, so
+# the number of queries must not grow with the number of sheets or answers
+import re
+from models.base import db
+from models.answer_sheet import AnswerSheet
+from modules.analytics import AnalyticsEngine
+from tests.conftest import requires_nltk_corpora
+from tests.seed import seed_exams
+
+def test_student_performance_query_budget(app, count_queries):
+    seed_exams(num_exams=4, num_questions=5)
+    db.session.remove()
+    
+    with count_queries() as statements:
+        performance = AnalyticsEngine().get_student_performance('S001')
+    
+    assert performance['exam_count'] == 4
+    # Sheets with their exams, then answers with their questions
+    assert len(statements) <= 2, statements
+
+@requires_nltk_corpora
+def test_evaluate_answer_sheet_query_budget(app, client, auth_headers, count_queries):
+    num_questions = 5
+    seed_exams(num_exams=1, num_questions=num_questions)
+    sheet_id = AnswerSheet.query.filter_by(student_id='S001').first().id
+    db.session.remove()
+    
+    with count_queries() as statements:
+        response = client.post(f'/api/evaluate-answer-sheet/{sheet_id}', headers=auth_headers)
+    
+    assert response.status_code == 200
+    # Answers are read once, together with their questions
+    assert sum(1 for s in statements if s.startswith('SELECT') and re.search(r'FROM answer\b(?!_)', s)) == 1, statements
+    # Writes are batched per table; only the score aggregates are kept
+    # per question (read its maximum, apply the delta)
+    assert len(statements) <= 8 + 2 * num_questions, statements
+    
+    # Nothing changed, so nothing is re-scored or re-written
+    db.session.remove()
+    with count_queries() as statements:
+        response = client.post(f'/api/evaluate-answer-sheet/{sheet_id}', headers=auth_headers)
+    
+    assert response.get_json()['evaluated_answers'] == 0
+    assert len(statements) <= 3, statements
@@ -0,0 +1,75 @@
+# tests/test_query_plans.py
+# Every statement issued by the hot paths, including the score aggregate
+# upkeep after writes, must reach answer_sheet, answer and question rows
+# through an index; a full table scan means an index from migration 0003
+# is missing or no longer usable
+import re
+import pytest
+from sqlalchemy import event
+from config import Config
+from models.base import db
+from models.exam import Exam
+from models.question import Question
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from models.queries import get_answer_sheet_with_answers, get_student_answer_sheets, get_answer_sheets_by_ids
+from modules.analytics import AnalyticsEngine
+from modules.job_queue import JobQueue
+
+FULL_SCAN = re.compile(r'^SCAN (answer_sheet|answer|question)(_\d+)?\b')
+
+@pytest.fixture
+def captured(app):
+    """(statement, parameters) of every statement run while the test drives the app"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            # The plan of a batched statement is the same for every parameter set
+            statements.append((statement, parameters[0] if executemany else parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def full_scans(statements):
+    scans = []
+    with db.engine.connect() as connection:
+        for statement, parameters in statements:
+            for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+                detail = row[-1]
+                if FULL_SCAN.match(detail):
+                    scans.append((detail, statement))
+    return scans
+
+def test_hot_paths_use_indexes(seeded, client, auth_headers, captured):
+    exam = Exam.query.first()
+    question = Question.query.filter_by(exam_id=exam.id).first()
+    sheet = AnswerSheet.query.filter_by(exam_id=exam.id).first()
+    answer = Answer.query.filter_by(answer_sheet_id=sheet.id).first()
+    answer.cluster_id = answer.id
+    db.session.commit()
+    captured.clear()
+    
+    # Query helpers and analytics
+    get_answer_sheet_with_answers(sheet.id)
+    get_student_answer_sheets(sheet.student_id)
+    get_answer_sheets_by_ids([sheet.id])
+    AnalyticsEngine()._compute_exam_statistics(exam)
+    JobQueue(Config).claim_next()
+    
+    # Routes that read sheets, answers and questions
+    for url in [
+        f'/api/analytics/exam/{exam.id}',
+        f'/api/analytics/student/{sheet.student_id}',
+        f'/api/exams/{exam.id}/review-sheets',
+        f'/api/questions/{question.id}/clusters'
+    ]:
+        assert client.get(url, headers=auth_headers).status_code == 200, url
+    
+    # A write that re-reads scores to keep the aggregates current
+    response = client.post(f'/api/clusters/{answer.id}/manual-update', headers=auth_headers, json={'score': 0})
+    assert response.status_code == 200
+    
+    assert captured
+    assert full_scans(captured) == []
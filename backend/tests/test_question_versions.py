@@ -0,0 +1,58 @@
+# tests/test_question_versions.py
+import json
+import pytest
+from models.base import db
+from models.question import Question
+from tests.conftest import requires_nltk_corpora
+
+COMPILED = json.dumps({'artifact_version': 0})
+
+@pytest.fixture
+def question(seeded):
+    question = Question.query.first()
+    question.compiled = COMPILED
+    db.session.commit()
+    return question
+
+def update(client, auth_headers, question, **data):
+    response = client.put(f'/api/questions/{question.id}', headers=auth_headers, json=data)
+    assert response.status_code == 200
+    db.session.refresh(question)
+    return response.get_json()['version']
+
+@pytest.mark.parametrize('data', [
+    {'model_answer': 'Water evaporates, condenses and falls as rain'},
+    {'keywords': ['water', 'rain']},
+])
+def test_graded_edits_bump_the_version(client, auth_headers, question, data):
+    assert update(client, auth_headers, question, **data) == 2
+    assert question.compiled is None
+
+@pytest.mark.parametrize('data', [
+    {'question_text': 'Describe the water cycle'},
+    {'max_marks': 5},
+    {'model_answer': 'Water evaporates and condenses into clouds', 'keywords': ['water', 'clouds']},
+])
+def test_other_edits_keep_the_version(client, auth_headers, question, data):
+    # The last case resends the current model answer and keywords unchanged
+    assert update(client, auth_headers, question, **data) == 1
+    assert question.compiled == COMPILED
+
+@requires_nltk_corpora
+def test_compiled_artifact_is_rebuilt_for_a_new_version(client, auth_headers, seeded):
+    from modules.evaluation import EvaluationEngine
+    
+    engine = EvaluationEngine()
+    question = Question.query.first()
+    
+    first = engine.get_compiled(question)
+    db.session.commit()
+    
+    update(client, auth_headers, question, question_text='Describe the water cycle')
+    assert engine.get_compiled(question) is first
+    
+    update(client, auth_headers, question, model_answer='Rain falls from clouds')
+    rebuilt = engine.get_compiled(question)
+    assert rebuilt['question_version'] == 2
+    assert rebuilt['model_text'] != first['model_text']
+    assert json.loads(question.compiled) == rebuilt
@@ -0,0 +1,21 @@
+# tests/test_score_aggregates.py
+from models.base import db
+from models.answer_sheet import AnswerSheet
+from models.answer import Answer
+from modules.score_aggregates import rebuild_aggregates
+
+def test_incremental_aggregates_match_a_rebuild(seeded):
+    # Change, clear and delete scores so every kind of delta is applied
+    answers = Answer.query.order_by(Answer.id).all()
+    answers[0].score = 10.0
+    answers[1].score = None
+    db.session.delete(answers[2])
+    sheet = AnswerSheet.query.filter(AnswerSheet.total_score.isnot(None)).first()
+    sheet.total_score = 0
+    db.session.commit()
+    
+    report = rebuild_aggregates()
+    
+    assert report['exams'] == 2
+    assert report['mismatched_exams'] == []
+    assert report['mismatched_questions'] == []
@@ -0,0 +1,70 @@
+# tests/test_similarity.py
+import math
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from config import Config
+from modules.similarity import (
+    TfidfSimilarity, HashingSimilarity, create_similarity_backend, pairwise_tfidf_similarity, term_counts
+)
+
+MODEL_TEXT = 'water evaporate from sea condense into cloud fall as rain'
+
+ANSWERS = [
+    'water evaporate and form cloud',
+    'rain fall from cloud cloud cloud',
+    'plant need sunlight',
+    'sea water evaporate condense into cloud fall as rain',
+    ''
+]
+
+def two_document_fit(model_text, answer_text):
+    """Similarity as the original evaluator computed it, one answer at a time"""
+    try:
+        matrix = TfidfVectorizer().fit_transform([model_text, answer_text])
+    except ValueError:
+        return 0
+    return cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
+
+@pytest.mark.parametrize('answer', ANSWERS)
+def test_pairwise_matches_two_document_fit(answer):
+    assert pairwise_tfidf_similarity(term_counts(MODEL_TEXT), answer) == pytest.approx(two_document_fit(MODEL_TEXT, answer))
+
+def test_batch_scores_do_not_depend_on_the_cohort():
+    backend = TfidfSimilarity()
+    together = backend.similarities(MODEL_TEXT, ANSWERS)
+
+    for answer, similarity in zip(ANSWERS, together):
+        assert backend.similarities(MODEL_TEXT, [answer])[0] == pytest.approx(similarity)
+        assert backend.similarities(MODEL_TEXT, [answer] * 5 + ANSWERS[:2])[0] == pytest.approx(similarity)
+
+def term_frequency_cosine(model_text, answer_text):
+    """Cosine of raw term counts, which hashing matches barring collisions"""
+    model_counts, answer_counts = term_counts(model_text), term_counts(answer_text)
+    if not model_counts or not answer_counts:
+        return 0
+    dot = sum(count * answer_counts[term] for term, count in model_counts.items())
+    return dot / math.sqrt(sum(c * c for c in model_counts.values()) * sum(c * c for c in answer_counts.values()))
+
+@pytest.mark.parametrize('answer', ANSWERS)
+def test_hashing_matches_term_frequency_cosine(answer):
+    similarity = HashingSimilarity().similarities(MODEL_TEXT, [answer])[0]
+    assert similarity == pytest.approx(term_frequency_cosine(MODEL_TEXT, answer))
+
+def test_hashing_scores_do_not_depend_on_the_cohort():
+    backend = HashingSimilarity()
+    together = backend.similarities(MODEL_TEXT, ANSWERS)
+    
+    assert together[3] > together[0] > together[2] == 0
+    for answer, similarity in zip(ANSWERS, together):
+        assert backend.similarities(MODEL_TEXT, [answer])[0] == pytest.approx(similarity)
+
+def test_hashing_with_no_answers():
+    assert HashingSimilarity().similarities(MODEL_TEXT, []).shape == (0,)
+
+def test_hashing_backend_uses_the_configured_feature_count():
+    class SmallHashConfig(Config):
+        HASHING_FEATURES = 2 ** 10
+    
+    backend = create_similarity_backend('hashing', SmallHashConfig)
+    assert backend.vectorizer.n_features == 2 ** 10
@@ -0,0 +1,19 @@
+# tests/test_startup.py
+import sys
+import json
+import subprocess
+from tests.conftest import BACKEND_DIR
+
+HEAVY_MODULES = ['cv2', 'nltk', 'sklearn', 'pandas', 'matplotlib']
+
+def test_importing_the_app_loads_no_heavy_modules():
+    # A fresh interpreter, since this test session has imported them already
+    script = (
+        'import sys, json, app; '
+        f'print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))'
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, timeout=120)
+    
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
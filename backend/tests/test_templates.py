@@ -0,0 +1,66 @@
+# tests/test_templates.py
+import io
+import json
+import cv2
+import numpy as np
+import pytest
+from models.exam import Exam
+from models.region_template import RegionTemplate
+
+PAGES = [(1000, 800), (1000, 800)]
+
+def region(region_id='q1', page=1, box=(10, 20, 300, 100)):
+    return {'id': region_id, 'page': page, 'box': list(box)}
+
+def test_valid_regions():
+    regions = [region('q1'), region('q2', page=2), region('q3', box=(0, 0, 800, 1000))]
+    assert RegionTemplate.validate_regions(regions, {1, 2, 3}, PAGES) is None
+
+@pytest.mark.parametrize('regions', [
+    [],
+    {'id': 'q1'},
+    ['q1'],
+    [region('Q1')],
+    [region('1')],
+    [region('q01')],
+    [region('q4')],
+    [region('q1'), region('q1', page=2)],
+    [region(page=0)],
+    [region(page=3)],
+    [region(page='1')],
+    [region(box=(10, 20, 300))],
+    [region(box=(10.5, 20, 300, 100))],
+    [region(box=(-1, 20, 300, 100))],
+    [region(box=(10, 20, 0, 100))],
+    [region(box=(600, 20, 300, 100))],
+    [region(box=(10, 950, 300, 100))],
+])
+def test_invalid_regions(regions):
+    assert RegionTemplate.validate_regions(regions, {1, 2, 3}, PAGES) is not None
+
+def reference_sheet():
+    _, png = cv2.imencode('.png', np.full((1000, 800), 255, dtype=np.uint8))
+    return (io.BytesIO(png.tobytes()), 'reference.png')
+
+def post_template(client, auth_headers, exam, regions):
+    return client.post(f'/api/exams/{exam.id}/template', headers=auth_headers, data={
+        'file': reference_sheet(),
+        'regions': json.dumps(regions)
+    }, content_type='multipart/form-data')
+
+def test_template_route_rejects_invalid_regions(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    
+    assert post_template(client, auth_headers, exam, [region('answer1')]).status_code == 400
+    assert post_template(client, auth_headers, exam, [region(page=2)]).status_code == 400
+    assert post_template(client, auth_headers, exam, [region(box=(700, 0, 200, 100))]).status_code == 400
+    assert RegionTemplate.query.filter_by(exam_id=exam.id).first() is None
+
+def test_template_route_registers_valid_regions(client, auth_headers, seeded):
+    exam = Exam.query.first()
+    
+    response = post_template(client, auth_headers, exam, [region('q1'), region('q2', box=(10, 200, 300, 100))])
+    
+    assert response.status_code == 200
+    assert response.get_json()['pages'] == 1
+    assert RegionTemplate.query.filter_by(exam_id=exam.id).one().version == 1
@@ -0,0 +1,44 @@
+# tests/test_tokenizer.py
+import regex
+import pytest
+from nltk.tokenize import word_tokenize
+from modules.evaluation import WORD_TOKEN_PATTERN
+from modules.keyword_matcher import KeywordMatcher
+
+WORD_CHARACTER = regex.compile(r'[\w\p{M}]')
+
+# Single-sentence answers; word_tokenize only splits a period off the end of
+# a sentence, so multi-sentence text would need the punkt sentence splitter
+SENTENCES = [
+    "Water evaporates from the sea and condenses into clouds",
+    "It's the cell's outer wall, isn't it",
+    "The value of pi is about 3.14 and well-known to all",
+    "Photosynthesis (in plants) needs sunlight; CO2 and water",
+    "They'll say we'd rather not, but I'm sure you've seen it",
+    "पानी का चक्र",
+    "पिन",
+    "सूर्य की गर्मी से पानी भाप बनता है",
+    "પાણીનું ચક્ર",
+    "સૂર્યની ગરમીથી પાણી વરાળ બને છે",
+    "Evaporation यानी वाष्पीकरण होता है",
+    "நீர் சுழற்சி",
+    "জলচক্র",
+]
+
+def nltk_word_tokens(text):
+    """word_tokenize output with punctuation-only tokens removed"""
+    return [token for token in word_tokenize(text.lower(), preserve_line=True) if WORD_CHARACTER.search(token)]
+
+@pytest.mark.parametrize('text', SENTENCES)
+def test_matches_word_tokenize(text):
+    assert WORD_TOKEN_PATTERN.findall(text.lower()) == nltk_word_tokens(text)
+
+def test_devanagari_words_stay_whole():
+    assert WORD_TOKEN_PATTERN.findall('पानी का चक्र') == ['पानी', 'का', 'चक्र']
+    assert WORD_TOKEN_PATTERN.findall('પાણીનું ચક્ર') == ['પાણીનું', 'ચક્ર']
+
+def test_keyword_does_not_match_different_hindi_word():
+    matcher = KeywordMatcher([WORD_TOKEN_PATTERN.findall('पानी')])
+    
+    assert matcher.find(WORD_TOKEN_PATTERN.findall('मेरे पास पिन है')) == []
+    assert matcher.find(WORD_TOKEN_PATTERN.findall('पानी गर्म है')) == [(0, 0, 1)]
@@ -0,0 +1,10 @@
+# worker.py
+# Runs the OCR worker pool that processes uploaded answer sheets.
+# Usage: python worker.py [num_workers]
+import sys
+from config import Config
+from modules.job_queue import JobQueue
+
+if __name__ == '__main__':
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    JobQueue(Config).run_workers(num_workers)